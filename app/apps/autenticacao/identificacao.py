@@ -0,0 +1,91 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from app.apps.core.memoria import CacheTemporario
+from typing import Any, Optional, Tuple
+
+# Usuários vindos de token ficam em memória, para que os middlewares não
+# consultem o banco a cada requisição; validade e limite em CACHE_ACESSO_*
+_usuarios = CacheTemporario('usuarios', settings.CACHE_ACESSO_SEGUNDOS, settings.CACHE_ACESSO_MAXIMO)
+_jwt = JWTAuthentication()
+
+
+def id_do_token(request: HttpRequest) -> Optional[Any]:
+    """ID do usuário no token JWT do cabeçalho Authorization, validado sem consultar o banco."""
+    cabecalho = _jwt.get_header(request)
+    if cabecalho is None:
+        return None
+
+    try:
+        bruto = _jwt.get_raw_token(cabecalho)
+        if bruto is None:
+            return None
+        token = _jwt.get_validated_token(bruto)
+    except AuthenticationFailed:
+        return None
+
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def _usuario_em_cache(usuario_id: Any) -> Tuple[bool, Optional[Any]]:
+    return _usuarios.obter(usuario_id)
+
+
+def _carregar_usuario(usuario_id: Any) -> Optional[Any]:
+    usuario = get_user_model().objects.filter(
+        **{api_settings.USER_ID_FIELD: usuario_id, 'is_active': True}
+    ).first()
+    return _usuarios.guardar(usuario_id, usuario)
+
+
+def usuario_da_requisicao(request: HttpRequest) -> Optional[Any]:
+    """Usuário autenticado pela sessão ou pelo token JWT; `None` para anônimos.
+
+    A autenticação JWT do DRF só acontece na view, depois dos middlewares;
+    aqui o token é validado à parte para que o contexto de empresa e as
+    permissões de tela valham também para os clientes da API.
+    """
+    if hasattr(request, '_usuario_identificado'):
+        return request._usuario_identificado
+
+    usuario = None
+    sessao = getattr(request, 'user', None)
+    if sessao is not None and sessao.is_authenticated:
+        usuario = sessao
+    else:
+        usuario_id = id_do_token(request)
+        if usuario_id is not None:
+            encontrado, usuario = _usuario_em_cache(usuario_id)
+            if not encontrado:
+                usuario = _carregar_usuario(usuario_id)
+
+    request._usuario_identificado = usuario
+    return usuario
+
+
+async def ausuario_da_requisicao(request: HttpRequest) -> Optional[Any]:
+    """Versão assíncrona de `usuario_da_requisicao`.
+
+    Com token e usuário em cache não há nenhuma chamada síncrona; a sessão
+    (admin, API navegável) e o primeiro acesso de cada usuário passam por
+    uma thread.
+    """
+    if hasattr(request, '_usuario_identificado'):
+        return request._usuario_identificado
+
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return await sync_to_async(usuario_da_requisicao)(request)
+
+    usuario = None
+    usuario_id = id_do_token(request)
+    if usuario_id is not None:
+        encontrado, usuario = _usuario_em_cache(usuario_id)
+        if not encontrado:
+            usuario = await sync_to_async(_carregar_usuario)(usuario_id)
+
+    request._usuario_identificado = usuario
+    return usuario
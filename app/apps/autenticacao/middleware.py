@@ -1,33 +1,91 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
 from django.http import HttpRequest, HttpResponse
-from django.utils.deprecation import MiddlewareMixin
+from app.apps.core.instrumentacao import medicao_atual
+from app.apps.core.middleware import HybridMiddleware
+from .identificacao import ausuario_da_requisicao, usuario_da_requisicao
 from .models import LogAcesso
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict
 
+logger = logging.getLogger(__name__)
 
-class AcessoLogMiddleware(MiddlewareMixin):
+# Em ASGI o log é gravado fora do caminho da resposta, por uma thread própria
+_gravador = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log-acesso')
+
+# Logs entregues ao gravador e ainda não gravados
+_pendentes = 0
+_pendentes_lock = threading.Lock()
+
+
+def logs_pendentes() -> int:
+    """Logs de acesso aguardando gravação neste worker."""
+    return _pendentes
+
+
+def _enfileirar_log(dados: Dict[str, Any]) -> None:
+    global _pendentes
+    with _pendentes_lock:
+        _pendentes += 1
+    _gravador.submit(_gravar_log, dados)
+
+
+def _gravar_log(dados: Dict[str, Any]) -> None:
+    global _pendentes
+    close_old_connections()
+    try:
+        LogAcesso.objects.create(**dados)
+    except Exception:
+        logger.exception('Falha ao gravar o log de acesso de %s', dados.get('endpoint'))
+    finally:
+        with _pendentes_lock:
+            _pendentes -= 1
+
+
+class AcessoLogMiddleware(HybridMiddleware):
     """Middleware para registrar logs de acesso à API."""
-    
-    def __call__(self, request: HttpRequest) -> HttpResponse:
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
         """Processa a requisição e gera o log de acesso."""
         response = self.get_response(request)
-        
+
         # Verifica se é uma requisição à API
         if request.path.startswith('/api/'):
-            # Obtém o usuário autenticado
-            usuario = request.user if request.user.is_authenticated else None
-            
-            # Registra o log de acesso
-            LogAcesso.objects.create(
-                usuario=usuario,
-                ip=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                endpoint=request.path,
-                metodo=request.method,
-                status_code=response.status_code
-            )
-        
+            # Registra o log de acesso com o usuário autenticado
+            LogAcesso.objects.create(**self.dados_log(request, response, usuario_da_requisicao(request)))
+
+        return response
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(request)
+
+        if request.path.startswith('/api/'):
+            usuario = await ausuario_da_requisicao(request)
+            _enfileirar_log(self.dados_log(request, response, usuario))
+
         return response
-    
+
+    def dados_log(self, request: HttpRequest, response: HttpResponse, usuario: Optional[Any]) -> Dict[str, Any]:
+        dados = {
+            'usuario': usuario,
+            'ip': self.get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'endpoint': request.path,
+            'metodo': request.method,
+            'status_code': response.status_code,
+        }
+
+        # Tempos medidos até aqui pelo InstrumentacaoMiddleware
+        medicao = medicao_atual()
+        if settings.INSTRUMENTACAO_PERSISTIR and medicao is not None:
+            dados['duracao_ms'] = round(medicao.total * 1e3, 2)
+            dados['consultas'] = medicao.consultas
+            dados['tempo_db_ms'] = round(medicao.tempo_db * 1e3, 2)
+
+        return dados
+
     def get_client_ip(self, request: HttpRequest) -> str:
         """Obtém o endereço IP do cliente."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -35,4 +93,4 @@ class AcessoLogMiddleware(MiddlewareMixin):
             ip = x_forwarded_for.split(',')[0].strip()
         else:
             ip = request.META.get('REMOTE_ADDR', '')
-        return ip
\ No newline at end of file
+        return ip
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('autenticacao', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logacesso',
+            name='consultas',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='logacesso',
+            name='duracao_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='logacesso',
+            name='tempo_db_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
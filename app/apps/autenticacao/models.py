@@ -215,6 +215,10 @@ class LogAcesso(models.Model):
     endpoint = models.CharField(max_length=255)
     metodo = models.CharField(max_length=10)
     status_code = models.IntegerField()
+    # Instrumentação da requisição (só com INSTRUMENTACAO_PERSISTIR)
+    duracao_ms = models.FloatField(null=True, blank=True)
+    consultas = models.IntegerField(null=True, blank=True)
+    tempo_db_ms = models.FloatField(null=True, blank=True)
     
     class Meta:
         verbose_name = 'Log de Acesso'
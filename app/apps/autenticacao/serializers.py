@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db.models import F
 from .models import Empresa, Tela, AcessoEmpresa, AcessoTela, LogAcesso
 from typing import Dict, Any, Optional, List
 
@@ -75,11 +76,12 @@ class LoginSerializer(serializers.Serializer):
             # Registra a sessão do usuário
             user.registrar_sessao()
             
-            # Obtém empresas disponíveis para o usuário
+            # Obtém empresas disponíveis para o usuário (chaves esperadas pelo frontend)
             if user.tipo_usuario == 'admin':
-                empresas = Empresa.objects.filter(is_active=True).values('codigo', 'nome_abreviado')
+                empresas = Empresa.objects.filter(is_active=True)
             else:
-                empresas = user.acesso_empresas.filter(is_active=True).values('codigo', 'nome_abreviado')
+                empresas = user.acesso_empresas.filter(is_active=True)
+            empresas = empresas.values(codigo=F('id'), nome_abreviado=F('nome'))
             
             # Obtém telas disponíveis para o usuário
             if user.tipo_usuario == 'admin':
@@ -42,7 +42,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
             
             # Adiciona claims personalizados ao token
             if user.empresa_principal:
-                refresh['empresa_default'] = user.empresa_principal.codigo
+                refresh['empresa_default'] = user.empresa_principal_id
                 
             refresh['tipo_usuario'] = user.tipo_usuario
             
@@ -2,4 +2,14 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'app.apps.core'
\ No newline at end of file
+    name = 'app.apps.core'
+
+    def ready(self) -> None:
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from .conexoes import registrar_conexao, registrar_requisicao
+        from .instrumentacao import instalar_medicao
+
+        connection_created.connect(registrar_conexao, dispatch_uid='core_registrar_conexao')
+        connection_created.connect(instalar_medicao, dispatch_uid='core_instalar_medicao')
+        request_started.connect(registrar_requisicao, dispatch_uid='core_registrar_requisicao')
@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, connections, router, transaction
+from typing import Any, Callable, Dict, Optional
+
+# Threads dedicadas às consultas das views assíncronas. Cada thread mantém a
+# própria conexão, então o tamanho do pool soma-se às conexões do worker.
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Consultas aguardando uma thread do pool e em execução nele
+_lock = threading.Lock()
+_na_fila = 0
+_em_execucao = 0
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DB_CONSULTAS_PARALELAS,
+            thread_name_prefix='consultas'
+        )
+    return _executor
+
+
+def situacao_pool() -> Dict[str, int]:
+    """Ocupação do pool de consultas deste worker."""
+    with _lock:
+        na_fila, em_execucao = _na_fila, _em_execucao
+    return {
+        'tamanho': settings.DB_CONSULTAS_PARALELAS,
+        'em_execucao': em_execucao,
+        'na_fila': na_fila,
+    }
+
+
+def _enfileirar(consulta: Callable[[], Any], modelo: Any, tempo_limite_ms: Optional[int]) -> Future:
+    """Submete a consulta ao pool, com o contexto atual, contando-a na fila até começar."""
+    global _na_fila
+    with _lock:
+        _na_fila += 1
+    futuro = executor().submit(contextvars.copy_context().run, _executar, consulta, modelo, tempo_limite_ms)
+    futuro.add_done_callback(_ao_terminar)
+    return futuro
+
+
+def _ao_terminar(futuro: Future) -> None:
+    # Cancelada ainda na fila (seção do painel que estourou o tempo), a
+    # consulta nunca chega a `_executar` e sai da fila aqui
+    global _na_fila
+    if futuro.cancelled():
+        with _lock:
+            _na_fila -= 1
+
+
+def _executar(consulta: Callable[[], Any], modelo: Any, tempo_limite_ms: Optional[int]) -> Any:
+    """Roda uma consulta numa thread do pool, com o mesmo tempo limite das views síncronas."""
+    global _na_fila, _em_execucao
+    with _lock:
+        _na_fila -= 1
+        _em_execucao += 1
+
+    close_old_connections()
+    try:
+        # O roteador pode consultar o banco (atraso da réplica): resolvido já na thread
+        alias = router.db_for_read(modelo)
+        conexao = connections[alias]
+        if not tempo_limite_ms or conexao.vendor != 'postgresql':
+            return consulta()
+
+        with transaction.atomic(using=alias):
+            with conexao.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(tempo_limite_ms)])
+            return consulta()
+    finally:
+        close_old_connections()
+        with _lock:
+            _em_execucao -= 1
+
+
+async def executar_em_paralelo(
+    consultas: Dict[str, Callable[[], Any]],
+    modelo: Any = None,
+    tempo_limite_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """Executa consultas independentes ao mesmo tempo e retorna {nome: resultado}.
+
+    O contexto da chamada (por exemplo, a marcação de leitura na réplica) é
+    copiado para cada consulta, e `modelo` orienta o roteamento como em
+    `router.db_for_read`. A primeira exceção é propagada.
+    """
+    tarefas = [
+        asyncio.wrap_future(_enfileirar(consulta, modelo, tempo_limite_ms))
+        for consulta in consultas.values()
+    ]
+    resultados = await asyncio.gather(*tarefas)
+    return dict(zip(consultas.keys(), resultados))
@@ -0,0 +1,194 @@
+from datetime import datetime
+from django.db.models import Model
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+
+class SerializerNaoCompilavel(Exception):
+    """O serializer depende de algo que não pode ser lido de `values()`."""
+
+
+def _identidade(valor: Any) -> Any:
+    return valor
+
+
+def _data_iso(valor: Any) -> Any:
+    return valor if isinstance(valor, str) else valor.isoformat()
+
+
+class _DataHora:
+    """Conversor de `DateTimeField` em ISO 8601, com o fuso resolvido por chamada."""
+
+    def __init__(self, campo: serializers.DateTimeField) -> None:
+        self.campo = campo
+
+    def fuso(self) -> Any:
+        campo = self.campo
+        return campo.timezone if hasattr(campo, 'timezone') else campo.default_timezone()
+
+    def __call__(self, valor: Any, fuso: Any) -> Any:
+        # Mesmo resultado de DateTimeField.to_representation para valores com fuso
+        if fuso is not None and isinstance(valor, datetime) and valor.tzinfo is not None:
+            texto = valor.astimezone(fuso).isoformat()
+            return texto[:-6] + 'Z' if texto.endswith('+00:00') else texto
+        return self.campo.to_representation(valor)
+
+
+class SerializerCompilado:
+    """Versão somente leitura de um `ModelSerializer` sobre linhas de `values_list()`.
+
+    A partir da definição do serializer é gerada uma função que transforma
+    uma tupla de colunas diretamente no dicionário de saída, sem instanciar
+    modelos nem percorrer `get_attribute`/`to_representation` campo a campo.
+    A saída é a mesma do serializer original; campos que não podem ser
+    reproduzidos dessa forma (métodos, propriedades, relacionamentos "para
+    muitos") fazem a compilação falhar com `SerializerNaoCompilavel`.
+    """
+
+    def __init__(self, model: Type[Model], serializer: serializers.BaseSerializer) -> None:
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+
+        self.model = model
+        self.colunas: List[str] = []
+        self.campos_url: List[str] = []
+        self.datas_hora: List[_DataHora] = []
+
+        saidas: List[Tuple[str, int, Callable[[Any], Any]]] = []
+        for nome, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+
+            coluna, conversor = self._compilar_campo(campo)
+            if coluna not in self.colunas:
+                self.colunas.append(coluna)
+            saidas.append((nome, self.colunas.index(coluna), conversor))
+
+        self.converter = self._gerar_funcao(saidas)
+
+    def _compilar_campo(self, campo: serializers.Field) -> Tuple[str, Callable[[Any], Any]]:
+        """Retorna a coluna de `values_list()` e o conversor do campo."""
+        if campo.source == '*':
+            raise SerializerNaoCompilavel(campo.field_name)
+
+        partes = list(campo.source_attrs)
+
+        # Exibição de choices (`source='get_<campo>_display'`)
+        ultimo = partes[-1]
+        if ultimo.startswith('get_') and ultimo.endswith('_display'):
+            partes[-1] = ultimo[len('get_'):-len('_display')]
+            model_field = self._resolver(partes, permitir_relacao=False)
+            if not model_field.choices:
+                raise SerializerNaoCompilavel(campo.field_name)
+
+            rotulos = {valor: str(rotulo) for valor, rotulo in model_field.flatchoices}
+            return '__'.join(partes), lambda valor: rotulos.get(valor, str(valor))
+
+        model_field = self._resolver(partes, permitir_relacao=True)
+
+        if model_field.is_relation:
+            if not isinstance(campo, serializers.PrimaryKeyRelatedField) or campo.pk_field is not None:
+                raise SerializerNaoCompilavel(campo.field_name)
+            return '__'.join(partes[:-1] + [model_field.attname]), _identidade
+
+        coluna = '__'.join(partes)
+
+        if isinstance(campo, serializers.FileField):
+            if not getattr(campo, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+                return coluna, lambda valor: valor or None
+            self.campos_url.append(campo.field_name)
+            storage = model_field.storage
+            return coluna, lambda valor: storage.url(valor) if valor else None
+
+        if isinstance(campo, serializers.StringRelatedField):
+            return coluna, str
+
+        if isinstance(campo, (serializers.CharField, serializers.IntegerField,
+                              serializers.BooleanField, serializers.ChoiceField,
+                              serializers.ReadOnlyField)):
+            return coluna, _identidade
+
+        if isinstance(campo, serializers.DateTimeField):
+            formato = getattr(campo, 'format', api_settings.DATETIME_FORMAT)
+            if isinstance(formato, str) and formato.lower() == 'iso-8601':
+                return coluna, _DataHora(campo)
+
+        elif isinstance(campo, serializers.DateField):
+            formato = getattr(campo, 'format', api_settings.DATE_FORMAT)
+            if isinstance(formato, str) and formato.lower() == 'iso-8601':
+                return coluna, _data_iso
+
+        # Demais tipos (datas com fuso, decimais, ...) usam a conversão do próprio campo
+        return coluna, campo.to_representation
+
+    def _resolver(self, partes: List[str], permitir_relacao: bool) -> Any:
+        """Resolve o caminho no modelo, recusando relacionamentos anuláveis ou "para muitos"."""
+        model = self.model
+        model_field = None
+
+        for indice, parte in enumerate(partes):
+            try:
+                model_field = model._meta.get_field(parte)
+            except Exception:
+                raise SerializerNaoCompilavel(parte)
+
+            if model_field.is_relation:
+                if model_field.many_to_many or model_field.one_to_many:
+                    raise SerializerNaoCompilavel(parte)
+
+                ultimo = indice == len(partes) - 1
+                if ultimo:
+                    if not permitir_relacao:
+                        raise SerializerNaoCompilavel(parte)
+                    break
+
+                # Um intermediário nulo faria o DRF omitir o campo
+                if model_field.null:
+                    raise SerializerNaoCompilavel(parte)
+
+                model = model_field.related_model
+            elif indice != len(partes) - 1:
+                raise SerializerNaoCompilavel(parte)
+
+        return model_field
+
+    def _gerar_funcao(self, saidas: List[Tuple[str, int, Callable[..., Any]]]) -> Callable[..., Dict[str, Any]]:
+        """Gera a função (linha, fusos) -> dicionário com o corpo desenrolado."""
+        namespace: Dict[str, Any] = {}
+        usadas = sorted({indice for _, indice, _ in saidas})
+
+        codigo = ['def converter(row, fusos):']
+        for indice in usadas:
+            codigo.append(f'    v{indice} = row[{indice}]')
+
+        codigo.append('    return {')
+        for posicao, (nome, indice, conversor) in enumerate(saidas):
+            if conversor is _identidade:
+                codigo.append(f'        {nome!r}: v{indice},')
+            elif isinstance(conversor, _DataHora):
+                namespace[f'c{posicao}'] = conversor
+                fuso = len(self.datas_hora)
+                self.datas_hora.append(conversor)
+                codigo.append(f'        {nome!r}: None if v{indice} is None else c{posicao}(v{indice}, fusos[{fuso}]),')
+            else:
+                namespace[f'c{posicao}'] = conversor
+                codigo.append(f'        {nome!r}: None if v{indice} is None else c{posicao}(v{indice}),')
+        codigo.append('    }')
+
+        exec('\n'.join(codigo), namespace)
+        return namespace['converter']
+
+    def serializar(self, linhas: Iterable[Any], request: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Converte as linhas de `values_list(*self.colunas)` em dicionários."""
+        converter = self.converter
+        fusos = [data_hora.fuso() for data_hora in self.datas_hora]
+        dados = [converter(linha, fusos) for linha in linhas]
+
+        if self.campos_url and request is not None:
+            for item in dados:
+                for nome in self.campos_url:
+                    if item[nome]:
+                        item[nome] = request.build_absolute_uri(item[nome])
+
+        return dados
@@ -0,0 +1,106 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from django.conf import settings
+from django.db import connections
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+_lock = threading.Lock()
+_abertas: Dict[str, int] = {}
+_conectando_ms: Dict[str, float] = {}
+_requisicoes = 0
+_cancelamentos: Dict[str, int] = {}
+_iniciado_em = time.time()
+
+# Conexões do processo (de todas as threads), para contar as abertas no momento
+_wrappers: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+
+
+def registrar_conexao(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """Sinal `connection_created`: conta as conexões novas do processo."""
+    with _lock:
+        _abertas[connection.alias] = _abertas.get(connection.alias, 0) + 1
+        _wrappers.add(connection)
+        ativas = sum(
+            1 for wrapper in list(_wrappers)
+            if wrapper.alias == connection.alias and wrapper.connection is not None
+        )
+
+    # As threads das consultas paralelas (assincrono.py) têm conexões próprias
+    limite = settings.DB_MAX_CONEXOES_POR_WORKER + settings.DB_CONSULTAS_PARALELAS
+    if ativas > limite:
+        logger.warning(
+            '%d conexões abertas em %s neste worker (limite %d): confira as threads do gunicorn',
+            ativas, connection.alias, limite
+        )
+
+
+def registrar_requisicao(sender: Any, **kwargs: Any) -> None:
+    """Sinal `request_started`."""
+    global _requisicoes
+    with _lock:
+        _requisicoes += 1
+
+
+def consulta_cancelada(erro: BaseException) -> bool:
+    """Indica se o erro é um cancelamento por statement_timeout (SQLSTATE 57014)."""
+    causa = erro.__cause__ or erro
+    return '57014' in (getattr(causa, 'pgcode', None), getattr(causa, 'sqlstate', None))
+
+
+def registrar_cancelamento(endpoint: str) -> None:
+    with _lock:
+        _cancelamentos[endpoint] = _cancelamentos.get(endpoint, 0) + 1
+
+
+def medir_conexao(alias: str) -> float:
+    """Abre uma conexão nova no alias e retorna o tempo de estabelecimento, em ms."""
+    conexao = connections[alias]
+    conexao.close()
+    inicio = time.perf_counter()
+    conexao.ensure_connection()
+    duracao = (time.perf_counter() - inicio) * 1e3
+    _conectando_ms[alias] = duracao
+    return duracao
+
+
+def estatisticas() -> Dict[str, Any]:
+    """Estatísticas das conexões deste worker (cada worker tem as suas)."""
+    with _lock:
+        requisicoes = _requisicoes
+        abertas = dict(_abertas)
+        cancelamentos = dict(_cancelamentos)
+        ativas: Dict[str, int] = {}
+        for wrapper in list(_wrappers):
+            if wrapper.connection is not None:
+                ativas[wrapper.alias] = ativas.get(wrapper.alias, 0) + 1
+
+    aliases = {}
+    for alias, config in settings.DATABASES.items():
+        total = abertas.get(alias, 0)
+        aliases[alias] = {
+            'conn_max_age': config.get('CONN_MAX_AGE', 0),
+            'health_checks': config.get('CONN_HEALTH_CHECKS', False),
+            'cursores_no_servidor': not config.get('DISABLE_SERVER_SIDE_CURSORS', False),
+            'abertas_total': total,
+            'abertas_agora': ativas.get(alias, 0),
+            # Fração das requisições que não precisaram abrir conexão
+            'reaproveitamento': round(1 - total / requisicoes, 4) if requisicoes and total <= requisicoes else None,
+            'ultima_conexao_ms': round(_conectando_ms[alias], 2) if alias in _conectando_ms else None,
+        }
+
+    return {
+        'pid': os.getpid(),
+        'ativo_ha_s': round(time.time() - _iniciado_em, 1),
+        'requisicoes': requisicoes,
+        'pgbouncer': settings.DB_PGBOUNCER,
+        'max_conexoes_por_worker': settings.DB_MAX_CONEXOES_POR_WORKER,
+        'consultas_paralelas': settings.DB_CONSULTAS_PARALELAS,
+        'aliases': aliases,
+        'consultas_canceladas': cancelamentos,
+    }
@@ -0,0 +1,83 @@
+import unicodedata
+import django_filters
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import FloatField, Q, QuerySet
+from django.db.models.functions import Cast
+from rest_framework import filters
+from rest_framework.request import Request
+from typing import Any
+
+from .models import Empresa, Funcionario
+
+
+def normalizar_busca(texto: str) -> str:
+    """Remove acentos, converte para minúsculas e colapsa espaços, como o `unaccent` do banco."""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """Busca por trigramas sem acentos sobre a coluna `busca` do modelo.
+
+    Usa o mesmo parâmetro `?search=` do `SearchFilter`. Cada palavra precisa
+    aparecer na coluna (`LIKE '%palavra%'`, atendido pelo índice GIN
+    `gin_trgm_ops`) ou o termo inteiro precisa ser parecido com alguma palavra
+    (`%>`), o que tolera erros de digitação. Os resultados vêm ordenados por
+    relevância, a menos que `?ordering=` seja informado, e ficam restritos à
+    empresa em contexto. Fora do PostgreSQL cai no `SearchFilter` padrão.
+    """
+
+    search_column = 'busca'
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        from django.db import connections
+
+        if connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        termo = normalizar_busca(' '.join(self.get_search_terms(request)))
+        if not termo:
+            return queryset
+
+        empresa_id = getattr(request, 'empresa_context', None)
+        if empresa_id:
+            queryset = queryset.filter(empresa__codigo=empresa_id)
+
+        todas_as_palavras = Q()
+        for palavra in termo.split():
+            todas_as_palavras &= Q(**{f'{self.search_column}__contains': palavra})
+
+        parecido = Q(**{f'{self.search_column}__trigram_word_similar': termo})
+
+        # Em precisão dupla a relevância volta do banco exatamente como foi
+        # calculada, e o cursor da paginação keyset pode compará-la por igualdade
+        return queryset.filter(todas_as_palavras | parecido).annotate(
+            relevancia=Cast(TrigramWordSimilarity(termo, self.search_column), FloatField())
+        ).order_by('-relevancia', 'pk')
+
+
+class EmpresaFilter(django_filters.FilterSet):
+    """Filtros de Empresa; `?cnpj=` aceita o CNPJ com ou sem formatação."""
+
+    cnpj = django_filters.CharFilter(method='filtrar_cnpj')
+
+    class Meta:
+        model = Empresa
+        fields = ['codigo', 'cnpj', 'ativo']
+
+    def filtrar_cnpj(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        return queryset.por_cnpj(value)
+
+
+class FuncionarioFilter(django_filters.FilterSet):
+    """Filtros de Funcionário; `?cpf=` aceita o CPF com ou sem formatação."""
+
+    cpf = django_filters.CharFilter(method='filtrar_cpf')
+
+    class Meta:
+        model = Funcionario
+        fields = ['empresa', 'situacao', 'codigo_unidade', 'codigo_setor', 'cpf']
+
+    def filtrar_cpf(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        return queryset.por_cpf(value)
@@ -1,8 +1,62 @@
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
+from . import monitoramento
+from .conexoes import estatisticas, medir_conexao
+from .prontidao import FALHA, prontidao
 
+# Sondas da plataforma (healthCheckPath) ficam fora do limite anônimo de requisições
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([])
 def health_check(request):
-    return Response({"status": "ok"})
\ No newline at end of file
+    """Liveness: o processo responde; não toca em banco nem cache."""
+    return Response({"status": "ok"})
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def readiness(request):
+    """Readiness: banco, cache, pool de conexões e filas do worker, com 503 em falha.
+
+    O resultado fica em memória por PRONTIDAO_INTERVALO_SEGUNDOS; administradores
+    podem forçar uma verificação nova com `?forcar=true`.
+    """
+    forcar = (
+        request.query_params.get('forcar', '').lower() in ('1', 'true')
+        and request.user.is_authenticated and request.user.is_staff
+    )
+    resultado = prontidao(forcar=forcar)
+
+    return Response(resultado, status=503 if resultado['status'] == FALHA else 200)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def conexoes(request):
+    """Estatísticas das conexões do worker que atendeu; `?medir=true` mede um handshake novo."""
+    if request.query_params.get('medir', '').lower() in ('1', 'true'):
+        for alias in settings.DATABASES:
+            medir_conexao(alias)
+
+    return Response({
+        'status': 'success',
+        'data': estatisticas()
+    })
+
+def metricas(request):
+    """Coleta do Prometheus (formato texto). Com METRICAS_TOKEN exige `Authorization: Bearer <token>`.
+
+    View Django simples: a autenticação JWT do DRF rejeitaria o token de coleta.
+    """
+    if not monitoramento.DISPONIVEL:
+        return HttpResponse('prometheus-client não instalado\n', status=503, content_type='text/plain')
+
+    token = settings.METRICAS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+
+    corpo, tipo = monitoramento.exportar()
+    return HttpResponse(corpo, content_type=tipo)
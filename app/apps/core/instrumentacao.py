@@ -0,0 +1,133 @@
+import heapq
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Consultas mais lentas guardadas por requisição, para o log de lentidão
+CONSULTAS_LENTAS = 3
+
+# Controle de transação e de sessão (savepoints do atomic, SET LOCAL do
+# StatementTimeoutMixin): entram no tempo de banco, mas não no número de
+# consultas, que assim não conta os comandos que só o PostgreSQL emite
+COMANDOS_DE_CONTROLE = ('SET ', 'SAVEPOINT ', 'RELEASE SAVEPOINT', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+# Consultas guardadas na linha do tempo de uma requisição perfilada
+LINHA_DO_TEMPO_MAXIMA = 5000
+
+# Medição da requisição atual; é copiada para as threads do sync_to_async e do
+# pool de consultas, então as consultas feitas lá também entram na conta
+_medicao_atual: ContextVar[Optional['Medicao']] = ContextVar('medicao_atual', default=None)
+
+
+class Medicao:
+    """Tempos e consultas de uma requisição."""
+
+    __slots__ = ('inicio', 'fim', 'consultas', 'tempo_db', 'tempo_view', 'tempo_serializacao',
+                 'lentas', 'linha_do_tempo', '_lock')
+
+    def __init__(self) -> None:
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self.consultas = 0
+        self.tempo_db = 0.0
+        self.tempo_view: Optional[float] = None
+        self.tempo_serializacao = 0.0
+        self.lentas: List[Tuple[float, int, str]] = []
+        # Todas as consultas, em ordem, só quando a requisição é perfilada
+        self.linha_do_tempo: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def registrar_consulta(self, sql: str, duracao: float, alias: Optional[str] = None) -> None:
+        controle = sql.lstrip()[:20].upper().startswith(COMANDOS_DE_CONTROLE)
+        with self._lock:
+            if not controle:
+                self.consultas += 1
+            self.tempo_db += duracao
+            if self.linha_do_tempo is not None and len(self.linha_do_tempo) < LINHA_DO_TEMPO_MAXIMA:
+                self.linha_do_tempo.append({
+                    'inicio_ms': round((time.perf_counter() - duracao - self.inicio) * 1e3, 2),
+                    'duracao_ms': round(duracao * 1e3, 3),
+                    'banco': alias,
+                    'thread': threading.current_thread().name,
+                    'sql': sql,
+                })
+            item = (duracao, self.consultas, sql)
+            if len(self.lentas) < CONSULTAS_LENTAS:
+                heapq.heappush(self.lentas, item)
+            elif duracao > self.lentas[0][0]:
+                heapq.heapreplace(self.lentas, item)
+
+    def registrar_serializacao(self, duracao: float) -> None:
+        with self._lock:
+            self.tempo_serializacao += duracao
+
+    @property
+    def total(self) -> float:
+        return (self.fim or time.perf_counter()) - self.inicio
+
+    def consultas_lentas(self) -> List[Tuple[float, str]]:
+        return [(duracao, sql) for duracao, _, sql in sorted(self.lentas, reverse=True)]
+
+    def server_timing(self) -> str:
+        """Valor do cabeçalho Server-Timing, em milissegundos."""
+        partes = [f'db;dur={self.tempo_db * 1e3:.1f};desc="{self.consultas} consultas"']
+        if self.tempo_serializacao:
+            partes.append(f'serialize;dur={self.tempo_serializacao * 1e3:.1f}')
+        if self.tempo_view is not None:
+            partes.append(f'view;dur={self.tempo_view * 1e3:.1f}')
+            partes.append(f'middleware;dur={max(self.total - self.tempo_view, 0) * 1e3:.1f}')
+        partes.append(f'total;dur={self.total * 1e3:.1f}')
+        return ', '.join(partes)
+
+
+def iniciar_medicao() -> Tuple[Medicao, Any]:
+    medicao = Medicao()
+    return medicao, _medicao_atual.set(medicao)
+
+
+def encerrar_medicao(token: Any) -> None:
+    _medicao_atual.reset(token)
+
+
+def medicao_atual() -> Optional[Medicao]:
+    return _medicao_atual.get()
+
+
+def medir_consulta(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:
+    """execute_wrapper das conexões: soma número e duração das consultas da requisição."""
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.registrar_consulta(sql, time.perf_counter() - inicio, context['connection'].alias)
+
+
+def instalar_medicao(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """Sinal `connection_created`: instala `medir_consulta` uma vez em cada conexão."""
+    if medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, medir_consulta)
+
+
+def registrar_se_lenta(metodo: str, caminho: str, status_code: int, medicao: Medicao) -> None:
+    """Loga a requisição acima de INSTRUMENTACAO_LIMITE_LENTO_MS com as consultas mais lentas."""
+    total_ms = medicao.total * 1e3
+    if total_ms < settings.INSTRUMENTACAO_LIMITE_LENTO_MS:
+        return
+
+    consultas = '\n'.join(
+        f'  {duracao * 1e3:.1f} ms: {sql[:500]}' for duracao, sql in medicao.consultas_lentas()
+    )
+    logger.warning(
+        'Requisição lenta: %s %s -> %d em %.1f ms (%d consultas, %.1f ms no banco)%s',
+        metodo, caminho, status_code, total_ms, medicao.consultas, medicao.tempo_db * 1e3,
+        f'\n{consultas}' if consultas else ''
+    )
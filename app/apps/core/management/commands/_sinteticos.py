@@ -0,0 +1,289 @@
+import random
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ...models import (
+    Empresa, Funcionario,
+    TipoConvocacao, Convocacao,
+    TipoAbsenteismo, Absenteismo
+)
+
+
+def instancias_sinteticas(linhas: int) -> Tuple[List[Funcionario], List[Convocacao], List[Absenteismo]]:
+    """Monta instâncias em memória (sem banco) para os benchmarks de serialização."""
+    empresa = Empresa(codigo=1, cnpj='00.000.000/0001-00', nome_abreviado='Empresa')
+    tipo_convocacao = TipoConvocacao(id=1, nome='Periódico')
+    tipo_absenteismo = TipoAbsenteismo(id=1, nome='Atestado médico')
+    agora = datetime(2024, 1, 1, 12, tzinfo=dt_timezone.utc)
+
+    funcionarios = [
+        Funcionario(
+            codigo=i, empresa=empresa, nome=f'Funcionário {i}', cpf=f'{i:011d}',
+            data_nascimento=date(1990, 1, 1) + timedelta(days=i % 5000),
+            sexo=1 + i % 2, situacao='ATIVO', nome_setor='Setor', nome_cargo='Cargo',
+            email=f'funcionario{i}@empresa.com', criado_em=agora, atualizado_em=agora
+        )
+        for i in range(linhas)
+    ]
+    convocacoes = [
+        Convocacao(
+            id=i, empresa=empresa, funcionario=funcionarios[i], tipo=tipo_convocacao,
+            data_convocacao=date(2024, 1, 1), data_limite_resposta=date(2024, 2, 1),
+            criado_em=agora, atualizado_em=agora
+        )
+        for i in range(linhas)
+    ]
+    absenteismos = [
+        Absenteismo(
+            id=i, empresa=empresa, funcionario=funcionarios[i], tipo=tipo_absenteismo,
+            data_inicio=date(2024, 1, 1), data_fim=date(2024, 1, 3),
+            criado_em=agora, atualizado_em=agora
+        )
+        for i in range(linhas)
+    ]
+
+    return funcionarios, convocacoes, absenteismos
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> float:
+    """Retorna o melhor tempo, em segundos, entre as repetições."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+# ---------------------------------------------------------------------------
+# Dados sintéticos no banco (gerar_dados_sinteticos, benchmark_regressao)
+# ---------------------------------------------------------------------------
+
+# Marca das empresas geradas; `gerar_dados_sinteticos --limpar` remove só estas
+PREFIXO_SINTETICO = 'Sintética'
+
+PRIMEIROS_NOMES = [
+    'João', 'José', 'Maria', 'Ana', 'Antônio', 'Francisco', 'Luíza', 'Conceição', 'Sebastião',
+    'Lúcia', 'Márcio', 'Fátima', 'Célia', 'André', 'Inês', 'Vitória', 'Paulo', 'Carlos',
+    'Juliana', 'Fernanda', 'Rafael', 'Bruna', 'Lucas', 'Gabriela', 'Pedro', 'Larissa',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Conceição', 'Gonçalves', 'Araújo', 'Mendonça',
+    'Lima', 'Ribeiro', 'Simões', 'Magalhães', 'Brandão', 'Assunção', 'Damião', 'Lopes',
+    'Pereira', 'Costa', 'Rodrigues', 'Almeida', 'Nascimento', 'Carvalho', 'Gomes', 'Martins',
+]
+SETORES = [
+    'Produção', 'Manutenção', 'Logística', 'Expedição', 'Administrativo', 'Financeiro',
+    'Recursos Humanos', 'Comercial', 'Qualidade', 'Segurança do Trabalho', 'Almoxarifado',
+    'Tecnologia da Informação', 'Compras', 'Jurídico', 'Atendimento', 'Limpeza',
+]
+CARGOS = [
+    'Auxiliar de Produção', 'Operador de Máquinas', 'Mecânico', 'Eletricista', 'Motorista',
+    'Assistente Administrativo', 'Analista Financeiro', 'Vendedor', 'Supervisor', 'Gerente',
+    'Técnico de Segurança', 'Almoxarife', 'Analista de Sistemas', 'Comprador', 'Advogado',
+    'Atendente', 'Auxiliar de Limpeza', 'Soldador', 'Torneiro', 'Coordenador',
+]
+CIDADES = [
+    ('São Paulo', 'SP'), ('Campinas', 'SP'), ('Rio de Janeiro', 'RJ'), ('Belo Horizonte', 'MG'),
+    ('Curitiba', 'PR'), ('Porto Alegre', 'RS'), ('Salvador', 'BA'), ('Recife', 'PE'),
+    ('Fortaleza', 'CE'), ('Goiânia', 'GO'), ('Joinville', 'SC'), ('Manaus', 'AM'),
+]
+
+# (situação, peso)
+SITUACOES = [('ATIVO', 82), ('INATIVO', 10), ('FERIAS', 5), ('AFASTADO', 3)]
+
+# (nome, peso)
+TIPOS_CONVOCACAO = [
+    ('Periódico', 70), ('Admissional', 10), ('Demissional', 8),
+    ('Retorno ao trabalho', 7), ('Mudança de função', 5),
+]
+
+# (nome, requer atestado, peso, duração em dias)
+TIPOS_ABSENTEISMO: List[Tuple[str, bool, int, Callable[[random.Random], int]]] = [
+    ('Atestado médico', True, 50, lambda rng: min(30, 1 + int(rng.lognormvariate(0.0, 1.0)))),
+    ('Consulta médica', False, 20, lambda rng: 1),
+    ('Falta injustificada', False, 15, lambda rng: 1 if rng.random() < 0.9 else 2),
+    ('Acidente de trabalho', True, 5, lambda rng: min(180, 1 + int(rng.lognormvariate(2.0, 0.8)))),
+    ('Licença médica prolongada', True, 10, lambda rng: rng.randint(16, 120)),
+]
+
+# Faltas se concentram no início e no fim da semana (segunda a domingo)
+PESOS_DIA_SEMANA = [1.6, 1.1, 1.0, 1.0, 1.3, 0.2, 0.1]
+
+# Janela das convocações e absenteísmos gerados, em dias até hoje
+JANELA_EVENTOS = 730
+
+
+def _digitos_verificadores(base: str, pesos_iniciais: Sequence[int]) -> str:
+    """Dígitos verificadores (módulo 11) de CPF e CNPJ."""
+    digitos = base
+    for pesos in pesos_iniciais:
+        soma = sum(int(d) * p for d, p in zip(digitos, pesos))
+        resto = soma % 11
+        digitos += '0' if resto < 2 else str(11 - resto)
+    return digitos[len(base):]
+
+
+def cpf_sintetico(numero: int) -> str:
+    """CPF válido e único derivado do número (até 10^9)."""
+    base = f'{numero % 10 ** 9:09d}'
+    dv = _digitos_verificadores(base, [range(10, 1, -1), range(11, 1, -1)])
+    return f'{base[:3]}.{base[3:6]}.{base[6:]}-{dv}'
+
+
+def cnpj_sintetico(numero: int) -> str:
+    """CNPJ válido e único (matriz) derivado do número (até 10^8)."""
+    base = f'{numero % 10 ** 8:08d}0001'
+    pesos = [[5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]]
+    dv = _digitos_verificadores(base, pesos)
+    return f'{base[:2]}.{base[2:5]}.{base[5:8]}/{base[8:]}-{dv}'
+
+
+def _poisson(rng: random.Random, media: float) -> int:
+    """Quantidade de eventos por funcionário (Knuth; médias pequenas)."""
+    if media <= 0:
+        return 0
+    limite = 2.718281828459045 ** -media
+    quantidade, produto = 0, rng.random()
+    while produto > limite:
+        quantidade += 1
+        produto *= rng.random()
+    return quantidade
+
+
+def _pesos_zipf(quantidade: int) -> List[float]:
+    """Poucos grupos grandes e uma cauda de grupos pequenos, como em empresas reais."""
+    return [1 / (posicao + 1) for posicao in range(quantidade)]
+
+
+def criar_empresa(codigo: int, rng: random.Random) -> Empresa:
+    cidade, uf = rng.choice(CIDADES)
+    return Empresa(
+        codigo=codigo, cnpj=cnpj_sintetico(codigo),
+        nome_abreviado=f'{PREFIXO_SINTETICO} {codigo}',
+        razao_social=f'Empresa {PREFIXO_SINTETICO} {codigo} Ltda',
+        endereco=f'Rua {rng.choice(SOBRENOMES)}', numero_endereco=str(rng.randint(1, 3000)),
+        bairro='Centro', cidade=cidade, cep=f'{rng.randint(1000, 99999):05d}-{rng.randint(0, 999):03d}', uf=uf
+    )
+
+
+def estrutura_empresa(funcionarios: int, rng: random.Random) -> Dict[str, Tuple[List[Tuple[str, str]], List[float]]]:
+    """Unidades, setores e cargos da empresa, em quantidade proporcional ao porte."""
+    unidades = [(f'U{i:03d}', f'Unidade {rng.choice(CIDADES)[0]} {i + 1}')
+                for i in range(min(50, 1 + funcionarios // 2000))]
+    setores = [(f'S{i:03d}', f'{SETORES[i % len(SETORES)]} {i // len(SETORES) + 1}')
+               for i in range(min(80, 5 + funcionarios // 500))]
+    cargos = [(f'C{i:03d}', f'{CARGOS[i % len(CARGOS)]} {["I", "II", "III"][i // len(CARGOS) % 3]}')
+              for i in range(min(150, 10 + funcionarios // 200))]
+    return {
+        'unidade': (unidades, _pesos_zipf(len(unidades))),
+        'setor': (setores, _pesos_zipf(len(setores))),
+        'cargo': (cargos, _pesos_zipf(len(cargos))),
+    }
+
+
+def gerar_funcionario(codigo: int, empresa: Empresa, estrutura: Dict[str, Any], rng: random.Random,
+                      hoje: date) -> Funcionario:
+    """Funcionário com admissões concentradas nos últimos anos e idades de 18 a 60 anos na admissão."""
+    tempo_de_casa = min(int(rng.expovariate(1 / (5 * 365))), 35 * 365)
+    admissao = hoje - timedelta(days=tempo_de_casa)
+    idade = int(rng.triangular(18, 60, 26))
+    nascimento = admissao - timedelta(days=idade * 365 + rng.randrange(365))
+
+    situacao = rng.choices([s for s, _ in SITUACOES], [p for _, p in SITUACOES])[0]
+    demissao = None
+    if situacao == 'INATIVO':
+        demissao = admissao + timedelta(days=rng.randint(0, max(0, tempo_de_casa)))
+
+    (unidade,), (setor,), (cargo,) = (rng.choices(*estrutura[chave]) for chave in ('unidade', 'setor', 'cargo'))
+    nome = f'{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}'
+
+    return Funcionario(
+        codigo=codigo, empresa=empresa, nome=nome, cpf=cpf_sintetico(codigo),
+        data_nascimento=nascimento, sexo=rng.choice((1, 2)),
+        estado_civil=rng.choices(range(1, 8), [40, 40, 4, 1, 2, 5, 8])[0],
+        matricula_funcionario=f'M{codigo}', data_admissao=admissao, data_demissao=demissao,
+        situacao=situacao,
+        codigo_unidade=unidade[0], nome_unidade=unidade[1],
+        codigo_setor=setor[0], nome_setor=setor[1],
+        codigo_cargo=cargo[0], nome_cargo=cargo[1],
+        email=f'funcionario{codigo}@{PREFIXO_SINTETICO.lower()}{empresa.codigo}.com.br',
+        telefone=f'(11) 9{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}'
+    )
+
+
+def _periodo_eventos(funcionario: Funcionario, hoje: date) -> Optional[Tuple[date, int]]:
+    """Início e duração (dias) da janela em que o funcionário pode ter eventos."""
+    inicio = max(funcionario.data_admissao, hoje - timedelta(days=JANELA_EVENTOS))
+    fim = funcionario.data_demissao or hoje
+    if fim < inicio:
+        return None
+    return inicio, (fim - inicio).days + 1
+
+
+def gerar_convocacoes(funcionario: Funcionario, media: float, tipos: List[TipoConvocacao],
+                      pesos: List[int], rng: random.Random, hoje: date) -> List[Convocacao]:
+    """Convocações com prazos de 15 a 60 dias; as vencidas quase sempre respondidas, parte com atraso."""
+    periodo = _periodo_eventos(funcionario, hoje)
+    if periodo is None:
+        return []
+
+    convocacoes = []
+    for _ in range(_poisson(rng, media)):
+        data = periodo[0] + timedelta(days=rng.randrange(periodo[1]))
+        prazo = rng.choice((15, 30, 30, 30, 45, 60))
+        limite = data + timedelta(days=prazo)
+
+        respondido = rng.random() < (0.92 if limite < hoje else 0.35)
+        data_resposta = None
+        resposta = 'PENDENTE'
+        if respondido:
+            atraso = rng.randint(1, 30) if rng.random() < 0.12 else 0
+            dia = min(hoje, data + timedelta(days=rng.randint(0, prazo) + atraso))
+            data_resposta = datetime(dia.year, dia.month, dia.day, rng.randint(11, 21), rng.randrange(60),
+                                     tzinfo=dt_timezone.utc)
+            resposta = 'ACEITO' if rng.random() < 0.88 else 'RECUSADO'
+
+        convocacoes.append(Convocacao(
+            empresa_id=funcionario.empresa_id, funcionario_id=funcionario.codigo,
+            tipo=rng.choices(tipos, pesos)[0], data_convocacao=data, data_limite_resposta=limite,
+            respondido=respondido, data_resposta=data_resposta, resposta=resposta
+        ))
+    return convocacoes
+
+
+def gerar_absenteismos(funcionario: Funcionario, media: float, tipos: List[TipoAbsenteismo],
+                       rng: random.Random, hoje: date) -> List[Absenteismo]:
+    """Absenteísmos curtos em sua maioria, concentrados às segundas e sextas; afastados têm um em aberto."""
+    periodo = _periodo_eventos(funcionario, hoje)
+    if periodo is None:
+        return []
+
+    pesos = [peso for _, _, peso, _ in TIPOS_ABSENTEISMO]
+    maior_peso_dia = max(PESOS_DIA_SEMANA)
+    absenteismos = []
+
+    def registro(indice: int, inicio: date, dias: int) -> Absenteismo:
+        requer_atestado = TIPOS_ABSENTEISMO[indice][1]
+        return Absenteismo(
+            empresa_id=funcionario.empresa_id, funcionario_id=funcionario.codigo, tipo=tipos[indice],
+            data_inicio=inicio, data_fim=inicio + timedelta(days=dias - 1),
+            possui_atestado=requer_atestado or rng.random() < 0.3
+        )
+
+    for _ in range(_poisson(rng, media)):
+        while True:
+            inicio = periodo[0] + timedelta(days=rng.randrange(periodo[1]))
+            if rng.random() * maior_peso_dia < PESOS_DIA_SEMANA[inicio.weekday()]:
+                break
+        indice = rng.choices(range(len(TIPOS_ABSENTEISMO)), pesos)[0]
+        absenteismos.append(registro(indice, inicio, TIPOS_ABSENTEISMO[indice][3](rng)))
+
+    if funcionario.situacao == 'AFASTADO':
+        # Licença em andamento: começou há até 90 dias e termina depois de hoje
+        indice = len(TIPOS_ABSENTEISMO) - 1
+        inicio = max(periodo[0], hoje - timedelta(days=rng.randint(0, 90)))
+        absenteismos.append(registro(indice, inicio, (hoje - inicio).days + rng.randint(15, 120)))
+
+    return absenteismos
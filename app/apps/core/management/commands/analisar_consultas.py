@@ -0,0 +1,373 @@
+import hashlib
+import json
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Versão do formato do relatório; mude quando a estrutura do JSON mudar
+VERSAO_RELATORIO = 1
+
+COMANDOS_ANALISAVEIS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+# Literais e listas de parâmetros, para agrupar consultas de mesma forma
+LITERAL_TEXTO = re.compile(r"'(?:''|[^'])*'")
+LITERAL_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+LISTA_PARAMETROS = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+
+# Colunas comparadas em um `Filter` do plano: ((empresa_id = 1) AND ((situacao)::text = 'ATIVO'::text))
+COMPARACAO = re.compile(
+    r'\(*"?(\w+)"?\)?(?:::[\w ]+)?\s*(=|<>|<=|>=|<|>|~~\*?|IS NOT NULL|IS NULL)'
+)
+
+
+def impressao_digital(sql: str) -> str:
+    """Forma normalizada da consulta, sem literais."""
+    sql = LITERAL_TEXTO.sub('?', sql)
+    sql = LITERAL_NUMERO.sub('?', sql)
+    sql = LISTA_PARAMETROS.sub('(...)', sql)
+    return ' '.join(sql.split())
+
+
+def percorrer(plano: Dict[str, Any], pai: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """Percorre os nós do plano em profundidade, junto com o nó pai."""
+    yield plano, pai
+    for filho in plano.get('Plans', []):
+        yield from percorrer(filho, plano)
+
+
+def colunas_do_filtro(filtro: str) -> List[str]:
+    """Colunas do filtro, com as igualdades antes das comparações por faixa."""
+    igualdades: List[str] = []
+    faixas: List[str] = []
+    for coluna, operador in COMPARACAO.findall(filtro):
+        destino = igualdades if operador in ('=', 'IS NULL') else faixas
+        if coluna not in igualdades and coluna not in faixas:
+            destino.append(coluna)
+    return igualdades + faixas
+
+
+def colunas_da_ordenacao(chaves: List[str]) -> List[str]:
+    colunas = []
+    for chave in chaves:
+        coluna = chave.split()[0].split('.')[-1].strip('"()')
+        if re.fullmatch(r'\w+', coluna):
+            colunas.append(coluna)
+    return colunas
+
+
+class Command(BaseCommand):
+    help = (
+        'Reexecuta as consultas das viewsets, serviços e middlewares do core contra o banco atual, '
+        'captura EXPLAIN (ANALYZE, BUFFERS) de cada uma e gera um relatório JSON com '
+        'varreduras sequenciais, ordenações em disco e candidatos a índice (PostgreSQL).'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--empresa', type=int, help='Empresa usada no contexto (padrão: a com mais funcionários).')
+        parser.add_argument('--usuario', help='E-mail do usuário das requisições (padrão: primeiro administrador).')
+        parser.add_argument('--host', default='localhost', help='Host enviado nas requisições (deve estar em ALLOWED_HOSTS).')
+        parser.add_argument('--saida', help='Arquivo do relatório JSON (padrão: saída padrão).')
+        parser.add_argument('--min-linhas', type=int, default=1000,
+                            help='Linhas lidas a partir das quais uma varredura sequencial é sinalizada.')
+        parser.add_argument('--falhar-com-alertas', action='store_true',
+                            help='Termina com erro se houver algum alerta (uso em CI).')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != 'postgresql':
+            raise CommandError('A análise de planos requer PostgreSQL.')
+
+        from ....autenticacao.models import Usuario
+        from ...models import Empresa
+
+        empresa = self._obter_empresa(Empresa, options['empresa'])
+        usuario = self._obter_usuario(Usuario, options['usuario'])
+        self.min_linhas = options['min_linhas']
+
+        # Tudo, inclusive as escritas dos cenários e do EXPLAIN ANALYZE, é desfeito no final
+        with transaction.atomic():
+            capturadas = self._reproduzir(empresa, usuario, options['host'])
+            consultas = self._analisar(capturadas)
+            transaction.set_rollback(True)
+
+        relatorio = self._relatorio(empresa.codigo, consultas)
+        texto = json.dumps(relatorio, indent=2, sort_keys=True, ensure_ascii=False)
+
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(texto + '\n')
+            resumo = relatorio['resumo']
+            self.stdout.write(
+                f"{resumo['consultas']} consultas analisadas, {resumo['alertas']} alertas, "
+                f"{len(relatorio['sugestoes_indice'])} sugestões de índice -> {options['saida']}"
+            )
+        else:
+            self.stdout.write(texto)
+
+        if options['falhar_com_alertas'] and relatorio['resumo']['alertas']:
+            raise CommandError(f"{relatorio['resumo']['alertas']} alertas encontrados.")
+
+    # Cenários
+
+    def _obter_empresa(self, modelo: Any, codigo: Optional[int]) -> Any:
+        from django.db.models import Count
+
+        if codigo is not None:
+            empresa = modelo.objects.filter(codigo=codigo).first()
+        else:
+            empresa = modelo.objects.annotate(
+                total=Count('funcionarios')
+            ).order_by('-total').first()
+
+        if empresa is None:
+            raise CommandError('Nenhuma empresa encontrada: popule o banco antes da análise.')
+        return empresa
+
+    def _obter_usuario(self, modelo: Any, email: Optional[str]) -> Any:
+        if email:
+            usuario = modelo.objects.filter(email=email).first()
+        else:
+            usuario = modelo.objects.filter(tipo_usuario='admin', is_active=True).order_by('pk').first()
+
+        if usuario is None:
+            raise CommandError('Nenhum usuário encontrado para as requisições.')
+        return usuario
+
+    def _cenarios(self, empresa: Any) -> List[Tuple[str, str, str, Optional[Dict[str, Any]]]]:
+        """Requisições (nome, método, caminho, corpo) que cobrem as consultas do core."""
+        from ...models import Absenteismo, Convocacao, Funcionario, TipoConvocacao
+
+        funcionario = Funcionario.objects.da_empresa(empresa.codigo).order_by('pk').first()
+        convocacao = Convocacao.objects.da_empresa(empresa.codigo).order_by('pk').first()
+        absenteismo = Absenteismo.objects.da_empresa(empresa.codigo).order_by('pk').first()
+        tipo = TipoConvocacao.objects.order_by('pk').first()
+
+        cenarios: List[Tuple[str, str, str, Optional[Dict[str, Any]]]] = [
+            ('empresas.listar', 'get', '/api/empresas/', None),
+            ('empresas.detalhe', 'get', f'/api/empresas/{empresa.codigo}/', None),
+            ('empresas.cnpj', 'get', '/api/empresas/', {'cnpj': empresa.cnpj}),
+            ('funcionarios.listar', 'get', '/api/funcionarios/', None),
+            ('funcionarios.situacao', 'get', '/api/funcionarios/', {'situacao': 'ATIVO'}),
+            ('funcionarios.ordenar_admissao', 'get', '/api/funcionarios/', {'ordering': '-data_admissao'}),
+            ('funcionarios.cursor', 'get', '/api/funcionarios/', {'cursor': ''}),
+            ('funcionarios.metricas', 'get', '/api/funcionarios/metricas/', None),
+            ('funcionarios.exportar', 'get', '/api/funcionarios/exportar/', None),
+            ('funcionarios.autocompletar_setor', 'get', '/api/funcionarios/autocompletar/', {'tipo': 'setor', 'q': 'a'}),
+            ('tipos_convocacao.listar', 'get', '/api/tipos-convocacao/', None),
+            ('tipos_absenteismo.listar', 'get', '/api/tipos-absenteismo/', None),
+            ('convocacoes.listar', 'get', '/api/convocacoes/', None),
+            ('convocacoes.pendentes', 'get', '/api/convocacoes/', {'respondido': 'false'}),
+            ('convocacoes.metricas', 'get', '/api/convocacoes/metricas/', None),
+            ('convocacoes.exportar', 'get', '/api/convocacoes/exportar/', None),
+            ('absenteismos.listar', 'get', '/api/absenteismos/', None),
+            ('absenteismos.metricas', 'get', '/api/absenteismos/metricas/', None),
+            ('absenteismos.exportar', 'get', '/api/absenteismos/exportar/', None),
+        ]
+
+        if funcionario is not None:
+            termo = funcionario.nome.split()[0]
+            cenarios += [
+                ('funcionarios.detalhe', 'get', f'/api/funcionarios/{funcionario.pk}/', None),
+                ('funcionarios.busca', 'get', '/api/funcionarios/', {'search': termo}),
+                ('funcionarios.cpf', 'get', '/api/funcionarios/', {'cpf': funcionario.cpf}),
+                ('funcionarios.autocompletar', 'get', '/api/funcionarios/autocompletar/', {'q': termo[:3]}),
+            ]
+        if convocacao is not None:
+            cenarios += [
+                ('convocacoes.detalhe', 'get', f'/api/convocacoes/{convocacao.pk}/', None),
+                ('convocacoes.responder_em_lote', 'post', '/api/convocacoes/responder_em_lote/',
+                 {'respostas': [{'id': convocacao.pk, 'resposta': 'ACEITO'}]}),
+            ]
+        if absenteismo is not None:
+            cenarios.append(('absenteismos.detalhe', 'get', f'/api/absenteismos/{absenteismo.pk}/', None))
+        if tipo is not None:
+            cenarios.append((
+                'convocacoes.criar_em_lote', 'post', '/api/convocacoes/criar_em_lote/',
+                {'tipo': tipo.pk, 'data_convocacao': '2099-01-01', 'data_limite_resposta': '2099-01-31',
+                 'situacao': 'ATIVO'}
+            ))
+
+        return cenarios
+
+    def _reproduzir(self, empresa: Any, usuario: Any, host: str) -> List[Tuple[str, str]]:
+        """Executa os cenários pela pilha completa (middlewares inclusos) e captura o SQL."""
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        # Erros 500 são relatados, sem interromper os demais cenários
+        client = Client(
+            raise_request_exception=False,
+            HTTP_HOST=host,
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(usuario)}',
+            HTTP_X_EMPRESA=str(empresa.codigo),
+        )
+        capturadas: List[Tuple[str, str]] = []
+
+        # Sessão em cookie assinado: os middlewares enxergam o usuário logado sem
+        # depender do cache de sessões nem acrescentar consultas de sessão
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            client.force_login(usuario)
+
+            for nome, metodo, caminho, dados in self._cenarios(empresa):
+                with CaptureQueriesContext(connection) as contexto:
+                    if metodo == 'get':
+                        response = client.get(caminho, dados or {})
+                    else:
+                        response = client.post(caminho, json.dumps(dados), content_type='application/json')
+
+                if response.status_code >= 400:
+                    self.stderr.write(f'{nome}: {metodo.upper()} {caminho} respondeu {response.status_code}')
+
+                capturadas += [(nome, query['sql']) for query in contexto.captured_queries]
+
+        return capturadas
+
+    # Planos
+
+    def _analisar(self, capturadas: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        grupos: Dict[str, Dict[str, Any]] = {}
+        for origem, sql in capturadas:
+            if not sql.lstrip().upper().startswith(COMANDOS_ANALISAVEIS):
+                continue
+
+            forma = impressao_digital(sql)
+            grupo = grupos.setdefault(forma, {'sql': sql, 'origens': set(), 'execucoes': 0})
+            grupo['origens'].add(origem)
+            grupo['execucoes'] += 1
+
+        consultas = []
+        with connection.cursor() as cursor:
+            for forma, grupo in grupos.items():
+                consulta = {
+                    'id': hashlib.sha1(forma.encode('utf-8')).hexdigest()[:12],
+                    'sql': forma,
+                    'origens': sorted(grupo['origens']),
+                    'execucoes': grupo['execucoes'],
+                }
+                consulta.update(self._explicar(cursor, grupo['sql']))
+                consultas.append(consulta)
+
+        return sorted(consultas, key=lambda consulta: consulta['id'])
+
+    def _explicar(self, cursor: Any, sql: str) -> Dict[str, Any]:
+        try:
+            # Savepoint: uma falha (ex.: chave duplicada no INSERT) não aborta as demais
+            with transaction.atomic():
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+                resultado = cursor.fetchone()[0]
+        except DatabaseError as erro:
+            return {'erro': str(erro).strip(), 'alertas': [], 'sugestoes_indice': []}
+
+        if isinstance(resultado, str):
+            resultado = json.loads(resultado)
+        explain = resultado[0]
+        plano = explain['Plan']
+
+        alertas: List[Dict[str, Any]] = []
+        sugestoes: List[Dict[str, Any]] = []
+        for no, pai in percorrer(plano):
+            alertas += self._alertas(no, pai, sugestoes)
+
+        return {
+            'tempo_ms': round(explain.get('Execution Time', 0.0), 3),
+            'planejamento_ms': round(explain.get('Planning Time', 0.0), 3),
+            'custo': plano.get('Total Cost'),
+            'linhas': plano.get('Actual Rows'),
+            'buffers': {
+                'shared_hit': plano.get('Shared Hit Blocks', 0),
+                'shared_read': plano.get('Shared Read Blocks', 0),
+                'temp_read': plano.get('Temp Read Blocks', 0),
+                'temp_written': plano.get('Temp Written Blocks', 0),
+            },
+            'nos': sorted({no['Node Type'] for no, _ in percorrer(plano)}),
+            'alertas': alertas,
+            'sugestoes_indice': sugestoes,
+        }
+
+    def _alertas(self, no: Dict[str, Any], pai: Optional[Dict[str, Any]],
+                 sugestoes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        alertas = []
+        tipo = no['Node Type']
+
+        if tipo == 'Sort' and (no.get('Sort Space Type') == 'Disk' or 'external' in no.get('Sort Method', '')):
+            alertas.append({
+                'tipo': 'ordenacao_em_disco',
+                'chaves': no.get('Sort Key', []),
+                'metodo': no.get('Sort Method'),
+                'espaco_kb': no.get('Sort Space Used'),
+            })
+
+        if tipo == 'Seq Scan':
+            lacos = no.get('Actual Loops', 1) or 1
+            retornadas = no.get('Actual Rows', 0) * lacos
+            descartadas = no.get('Rows Removed by Filter', 0) * lacos
+            lidas = retornadas + descartadas
+
+            if lidas >= self.min_linhas:
+                tabela = no.get('Relation Name')
+                alertas.append({
+                    'tipo': 'varredura_sequencial',
+                    'tabela': tabela,
+                    'filtro': no.get('Filter'),
+                    'linhas_lidas': lidas,
+                    'linhas_descartadas': descartadas,
+                })
+
+                # Filtro seletivo (ou ordenação logo acima) sem índice: candidato a índice
+                colunas = colunas_do_filtro(no.get('Filter', '')) if descartadas * 10 >= lidas * 9 else []
+                if pai is not None and pai['Node Type'] in ('Sort', 'Incremental Sort'):
+                    colunas += [c for c in colunas_da_ordenacao(pai.get('Sort Key', [])) if c not in colunas]
+
+                if colunas:
+                    sugestao = {'tabela': tabela, 'colunas': colunas}
+                    existente = self._indice_existente(tabela, colunas)
+                    if existente:
+                        sugestao['indice_existente'] = existente
+                    sugestoes.append(sugestao)
+                    alertas.append({'tipo': 'candidato_indice', **sugestao})
+
+        return alertas
+
+    def _indice_existente(self, tabela: str, colunas: List[str]) -> Optional[str]:
+        """Índice já existente que começa pelas mesmas colunas (o planejador preferiu não usá-lo)."""
+        with connection.cursor() as cursor:
+            restricoes = connection.introspection.get_constraints(cursor, tabela)
+
+        for nome, restricao in sorted(restricoes.items()):
+            if restricao['index'] and restricao['columns'][:len(colunas)] == colunas:
+                return nome
+        return None
+
+    # Relatório
+
+    def _relatorio(self, empresa_id: int, consultas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        por_tipo: Dict[str, int] = {}
+        sugestoes: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+        for consulta in consultas:
+            for alerta in consulta['alertas']:
+                por_tipo[alerta['tipo']] = por_tipo.get(alerta['tipo'], 0) + 1
+            for sugestao in consulta['sugestoes_indice']:
+                chave = (sugestao['tabela'], tuple(sugestao['colunas']))
+                agregada = sugestoes.setdefault(chave, {**sugestao, 'consultas': []})
+                agregada['consultas'].append(consulta['id'])
+
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW server_version')
+            versao_servidor = cursor.fetchone()[0]
+
+        return {
+            'versao': VERSAO_RELATORIO,
+            'postgresql': versao_servidor,
+            'empresa': empresa_id,
+            'resumo': {
+                'consultas': len(consultas),
+                'alertas': sum(por_tipo.values()),
+                'por_tipo': por_tipo,
+                'tempo_total_ms': round(sum(consulta.get('tempo_ms', 0) for consulta in consultas), 3),
+            },
+            'sugestoes_indice': [sugestoes[chave] for chave in sorted(sugestoes)],
+            'consultas': consultas,
+        }
@@ -0,0 +1,185 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from importlib.util import find_spec
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from typing import Any, Dict, List, Tuple
+
+# Métricas nas versões síncrona (ViewSet) e assíncrona (consultas em paralelo), e o painel
+CAMINHOS_PADRAO = [
+    '/api/funcionarios/metricas/',
+    '/api/funcionarios/metricas/async/',
+    '/api/convocacoes/metricas/',
+    '/api/convocacoes/metricas/async/',
+    '/api/absenteismos/metricas/',
+    '/api/absenteismos/metricas/async/',
+    '/api/painel/',
+]
+
+MODOS = ('wsgi', 'asgi')
+
+
+def percentil(valores: List[float], fracao: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Teste de carga comparando o gunicorn atual (WSGI, threads) com workers uvicorn (ASGI). '
+        'Sobe cada servidor localmente com o gunicorn.conf.py e as configurações atuais.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('caminhos', nargs='*', default=CAMINHOS_PADRAO)
+        parser.add_argument('--usuario', help='E-mail do usuário das requisições (padrão: primeiro admin ativo)')
+        parser.add_argument('--empresa', type=int, help='Empresa enviada em X-Empresa')
+        parser.add_argument('--modos', default=','.join(MODOS), help='wsgi, asgi ou ambos')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concorrencia', type=int, default=16, help='Clientes simultâneos')
+        parser.add_argument('--duracao', type=float, default=15.0, help='Segundos de carga por caminho')
+        parser.add_argument('--aquecimento', type=float, default=2.0)
+        parser.add_argument('--porta', type=int, default=0, help='Porta local (padrão: uma livre)')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        modos = [modo.strip() for modo in options['modos'].split(',') if modo.strip()]
+        invalidos = set(modos) - set(MODOS)
+        if invalidos:
+            raise CommandError(f'Modos inválidos: {", ".join(sorted(invalidos))}')
+        if 'asgi' in modos and not find_spec('uvicorn'):
+            raise CommandError('O modo asgi requer o uvicorn instalado (requirements.txt).')
+
+        cabecalhos = self._cabecalhos(options)
+        resultados: List[Tuple[str, str, Dict[str, float]]] = []
+
+        for modo in modos:
+            porta = options['porta'] or self._porta_livre()
+            servidor = self._iniciar(modo, porta, options['workers'])
+            try:
+                base = f'http://127.0.0.1:{porta}'
+                self._aguardar(base, servidor)
+                for caminho in options['caminhos']:
+                    # Aquecimento: conexões persistentes, imports e caches de cada worker
+                    self._carga(base + caminho, cabecalhos, options['concorrencia'], options['aquecimento'])
+                    medicao = self._carga(base + caminho, cabecalhos, options['concorrencia'], options['duracao'])
+                    resultados.append((modo, caminho, medicao))
+                    self.stdout.write(f'{modo} {caminho}: {medicao["req_s"]:.1f} req/s')
+            finally:
+                servidor.terminate()
+                try:
+                    servidor.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    servidor.kill()
+
+        self._relatorio(resultados, options)
+
+    def _cabecalhos(self, options: Dict[str, Any]) -> Dict[str, str]:
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        usuarios = get_user_model().objects.filter(is_active=True)
+        if options['usuario']:
+            usuario = usuarios.filter(email=options['usuario']).first()
+        else:
+            usuario = usuarios.filter(tipo_usuario='admin').order_by('pk').first()
+        if usuario is None:
+            raise CommandError('Usuário não encontrado; informe --usuario.')
+
+        cabecalhos = {'Authorization': f'Bearer {AccessToken.for_user(usuario)}'}
+        empresa = options['empresa'] or usuario.empresa_principal_id
+        if not empresa:
+            raise CommandError('O usuário não tem empresa principal; informe --empresa.')
+        cabecalhos['X-Empresa'] = str(empresa)
+        return cabecalhos
+
+    def _porta_livre(self) -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def _iniciar(self, modo: str, porta: int, workers: int) -> subprocess.Popen:
+        ambiente = dict(os.environ)
+        ambiente['DJANGO_SETTINGS_MODULE'] = os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        ambiente['WEB_CONCURRENCY'] = str(workers)
+        ambiente['GUNICORN_ASGI'] = '1' if modo == 'asgi' else ''
+
+        return subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', str(settings.BASE_DIR.parent / 'gunicorn.conf.py'),
+             '--bind', f'127.0.0.1:{porta}', '--log-level', 'warning'],
+            cwd=str(settings.BASE_DIR.parent),
+            env=ambiente
+        )
+
+    def _aguardar(self, base: str, servidor: subprocess.Popen, limite: float = 30.0) -> None:
+        fim = time.monotonic() + limite
+        while time.monotonic() < fim:
+            if servidor.poll() is not None:
+                raise CommandError(f'O servidor terminou com código {servidor.returncode}.')
+            try:
+                urllib.request.urlopen(base + '/health/', timeout=2).close()
+                return
+            except urllib.error.HTTPError:
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError('O servidor não respondeu a tempo.')
+
+    def _carga(self, url: str, cabecalhos: Dict[str, str], concorrencia: int, duracao: float) -> Dict[str, float]:
+        """Mantém `concorrencia` clientes em laço fechado durante `duracao` segundos."""
+        latencias: List[float] = []
+        erros = [0]
+        lock = threading.Lock()
+        fim = time.monotonic() + duracao
+
+        def cliente() -> None:
+            locais: List[float] = []
+            falhas = 0
+            while time.monotonic() < fim:
+                requisicao = urllib.request.Request(url, headers=cabecalhos)
+                inicio = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(requisicao, timeout=60) as resposta:
+                        resposta.read()
+                    locais.append(time.perf_counter() - inicio)
+                except (urllib.error.HTTPError, OSError):
+                    falhas += 1
+            with lock:
+                latencias.extend(locais)
+                erros[0] += falhas
+
+        inicio = time.perf_counter()
+        clientes = [threading.Thread(target=cliente) for _ in range(concorrencia)]
+        for thread in clientes:
+            thread.start()
+        for thread in clientes:
+            thread.join()
+        decorrido = time.perf_counter() - inicio
+
+        return {
+            'req_s': len(latencias) / decorrido,
+            'p50_ms': percentil(latencias, 0.50) * 1e3,
+            'p95_ms': percentil(latencias, 0.95) * 1e3,
+            'p99_ms': percentil(latencias, 0.99) * 1e3,
+            'erros': erros[0],
+        }
+
+    def _relatorio(self, resultados: List[Tuple[str, str, Dict[str, float]]], options: Dict[str, Any]) -> None:
+        self.stdout.write(
+            f"\n{options['workers']} workers, {options['concorrencia']} clientes, {options['duracao']:.0f}s por caminho\n"
+        )
+        self.stdout.write(
+            f'{"modo":<6} {"caminho":<36} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"erros":>6}'
+        )
+        for modo, caminho, medicao in resultados:
+            self.stdout.write(
+                f'{modo:<6} {caminho:<36} {medicao["req_s"]:>8.1f} {medicao["p50_ms"]:>8.1f} '
+                f'{medicao["p95_ms"]:>8.1f} {medicao["p99_ms"]:>8.1f} {medicao["erros"]:>6}'
+            )
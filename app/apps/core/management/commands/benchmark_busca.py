@@ -0,0 +1,126 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from typing import Any, List, Tuple
+
+
+# Tabela temporária com a mesma estrutura de busca de core_funcionario
+CRIAR_TABELA_SQL = """
+CREATE TEMP TABLE benchmark_funcionario (
+    codigo bigint PRIMARY KEY,
+    empresa_id bigint NOT NULL,
+    nome varchar(120) NOT NULL,
+    cpf varchar(19) NOT NULL,
+    matricula_funcionario varchar(30),
+    email varchar(400),
+    busca text
+)
+"""
+
+POPULAR_SQL = """
+INSERT INTO benchmark_funcionario (codigo, empresa_id, nome, cpf, matricula_funcionario, email)
+SELECT
+    n,
+    1 + n %% %(empresas)s,
+    (ARRAY['João', 'José', 'Maria', 'Ana', 'Antônio', 'Francisco', 'Luíza', 'Conceição',
+           'Sebastião', 'Lúcia', 'Márcio', 'Fátima', 'Célia', 'André', 'Inês', 'Vitória'])[1 + n %% 16]
+    || ' ' ||
+    (ARRAY['Silva', 'Santos', 'Oliveira', 'Souza', 'Conceição', 'Gonçalves', 'Araújo', 'Mendonça',
+           'Lima', 'Ribeiro', 'Simões', 'Magalhães', 'Brandão', 'Assunção', 'Damião', 'Lopes'])[1 + (n / 16) %% 16]
+    || ' ' ||
+    (ARRAY['Pereira', 'Costa', 'Rodrigues', 'Almeida', 'Nascimento', 'Carvalho', 'Gomes', 'Martins',
+           'Rocha', 'Ferreira', 'Barbosa', 'Fernandes', 'Gusmão', 'Conceição', 'Falcão', 'Correia'])[1 + (n / 256) %% 16]
+    || ' ' || n,
+    lpad((n * 7919 %% 1000000000)::text, 9, '0') || '-' || lpad((n %% 100)::text, 2, '0'),
+    'M' || n,
+    'funcionario' || n || '@empresa.com.br'
+FROM generate_series(1, %(linhas)s) AS n
+"""
+
+BUSCA_SQL = """
+UPDATE benchmark_funcionario SET busca = lower(unaccent(concat_ws(' ',
+    nome, cpf, regexp_replace(cpf, '\\D', '', 'g'), matricula_funcionario, email
+)))
+"""
+
+INDICES_SQL = [
+    "CREATE INDEX ON benchmark_funcionario (empresa_id)",
+    "CREATE INDEX ON benchmark_funcionario USING gin (busca gin_trgm_ops)",
+    "ANALYZE benchmark_funcionario",
+]
+
+# Consulta equivalente à do SearchFilter (ILIKE nas quatro colunas)
+ILIKE_SQL = """
+SELECT codigo, nome FROM benchmark_funcionario
+WHERE empresa_id = %s AND (
+    nome::text ILIKE %s OR cpf::text ILIKE %s
+    OR matricula_funcionario::text ILIKE %s OR email::text ILIKE %s
+)
+ORDER BY nome LIMIT 10
+"""
+
+# Consulta equivalente à do TrigramSearchFilter
+TRIGRAMA_SQL = """
+SELECT codigo, nome, word_similarity(%s, busca) AS relevancia FROM benchmark_funcionario
+WHERE empresa_id = %s AND ({palavras} OR busca %%> %s)
+ORDER BY relevancia DESC, codigo LIMIT 10
+"""
+
+
+class Command(BaseCommand):
+    help = 'Compara a busca por ILIKE com a busca por trigramas em uma tabela sintética (PostgreSQL).'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--linhas', type=int, default=1000000)
+        parser.add_argument('--empresas', type=int, default=20)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != 'postgresql':
+            raise CommandError('O benchmark de busca requer PostgreSQL.')
+
+        from ...filters import normalizar_busca
+
+        termos = ['joao', 'João Conceição', 'conceicao gusmao', 'Sebastiao Simoes', '123', 'funcionario4242']
+
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+            cursor.execute('DROP TABLE IF EXISTS benchmark_funcionario')
+            cursor.execute(CRIAR_TABELA_SQL)
+
+            inicio = time.perf_counter()
+            cursor.execute(POPULAR_SQL % {'linhas': int(options['linhas']), 'empresas': int(options['empresas'])})
+            cursor.execute(BUSCA_SQL)
+            for sql in INDICES_SQL:
+                cursor.execute(sql)
+            self.stdout.write(f"Tabela com {options['linhas']} linhas criada em {time.perf_counter() - inicio:.1f}s\n")
+
+            self.stdout.write(f'{"termo":<22} {"ilike ms":>10} {"achados":>8} {"trigrama ms":>12} {"achados":>8}')
+            for termo in termos:
+                ilike, achados_ilike = self._medir(
+                    cursor, ILIKE_SQL, [1] + [f'%{termo}%'] * 4, options['repeticoes']
+                )
+
+                normalizado = normalizar_busca(termo)
+                palavras = normalizado.split()
+                sql = TRIGRAMA_SQL.format(palavras=' AND '.join(['busca LIKE %s'] * len(palavras)))
+                parametros = [normalizado, 1] + [f'%{palavra}%' for palavra in palavras] + [normalizado]
+                trigrama, achados_trigrama = self._medir(cursor, sql, parametros, options['repeticoes'])
+
+                self.stdout.write(
+                    f'{termo:<22} {ilike * 1e3:>10.1f} {achados_ilike:>8} '
+                    f'{trigrama * 1e3:>12.1f} {achados_trigrama:>8}'
+                )
+
+            cursor.execute('DROP TABLE benchmark_funcionario')
+
+    def _medir(self, cursor: Any, sql: str, parametros: List[Any], repeticoes: int) -> Tuple[float, int]:
+        melhor = float('inf')
+        achados = 0
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            cursor.execute(sql, parametros)
+            achados = len(cursor.fetchall())
+            melhor = min(melhor, time.perf_counter() - inicio)
+        return melhor, achados
@@ -0,0 +1,255 @@
+import json
+import os
+import platform
+import secrets
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...instrumentacao import encerrar_medicao, iniciar_medicao
+from ...models import Empresa
+from ...services import AbsenteismoService, ConvocacaoService, FuncionarioService
+from ._sinteticos import PREFIXO_SINTETICO
+
+BASELINE_PADRAO = os.path.join('benchmarks', 'baseline.json')
+
+# Domínio dos administradores temporários das requisições: cada execução cria
+# o seu e o remove ao terminar (e remove os que uma execução interrompida deixou)
+DOMINIO_BENCHMARK = f'{PREFIXO_SINTETICO.lower()}.invalid'
+
+# Diferenças abaixo disso (ms) são ruído, qualquer que seja a tolerância
+RUIDO_MS = 2.0
+
+# (nome, método, caminho); os casos `servico.*` chamam os serviços direto
+CASOS_HTTP = [
+    ('http.funcionarios.lista', 'get', '/api/funcionarios/'),
+    ('http.convocacoes.lista', 'get', '/api/convocacoes/'),
+    ('http.absenteismos.lista', 'get', '/api/absenteismos/'),
+    ('http.funcionarios.metricas', 'get', '/api/funcionarios/metricas/'),
+    ('http.painel', 'get', '/api/painel/'),
+    ('http.funcionarios.exportar', 'get', '/api/funcionarios/exportar/'),
+    ('http.convocacoes.exportar', 'get', '/api/convocacoes/exportar/'),
+    ('http.absenteismos.exportar', 'get', '/api/absenteismos/exportar/'),
+    ('http.login', 'post', '/api/auth/usuarios/login/'),
+]
+
+Executor = Callable[[], Tuple[int, Optional[int]]]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede serviços de métricas, listagens, exportações e login sobre uma empresa sintética '
+        '(gerar_dados_sinteticos) e compara tempos e número de consultas com um baseline salvo.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--empresa', type=int, help='Padrão: a maior empresa sintética')
+        parser.add_argument('--repeticoes', type=int, default=5)
+        parser.add_argument('--casos', help='Prefixos separados por vírgula (ex.: servico,http.login)')
+        parser.add_argument('--baseline', default=BASELINE_PADRAO, help='Arquivo JSON do baseline')
+        parser.add_argument('--salvar', action='store_true', help='Grava os resultados como novo baseline')
+        parser.add_argument('--tolerancia', type=float, default=0.25,
+                            help='Aumento relativo da mediana tolerado antes de acusar regressão')
+        parser.add_argument('--falhar', action='store_true', help='Termina com erro se houver regressão')
+        parser.add_argument('--permitir-sem-debug', action='store_true',
+                            help='Permite rodar com DEBUG desligado (cria um administrador temporário no banco)')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['repeticoes'] < 1:
+            raise CommandError('--repeticoes deve ser positivo.')
+        if not settings.DEBUG and not options['permitir_sem_debug']:
+            raise CommandError(
+                'Com DEBUG desligado este banco pode ser o de produção: o benchmark cria um administrador '
+                'temporário e faz requisições reais. Confirme com --permitir-sem-debug.'
+            )
+
+        empresa = self._empresa(options['empresa'])
+        usuario, senha = self._usuario()
+        try:
+            casos = self._casos(empresa, options['casos'], usuario, senha)
+            if not casos:
+                raise CommandError('Nenhum caso corresponde a --casos.')
+
+            self.stdout.write(f'Empresa {empresa.codigo} com {empresa.total_funcionarios} funcionários, '
+                              f'{options["repeticoes"]} repetições por caso\n')
+
+            resultados: Dict[str, Dict[str, Any]] = {}
+            with override_settings(ALLOWED_HOSTS=['*']):
+                for nome, executar in casos:
+                    resultados[nome] = self._medir(executar, options['repeticoes'])
+        finally:
+            usuario.delete()
+
+        atual = {
+            'gerado_em': timezone.now().isoformat(),
+            'ambiente': {
+                'banco': connection.vendor,
+                'python': platform.python_version(),
+                'funcionarios': empresa.total_funcionarios,
+            },
+            'casos': resultados,
+        }
+
+        baseline = self._carregar(options['baseline'])
+        regressoes = self._comparar(atual, baseline, options['tolerancia'])
+
+        if options['salvar']:
+            os.makedirs(os.path.dirname(options['baseline']) or '.', exist_ok=True)
+            with open(options['baseline'], 'w', encoding='utf-8') as arquivo:
+                json.dump(atual, arquivo, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f'Baseline gravado em {options["baseline"]}'))
+
+        if regressoes:
+            mensagem = f'{len(regressoes)} regressão(ões): {", ".join(regressoes)}'
+            if options['falhar']:
+                raise CommandError(mensagem)
+            self.stdout.write(self.style.WARNING(mensagem))
+
+    def _empresa(self, codigo: Optional[int]) -> Empresa:
+        empresas = Empresa.objects.annotate(total_funcionarios=Count('funcionarios'))
+        if codigo is not None:
+            empresa = empresas.filter(codigo=codigo).first()
+        else:
+            empresa = empresas.filter(
+                nome_abreviado__startswith=f'{PREFIXO_SINTETICO} '
+            ).order_by('-total_funcionarios').first()
+
+        if empresa is None:
+            raise CommandError('Empresa não encontrada; gere uma com `manage.py gerar_dados_sinteticos`.')
+        return empresa
+
+    def _casos(self, empresa: Empresa, filtro: Optional[str], usuario: Any, senha: str) -> List[Tuple[str, Executor]]:
+        prefixos = tuple(prefixo.strip() for prefixo in (filtro or '').split(',') if prefixo.strip())
+
+        def servico(funcao: Callable[[int], Any]) -> Executor:
+            def executar() -> Tuple[int, Optional[int]]:
+                medicao, token = iniciar_medicao()
+                try:
+                    funcao(empresa.codigo)
+                finally:
+                    encerrar_medicao(token)
+                return medicao.consultas, None
+            return executar
+
+        casos: List[Tuple[str, Executor]] = [
+            ('servico.funcionarios.metricas', servico(FuncionarioService.obter_metricas)),
+            ('servico.convocacoes.metricas', servico(ConvocacaoService.obter_metricas)),
+            ('servico.absenteismos.metricas', servico(AbsenteismoService.obter_metricas)),
+        ]
+
+        cliente = Client()
+        cabecalhos = {
+            'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(usuario)}',
+            'HTTP_X_EMPRESA': str(empresa.codigo),
+        }
+
+        def requisicao(metodo: str, caminho: str) -> Executor:
+            def executar() -> Tuple[int, Optional[int]]:
+                if metodo == 'post':
+                    response = cliente.post(caminho, {'email': usuario.email, 'password': senha},
+                                            content_type='application/json')
+                else:
+                    response = cliente.get(caminho, **cabecalhos)
+                # Consultas contadas pelo InstrumentacaoMiddleware
+                medicao = getattr(response.wsgi_request, 'medicao', None)
+                return (medicao.consultas if medicao else 0), response.status_code
+            return executar
+
+        casos += [(nome, requisicao(metodo, caminho)) for nome, metodo, caminho in CASOS_HTTP]
+        return [(nome, executar) for nome, executar in casos if not prefixos or nome.startswith(prefixos)]
+
+    def _usuario(self) -> Tuple[Any, str]:
+        """Administrador temporário das requisições; o chamador o remove ao terminar."""
+        usuarios = get_user_model().objects
+        usuarios.filter(email__startswith='benchmark', email__endswith=f'@{DOMINIO_BENCHMARK}').delete()
+
+        senha = secrets.token_urlsafe(16)
+        usuario = usuarios.create_user(
+            f'benchmark-{secrets.token_hex(4)}@{DOMINIO_BENCHMARK}', senha, nome='Benchmark', tipo_usuario='admin'
+        )
+        return usuario, senha
+
+    def _medir(self, executar: Executor, repeticoes: int) -> Dict[str, Any]:
+        # Aquecimento: conexões, caches em memória e imports tardios
+        executar()
+
+        tempos = []
+        consultas, status_code = 0, None
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            consultas, status_code = executar()
+            tempos.append((time.perf_counter() - inicio) * 1e3)
+
+        return {
+            'mediana_ms': round(statistics.median(tempos), 2),
+            'melhor_ms': round(min(tempos), 2),
+            'consultas': consultas,
+            'status': status_code,
+        }
+
+    def _carregar(self, caminho: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(caminho):
+            self.stdout.write(f'Sem baseline em {caminho}; use --salvar para gravar um.\n')
+            return None
+        with open(caminho, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo)
+
+        volume = baseline.get('ambiente', {}).get('funcionarios')
+        if volume is not None:
+            self.stdout.write(f'Baseline de {baseline.get("gerado_em")} com {volume} funcionários\n')
+        return baseline
+
+    def _comparar(self, atual: Dict[str, Any], baseline: Optional[Dict[str, Any]], tolerancia: float) -> List[str]:
+        """Imprime a tabela de resultados e retorna os casos que regrediram."""
+        if baseline and baseline.get('ambiente', {}).get('funcionarios') != atual['ambiente']['funcionarios']:
+            self.stdout.write(self.style.WARNING(
+                'Volume de dados diferente do baseline: tempos não são comparáveis, só as consultas.\n'
+            ))
+            comparar_tempos = False
+        else:
+            comparar_tempos = True
+
+        anteriores = (baseline or {}).get('casos', {})
+        regressoes = []
+
+        self.stdout.write(
+            f'{"caso":<32} {"status":>6} {"mediana ms":>11} {"melhor ms":>10} {"consultas":>9} '
+            f'{"base ms":>9} {"Δ":>7} {"base cons.":>10}'
+        )
+        for nome, resultado in atual['casos'].items():
+            anterior = anteriores.get(nome)
+            situacao = ''
+            if anterior:
+                delta = resultado['mediana_ms'] - anterior['mediana_ms']
+                relativo = delta / anterior['mediana_ms'] if anterior['mediana_ms'] else 0.0
+                motivos = []
+                if comparar_tempos and relativo > tolerancia and delta > RUIDO_MS:
+                    motivos.append('tempo')
+                if resultado['consultas'] > anterior['consultas']:
+                    motivos.append('consultas')
+                if resultado['status'] != anterior['status']:
+                    motivos.append('status')
+                if motivos:
+                    regressoes.append(f'{nome} ({"/".join(motivos)})')
+                    situacao = self.style.ERROR(' REGRESSÃO')
+                colunas_base = (
+                    f'{anterior["mediana_ms"]:>9.1f} {relativo:>+7.0%} {anterior["consultas"]:>10}'
+                )
+            else:
+                colunas_base = f'{"-":>9} {"-":>7} {"-":>10}'
+
+            self.stdout.write(
+                f'{nome:<32} {resultado["status"] or "-":>6} {resultado["mediana_ms"]:>11.1f} '
+                f'{resultado["melhor_ms"]:>10.1f} {resultado["consultas"]:>9} {colunas_base}{situacao}'
+            )
+
+        return regressoes
@@ -0,0 +1,100 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+from typing import Any, Dict, List, Tuple
+
+from ...renderers import ORJSONRenderer
+from ...serializers import (
+    FuncionarioSerializer, ConvocacaoSerializer, AbsenteismoSerializer
+)
+from ._sinteticos import instancias_sinteticas, medir
+
+
+class Command(BaseCommand):
+    help = 'Compara o ORJSONRenderer com o JSONRenderer do DRF nas respostas dos endpoints (sem banco).'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--linhas', type=int, default=10000)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        linhas = options['linhas']
+        repeticoes = options['repeticoes']
+
+        padrao = JSONRenderer()
+        rapido = ORJSONRenderer()
+        divergentes = 0
+
+        self.stdout.write(
+            f'{"payload":<22} {"bytes":>10} {"drf ms":>9} {"orjson ms":>10} {"ganho":>7}  saída'
+        )
+        for nome, dados in self._payloads(linhas):
+            esperado = padrao.render(dados)
+            obtido = rapido.render(dados)
+
+            if obtido == esperado:
+                saida = 'idêntica'
+            elif json.loads(obtido) == json.loads(esperado):
+                saida = 'equivalente'
+            else:
+                saida = 'DIVERGENTE'
+                divergentes += 1
+
+            tempo_drf = medir(lambda: padrao.render(dados), repeticoes)
+            tempo_orjson = medir(lambda: rapido.render(dados), repeticoes)
+
+            self.stdout.write(
+                f'{nome:<22} {len(esperado):>10} {tempo_drf * 1e3:>9.2f} '
+                f'{tempo_orjson * 1e3:>10.2f} {tempo_drf / tempo_orjson:>6.1f}x  {saida}'
+            )
+
+        if divergentes:
+            raise CommandError(f'{divergentes} payload(s) com saída divergente.')
+
+    def _payloads(self, linhas: int) -> List[Tuple[str, Any]]:
+        """Respostas no formato dos endpoints de listagem e de métricas."""
+        funcionarios, convocacoes, absenteismos = instancias_sinteticas(linhas)
+
+        payloads: List[Tuple[str, Any]] = []
+        for nome, serializer_class, instancias in [
+            ('funcionarios/', FuncionarioSerializer, funcionarios),
+            ('convocacoes/', ConvocacaoSerializer, convocacoes),
+            ('absenteismos/', AbsenteismoSerializer, absenteismos),
+        ]:
+            dados = serializer_class(instancias, many=True).data
+            payloads.append((nome, {
+                'count': len(dados),
+                'next': None,
+                'previous': None,
+                'results': dados,
+            }))
+
+        payloads.append(('funcionarios/metricas/', self._metricas(linhas)))
+        return payloads
+
+    def _metricas(self, linhas: int) -> Dict[str, Any]:
+        """Métricas com os tipos que o DRF trata no encoder (Decimal, datas, strings lazy)."""
+        distribuicao = ReturnList([
+            {
+                'codigo_setor': f'S{i}',
+                'nome_setor': f'Setor {i}',
+                'total': i,
+                'media': Decimal(i) / Decimal(7),
+                'desde': date(2024, 1, 1) + timedelta(days=i),
+                'rotulo': gettext_lazy('Ativo'),
+            }
+            for i in range(linhas)
+        ], serializer=None)
+
+        return {
+            'status': 'success',
+            'data': {
+                'total_funcionarios': linhas,
+                'indice_absenteismo': 1.25,
+                'distribuicao_setores': distribuicao,
+            }
+        }
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from typing import Any, List
+
+from ...compiled_serializers import SerializerCompilado
+from ...models import Funcionario, Convocacao, Absenteismo
+from ...serializers import (
+    FuncionarioSerializer, ConvocacaoSerializer, AbsenteismoSerializer
+)
+from ._sinteticos import instancias_sinteticas, medir
+
+
+class Command(BaseCommand):
+    help = 'Compara o custo por linha do serializer DRF com o serializer compilado (sem banco).'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--linhas', type=int, default=10000)
+        parser.add_argument('--repeticoes', type=int, default=3)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        linhas = options['linhas']
+        repeticoes = options['repeticoes']
+
+        funcionarios, convocacoes, absenteismos = instancias_sinteticas(linhas)
+
+        casos = [
+            ('funcionarios', Funcionario, FuncionarioSerializer, funcionarios),
+            ('convocacoes', Convocacao, ConvocacaoSerializer, convocacoes),
+            ('absenteismos', Absenteismo, AbsenteismoSerializer, absenteismos),
+        ]
+
+        self.stdout.write(f'{"endpoint":<14} {"drf µs/linha":>14} {"compilado µs/linha":>20} {"ganho":>8}')
+        for nome, model, serializer_class, instancias in casos:
+            compilado = SerializerCompilado(model, serializer_class())
+            tuplas = [self._linha(instancia, compilado.colunas) for instancia in instancias]
+
+            drf = medir(lambda: serializer_class(instancias, many=True).data, repeticoes)
+            rapido = medir(lambda: compilado.serializar(tuplas), repeticoes)
+
+            self.stdout.write(
+                f'{nome:<14} {drf / linhas * 1e6:>14.2f} {rapido / linhas * 1e6:>20.2f} {drf / rapido:>7.1f}x'
+            )
+
+    def _linha(self, instancia: Any, colunas: List[str]) -> tuple:
+        """Monta a tupla que `values_list(*colunas)` retornaria para a instância."""
+        valores = []
+        for coluna in colunas:
+            valor = instancia
+            for parte in coluna.split('__'):
+                valor = getattr(valor, parte)
+            if hasattr(valor, 'name') and not isinstance(valor, str):
+                valor = valor.name
+            valores.append(valor)
+        return tuple(valores)
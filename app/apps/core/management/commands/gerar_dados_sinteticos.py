@@ -0,0 +1,117 @@
+import random
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from typing import Any, List
+
+from ...models import (
+    Empresa, Funcionario,
+    TipoConvocacao, Convocacao,
+    TipoAbsenteismo, Absenteismo
+)
+from ._sinteticos import (
+    PREFIXO_SINTETICO, TIPOS_ABSENTEISMO, TIPOS_CONVOCACAO,
+    criar_empresa, estrutura_empresa, gerar_absenteismos, gerar_convocacoes, gerar_funcionario
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera empresas sintéticas com funcionários, convocações e absenteísmos em inserts em lote, '
+        'para benchmarks. Não usar em bancos de produção.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--empresas', type=int, default=1)
+        parser.add_argument('--funcionarios', type=int, default=1000, help='Funcionários por empresa')
+        parser.add_argument('--convocacoes', type=float, default=2.0, help='Média de convocações por funcionário')
+        parser.add_argument('--absenteismos', type=float, default=1.5, help='Média de absenteísmos por funcionário')
+        parser.add_argument('--lote', type=int, default=5000, help='Funcionários por transação')
+        parser.add_argument('--semente', type=int, default=42, help='Semente aleatória (mesma semente, mesmos dados)')
+        parser.add_argument('--limpar', action='store_true', help='Remove antes as empresas sintéticas existentes')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['funcionarios'] < 1 or options['lote'] < 1:
+            raise CommandError('--funcionarios e --lote devem ser positivos.')
+
+        if options['limpar']:
+            self._limpar()
+            if not options['empresas']:
+                return
+
+        rng = random.Random(options['semente'])
+        hoje = date.today()
+        tipos_convocacao = [TipoConvocacao.objects.get_or_create(nome=nome)[0] for nome, _ in TIPOS_CONVOCACAO]
+        pesos_convocacao = [peso for _, peso in TIPOS_CONVOCACAO]
+        tipos_absenteismo = [
+            TipoAbsenteismo.objects.get_or_create(nome=nome, defaults={'requer_atestado': requer_atestado})[0]
+            for nome, requer_atestado, _, _ in TIPOS_ABSENTEISMO
+        ]
+
+        # Códigos seguintes aos existentes; CPF e CNPJ são derivados deles
+        proxima_empresa = (Empresa.objects.aggregate(maximo=Max('codigo'))['maximo'] or 0) + 1
+        proximo_funcionario = (Funcionario.objects.aggregate(maximo=Max('codigo'))['maximo'] or 0) + 1
+
+        inicio = time.perf_counter()
+        totais = {'funcionarios': 0, 'convocacoes': 0, 'absenteismos': 0}
+
+        for codigo in range(proxima_empresa, proxima_empresa + options['empresas']):
+            empresa = criar_empresa(codigo, rng)
+            empresa.save()
+            estrutura = estrutura_empresa(options['funcionarios'], rng)
+
+            restantes = options['funcionarios']
+            while restantes:
+                quantidade = min(restantes, options['lote'])
+                funcionarios = [
+                    gerar_funcionario(proximo_funcionario + i, empresa, estrutura, rng, hoje)
+                    for i in range(quantidade)
+                ]
+                convocacoes: List[Convocacao] = []
+                absenteismos: List[Absenteismo] = []
+                for funcionario in funcionarios:
+                    convocacoes += gerar_convocacoes(
+                        funcionario, options['convocacoes'], tipos_convocacao, pesos_convocacao, rng, hoje
+                    )
+                    absenteismos += gerar_absenteismos(
+                        funcionario, options['absenteismos'], tipos_absenteismo, rng, hoje
+                    )
+
+                with transaction.atomic():
+                    Funcionario.objects.bulk_create(funcionarios, batch_size=options['lote'])
+                    Convocacao.objects.bulk_create(convocacoes, batch_size=options['lote'])
+                    Absenteismo.objects.bulk_create(absenteismos, batch_size=options['lote'])
+
+                proximo_funcionario += quantidade
+                restantes -= quantidade
+                totais['funcionarios'] += quantidade
+                totais['convocacoes'] += len(convocacoes)
+                totais['absenteismos'] += len(absenteismos)
+                self.stdout.write(
+                    f'Empresa {codigo}: {options["funcionarios"] - restantes}/{options["funcionarios"]} funcionários'
+                    f' ({time.perf_counter() - inicio:.1f}s)'
+                )
+
+        # Estatísticas atualizadas para o planejador antes de medir qualquer coisa
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in (Empresa, Funcionario, Convocacao, Absenteismo):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["empresas"]} empresa(s) a partir do código {proxima_empresa}: '
+            f'{totais["funcionarios"]} funcionários, {totais["convocacoes"]} convocações e '
+            f'{totais["absenteismos"]} absenteísmos em {time.perf_counter() - inicio:.1f}s'
+        ))
+
+    def _limpar(self) -> None:
+        empresas = Empresa.objects.filter(nome_abreviado__startswith=f'{PREFIXO_SINTETICO} ')
+
+        # Dos dependentes para a empresa, para que cada DELETE seja feito direto no banco
+        with transaction.atomic():
+            for model in (Absenteismo, Convocacao, Funcionario):
+                removidos, _ = model.objects.filter(empresa__in=empresas).delete()
+                self.stdout.write(f'{model._meta.verbose_name_plural}: {removidos} removidos')
+            empresas.delete()
@@ -0,0 +1,151 @@
+import random
+import secrets
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from typing import Any, Dict, List, Tuple
+
+from app.apps.autenticacao.models import Empresa as EmpresaAcesso
+from ...models import (
+    Empresa, Funcionario,
+    TipoConvocacao, Convocacao,
+    TipoAbsenteismo, Absenteismo
+)
+from ...testing import (
+    ORCAMENTO_CONSULTAS, consultas_da_requisicao, limpar_caches_em_memoria, rotas_da_api, verificar_orcamento
+)
+from ._sinteticos import criar_empresa, estrutura_empresa, gerar_funcionario
+
+# A cada tantos funcionários entram também uma empresa, tipos e um usuário,
+# para que as listagens de cadastro também cresçam
+CADASTROS_A_CADA = 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Exercita cada rota da API em dois volumes de dados, num banco de testes descartável, '
+        'e falha se o número de consultas crescer com o volume ou passar do orçamento declarado '
+        'em core/testing.py (ORCAMENTO_CONSULTAS).'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--tamanhos', default='3,30',
+                            help='Funcionários em cada volume; o menor deve ficar abaixo do PAGE_SIZE')
+        parser.add_argument('--rotas', help='Prefixos de nomes de rota separados por vírgula')
+        parser.add_argument('--manter-banco', action='store_true', help='Reaproveita o banco de testes')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tamanhos = sorted({int(tamanho) for tamanho in options['tamanhos'].split(',') if tamanho.strip()})
+        if len(tamanhos) < 2 or tamanhos[0] < 1:
+            raise CommandError('Informe ao menos dois tamanhos positivos em --tamanhos.')
+
+        rotas = rotas_da_api()
+        problemas = [f'{nome}: rota sem orçamento em ORCAMENTO_CONSULTAS' for nome in sorted(set(rotas) - set(ORCAMENTO_CONSULTAS))]
+        problemas += [f'{nome}: orçamento de rota inexistente' for nome in sorted(set(ORCAMENTO_CONSULTAS) - set(rotas))]
+
+        prefixos = tuple(prefixo.strip() for prefixo in (options['rotas'] or '').split(',') if prefixo.strip())
+        orcamentos = {
+            nome: orcamento for nome, orcamento in ORCAMENTO_CONSULTAS.items()
+            if orcamento is not None and nome in rotas and (not prefixos or nome.startswith(prefixos))
+        }
+
+        setup_test_environment()
+        bancos = setup_databases(verbosity=0, interactive=False, keepdb=options['manter_banco'])
+        try:
+            medidas = self._medir(tamanhos, orcamentos)
+        finally:
+            teardown_databases(bancos, verbosity=0, keepdb=options['manter_banco'])
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"rota":<32} ' + ' '.join(f'{f"n={tamanho}":>7}' for tamanho in tamanhos) + f' {"limite":>7}'
+        )
+        for nome, orcamento in orcamentos.items():
+            erros = verificar_orcamento(nome, orcamento['limite'], medidas[nome])
+            problemas += erros
+            contagens = ' '.join(f'{consultas:>7}' for consultas, _ in medidas[nome])
+            situacao = self.style.ERROR(' FALHA') if erros else ''
+            self.stdout.write(f'{nome:<32} {contagens} {orcamento["limite"]:>7}{situacao}')
+
+        if problemas:
+            raise CommandError('\n'.join([f'{len(problemas)} problema(s):'] + problemas))
+        self.stdout.write(self.style.SUCCESS(f'{len(orcamentos)} rotas dentro do orçamento'))
+
+    def _medir(self, tamanhos: List[int], orcamentos: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[int, int]]]:
+        rng = random.Random(0)
+        senha = secrets.token_urlsafe(16)
+        usuario = get_user_model().objects.create_user(
+            'orcamento@teste.invalid', senha, nome='Orçamento', tipo_usuario='admin'
+        )
+        empresa = criar_empresa(1, rng)
+        empresa.save()
+        EmpresaAcesso.objects.create(id=empresa.codigo, nome=empresa.nome_abreviado, cnpj=empresa.cnpj)
+
+        refresh = RefreshToken.for_user(usuario)
+        contexto: Dict[str, Any] = {
+            'email': usuario.email, 'senha': senha, 'usuario': usuario.pk, 'empresa': empresa.codigo,
+            'refresh': str(refresh), 'access': str(refresh.access_token),
+        }
+        cabecalhos = {'HTTP_AUTHORIZATION': f'Bearer {contexto["access"]}', 'HTTP_X_EMPRESA': str(empresa.codigo)}
+        cliente = Client()
+
+        medidas: Dict[str, List[Tuple[int, int]]] = {nome: [] for nome in orcamentos}
+        atual = 0
+        for tamanho in tamanhos:
+            self._popular(empresa, atual, tamanho, rng, contexto)
+            atual = tamanho
+            for nome, orcamento in orcamentos.items():
+                limpar_caches_em_memoria()
+                medidas[nome].append(consultas_da_requisicao(cliente, nome, orcamento, contexto, cabecalhos))
+        return medidas
+
+    def _popular(self, empresa: Empresa, inicio: int, fim: int, rng: random.Random, contexto: Dict[str, Any]) -> None:
+        """Acrescenta os funcionários `inicio`..`fim` (com duas convocações e dois absenteísmos cada)."""
+        hoje = date.today()
+        estrutura = estrutura_empresa(fim, rng)
+
+        for indice in range(inicio, fim):
+            if indice % CADASTROS_A_CADA == 0:
+                outra = criar_empresa(1000 + indice, rng)
+                outra.save()
+                EmpresaAcesso.objects.create(id=outra.codigo, nome=outra.nome_abreviado, cnpj=outra.cnpj)
+                TipoConvocacao.objects.create(nome=f'Tipo de convocação {indice}')
+                TipoAbsenteismo.objects.create(nome=f'Tipo de absenteísmo {indice}')
+                get_user_model().objects.create_user(
+                    f'usuario{indice}@teste.invalid', secrets.token_urlsafe(16), nome=f'Usuário {indice}'
+                )
+
+        tipo_convocacao = TipoConvocacao.objects.order_by('pk').first()
+        tipo_absenteismo = TipoAbsenteismo.objects.order_by('pk').first()
+        funcionarios = Funcionario.objects.bulk_create([
+            gerar_funcionario(indice + 1, empresa, estrutura, rng, hoje) for indice in range(inicio, fim)
+        ])
+        Convocacao.objects.bulk_create([
+            Convocacao(
+                empresa=empresa, funcionario=funcionario, tipo=tipo_convocacao,
+                data_convocacao=hoje - timedelta(days=dias), data_limite_resposta=hoje + timedelta(days=30 - dias)
+            )
+            for funcionario in funcionarios for dias in (10, 60)
+        ])
+        Absenteismo.objects.bulk_create([
+            Absenteismo(
+                empresa=empresa, funcionario=funcionario, tipo=tipo_absenteismo,
+                data_inicio=hoje - timedelta(days=dias), data_fim=hoje - timedelta(days=dias - 1)
+            )
+            for funcionario in funcionarios for dias in (5, 40)
+        ])
+
+        contexto.update({
+            'funcionario': Funcionario.objects.filter(empresa=empresa).order_by('codigo').first().codigo,
+            'funcionarios': list(Funcionario.objects.filter(empresa=empresa).values_list('codigo', flat=True)),
+            'convocacao': Convocacao.objects.order_by('pk').first().pk,
+            'convocacoes': list(Convocacao.objects.values_list('pk', flat=True)),
+            'absenteismo': Absenteismo.objects.order_by('pk').first().pk,
+            'tipoconvocacao': tipo_convocacao.pk,
+            'tipoabsenteismo': tipo_absenteismo.pk,
+        })
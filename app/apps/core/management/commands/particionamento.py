@@ -0,0 +1,79 @@
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from typing import Any, List
+
+from ...particionamento import (
+    MODELOS_PARTICIONAVEIS, ParticionamentoIndisponivel,
+    desparticionar, devolver_empresa, esta_particionada, isolar_empresa,
+    maiores_empresas, modelo_particionavel, particionar, situacao
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Particionamento por empresa das tabelas de convocações e absenteísmos (PostgreSQL): '
+        'situacao, converter, reverter, isolar e devolver uma empresa. Isolar bloqueia as escritas '
+        'na tabela durante toda a operação e, no ATTACH final, também as leituras enquanto as '
+        'partições hash são varridas; rode fora do horário de pico.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('acao', choices=['situacao', 'converter', 'reverter', 'isolar', 'devolver'])
+        parser.add_argument('--modelo', choices=MODELOS_PARTICIONAVEIS, action='append',
+                            help='Tabela a tratar (padrão: todas as particionáveis).')
+        parser.add_argument('--empresa', type=int, help='Empresa para isolar/devolver.')
+        parser.add_argument('--particoes', type=int,
+                            help='Partições hash na conversão (padrão: CORE_PARTICOES_HASH ou 8).')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != 'postgresql':
+            raise CommandError('O particionamento requer PostgreSQL.')
+
+        acao = options['acao']
+        modelos = [modelo_particionavel(nome) for nome in options['modelo'] or MODELOS_PARTICIONAVEIS]
+
+        if acao in ('isolar', 'devolver') and options['empresa'] is None:
+            raise CommandError(f'Informe --empresa para {acao}.')
+
+        if acao == 'situacao':
+            self.stdout.write(json.dumps(self._situacao(modelos), indent=2, ensure_ascii=False))
+            return
+
+        particoes = options['particoes'] or settings.CORE_PARTICOES_HASH or 8
+
+        for model in modelos:
+            tabela = model._meta.db_table
+            try:
+                # Cada tabela em sua própria transação: uma falha não deixa a conversão pela metade
+                with transaction.atomic(), connection.schema_editor(atomic=False) as schema_editor:
+                    if acao == 'converter':
+                        particionar(schema_editor, model, particoes)
+                        mensagem = f'{tabela}: particionada ({particoes} partições hash)'
+                    elif acao == 'reverter':
+                        desparticionar(schema_editor, model)
+                        mensagem = f'{tabela}: tabela comum'
+                    elif acao == 'isolar':
+                        particao = isolar_empresa(schema_editor, model, options['empresa'])
+                        mensagem = f'{tabela}: empresa {options["empresa"]} movida para {particao}'
+                    else:
+                        devolver_empresa(schema_editor, model, options['empresa'])
+                        mensagem = f'{tabela}: empresa {options["empresa"]} devolvida às partições hash'
+            except ParticionamentoIndisponivel as erro:
+                raise CommandError(str(erro))
+
+            self.stdout.write(self.style.SUCCESS(mensagem))
+
+    def _situacao(self, modelos: List[Any]) -> List[Any]:
+        relatorio = []
+        for model in modelos:
+            tabela = model._meta.db_table
+            particionada = esta_particionada(connection, tabela)
+            relatorio.append({
+                'tabela': tabela,
+                'particionada': particionada,
+                'particoes': situacao(connection, model) if particionada else [],
+                'maiores_empresas_no_hash': maiores_empresas(connection, model) if particionada else [],
+            })
+        return relatorio
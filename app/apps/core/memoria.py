@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+from . import monitoramento
+
+
+class CacheTemporario:
+    """Cache do processo com validade por item e número máximo de itens.
+
+    Cheio, o cache descarta primeiro os itens vencidos e, se ainda faltar
+    espaço, os mais antigos. Acertos e falhas são contados em
+    `monitoramento` com o nome do cache.
+    """
+
+    def __init__(self, nome: str, segundos: float, maximo: int) -> None:
+        self.nome = nome
+        self.segundos = segundos
+        self.maximo = maximo
+        self._itens: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable, registrar: bool = True) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor); itens vencidos contam como ausentes."""
+        item = self._itens.get(chave)
+        encontrado = item is not None and item[0] > time.monotonic()
+        if registrar:
+            monitoramento.registrar_cache(self.nome, encontrado)
+        return (True, item[1]) if encontrado else (False, None)
+
+    def guardar(self, chave: Hashable, valor: Any) -> Any:
+        agora = time.monotonic()
+        with self._lock:
+            if chave not in self._itens and len(self._itens) >= self.maximo:
+                for vencida in [c for c, (expiracao, _) in self._itens.items() if expiracao <= agora]:
+                    del self._itens[vencida]
+                # Dicionários mantêm a ordem de inserção: os primeiros são os mais antigos
+                while len(self._itens) >= self.maximo:
+                    del self._itens[next(iter(self._itens))]
+            self._itens[chave] = (agora + self.segundos, valor)
+        return valor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
@@ -1,88 +1,373 @@
-from django.http import HttpRequest, HttpResponse
-from django.utils.deprecation import MiddlewareMixin
-from rest_framework.exceptions import PermissionDenied
-from typing import Optional, Callable, Any
+import abc
+import json
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from app.apps.autenticacao.identificacao import ausuario_da_requisicao, usuario_da_requisicao
+from . import monitoramento, perfil
+from .memoria import CacheTemporario
+from .instrumentacao import Medicao, encerrar_medicao, iniciar_medicao, medicao_atual, registrar_se_lenta
+from typing import Optional, Callable, Any, Tuple
 
+logger = logging.getLogger(__name__)
 
-class EmpresaContextMiddleware(MiddlewareMixin):
+# Decisões de acesso (empresa/tela); validade e limite em CACHE_ACESSO_* nas configurações
+_permissoes = CacheTemporario('permissoes', settings.CACHE_ACESSO_SEGUNDOS, settings.CACHE_ACESSO_MAXIMO)
+
+
+def _permissao_em_cache(chave: Tuple[str, Any, Any]) -> Optional[bool]:
+    return _permissoes.obter(chave)[1]
+
+
+def _guardar_permissao(chave: Tuple[str, Any, Any], permitido: bool) -> bool:
+    return _permissoes.guardar(chave, permitido)
+
+
+def _acesso_negado(mensagem: str) -> JsonResponse:
+    return JsonResponse({'detail': mensagem}, status=403)
+
+
+def tem_acesso_tela(user: Any, tela_codigo: str) -> bool:
+    """Verifica se o usuário tem acesso à tela."""
+    # Admins têm acesso a todas as telas
+    if user.tipo_usuario == 'admin':
+        return True
+
+    chave = ('tela', user.pk, tela_codigo)
+    permitido = _permissao_em_cache(chave)
+    if permitido is not None:
+        return permitido
+
+    # Verifica se a tela está nas telas com acesso
+    return _guardar_permissao(chave, user.acesso_telas.filter(codigo=tela_codigo).exists())
+
+
+async def atem_acesso_tela(user: Any, tela_codigo: str) -> bool:
+    """Versão assíncrona de `tem_acesso_tela`; só consulta o banco (numa thread) fora do cache."""
+    if user.tipo_usuario == 'admin':
+        return True
+
+    permitido = _permissao_em_cache(('tela', user.pk, tela_codigo))
+    if permitido is None:
+        permitido = await sync_to_async(tem_acesso_tela)(user, tela_codigo)
+    return permitido
+
+
+class HybridMiddleware(abc.ABC):
+    """Base de middleware que roda nativamente em WSGI e em ASGI.
+
+    Em ASGI o Django aguarda `aprocessar` diretamente, sem adaptar o
+    middleware com `sync_to_async`; as subclasses implementam `processar`
+    (síncrono) e `aprocessar`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.aprocessar(request)
+        return self.processar(request)
+
+    @abc.abstractmethod
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        ...
+
+    @abc.abstractmethod
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        ...
+
+
+class EmpresaContextMiddleware(HybridMiddleware):
     """Middleware para gerenciar o contexto da empresa selecionada."""
-    
-    def __call__(self, request: HttpRequest) -> HttpResponse:
-        if not hasattr(request, 'user') or not request.user.is_authenticated:
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        usuario = usuario_da_requisicao(request)
+        if usuario is None:
             return self.get_response(request)
-            
+
         # Obtém a empresa do contexto (de headers ou sessão)
-        empresa_id = self._get_empresa_context(request)
-        
+        empresa_id = self._get_empresa_context(request, usuario)
+
         if empresa_id:
             # Verifica permissão de acesso à empresa
-            if not self._has_empresa_access(request.user, empresa_id):
-                raise PermissionDenied("Acesso negado a esta empresa.")
-                
+            if not self._has_empresa_access(usuario, empresa_id):
+                return _acesso_negado("Acesso negado a esta empresa.")
+
             # Seta o contexto da empresa na requisição
             request.empresa_context = empresa_id
-            
+
         return self.get_response(request)
-        
-    def _get_empresa_context(self, request: HttpRequest) -> Optional[int]:
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        usuario = await ausuario_da_requisicao(request)
+        if usuario is None:
+            return await self.get_response(request)
+
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            # A leitura da sessão é síncrona
+            empresa_id = await sync_to_async(self._get_empresa_context)(request, usuario)
+        else:
+            empresa_id = self._get_empresa_context(request, usuario, sessao=False)
+
+        if empresa_id:
+            permitido = usuario.tipo_usuario == 'admin' or _permissao_em_cache(('empresa', usuario.pk, empresa_id))
+            if permitido is None:
+                permitido = await sync_to_async(self._has_empresa_access)(usuario, empresa_id)
+            if not permitido:
+                return _acesso_negado("Acesso negado a esta empresa.")
+
+            request.empresa_context = empresa_id
+
+        return await self.get_response(request)
+
+    def _get_empresa_context(self, request: HttpRequest, usuario: Any, sessao: bool = True) -> Optional[int]:
         """Obtém o ID da empresa do contexto atual."""
         # Prioriza header X-Empresa
         if request.headers.get('X-Empresa'):
             return int(request.headers.get('X-Empresa'))
-            
+
         # Fallback para sessão
-        if hasattr(request, 'session') and 'empresa_context' in request.session:
+        if sessao and hasattr(request, 'session') and 'empresa_context' in request.session:
             return request.session['empresa_context']
-            
+
         # Fallback para empresa principal do usuário
-        if request.user.empresa_principal:
-            return request.user.empresa_principal.codigo
-            
+        if usuario.empresa_principal_id:
+            return usuario.empresa_principal_id
+
         return None
-        
+
     def _has_empresa_access(self, user, empresa_id: int) -> bool:
         """Verifica se o usuário tem acesso à empresa."""
         # Admins têm acesso a todas as empresas
         if user.tipo_usuario == 'admin':
             return True
-            
+
+        chave = ('empresa', user.pk, empresa_id)
+        permitido = _permissao_em_cache(chave)
+        if permitido is not None:
+            return permitido
+
         # Verifica se a empresa está nas empresas com acesso
-        return user.acesso_empresas.filter(codigo=empresa_id).exists()
+        return _guardar_permissao(chave, user.acesso_empresas.filter(pk=empresa_id).exists())
 
 
-class TelaPermissaoMiddleware(MiddlewareMixin):
+class TelaPermissaoMiddleware(HybridMiddleware):
     """Middleware para verificar permissões de acesso às telas."""
-    
-    def __call__(self, request: HttpRequest) -> HttpResponse:
-        if not hasattr(request, 'user') or not request.user.is_authenticated:
+
+    # Mapeamento de rotas para códigos de tela
+    rota_para_tela = {
+        '/api/funcionarios': 'funcionarios',
+        '/api/absenteismos': 'absenteismos',
+        '/api/convocacoes': 'convocacoes',
+    }
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        usuario = usuario_da_requisicao(request)
+        if usuario is None:
             return self.get_response(request)
-            
-        # Mapeamento de rotas para códigos de tela
-        rota_para_tela = {
-            '/api/funcionarios': 'funcionarios',
-            '/api/absenteismos': 'absenteismos',
-            '/api/convocacoes': 'convocacoes',
-        }
-        
-        # Identifica a tela atual pela rota
-        path = request.path_info
-        tela_codigo = None
-        
-        for rota, codigo in rota_para_tela.items():
-            if path.startswith(rota):
-                tela_codigo = codigo
-                break
-                
-        if tela_codigo and not self._has_tela_access(request.user, tela_codigo):
-            raise PermissionDenied("Acesso negado a esta funcionalidade.")
-            
+
+        tela_codigo = self._tela_da_rota(request.path_info)
+        if tela_codigo and not self._has_tela_access(usuario, tela_codigo):
+            return _acesso_negado("Acesso negado a esta funcionalidade.")
+
         return self.get_response(request)
-        
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        usuario = await ausuario_da_requisicao(request)
+        if usuario is None:
+            return await self.get_response(request)
+
+        tela_codigo = self._tela_da_rota(request.path_info)
+        if tela_codigo and not await atem_acesso_tela(usuario, tela_codigo):
+            return _acesso_negado("Acesso negado a esta funcionalidade.")
+
+        return await self.get_response(request)
+
+    def _tela_da_rota(self, path: str) -> Optional[str]:
+        """Identifica a tela atual pela rota."""
+        for rota, codigo in self.rota_para_tela.items():
+            if path.startswith(rota):
+                return codigo
+        return None
+
     def _has_tela_access(self, user, tela_codigo: str) -> bool:
-        """Verifica se o usuário tem acesso à tela."""
-        # Admins têm acesso a todas as telas
-        if user.tipo_usuario == 'admin':
-            return True
-            
-        # Verifica se a tela está nas telas com acesso
-        return user.acesso_telas.filter(codigo=tela_codigo).exists()
\ No newline at end of file
+        return tem_acesso_tela(user, tela_codigo)
+
+
+class InstrumentacaoMiddleware(HybridMiddleware):
+    """Mede cada requisição: tempo total, consultas e tempo no banco, view e serialização.
+
+    Fica no topo de MIDDLEWARE, com `InstrumentacaoViewMiddleware` no fim
+    (o tempo fora da view é atribuído aos middlewares). Emite o cabeçalho
+    Server-Timing, loga as requisições acima de INSTRUMENTACAO_LIMITE_LENTO_MS
+    e alimenta as métricas do Prometheus.
+    """
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        medicao, token = iniciar_medicao()
+        try:
+            response = self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+        return self._concluir(request, response, medicao)
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        medicao, token = iniciar_medicao()
+        try:
+            response = await self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+        return self._concluir(request, response, medicao)
+
+    def _concluir(self, request: HttpRequest, response: HttpResponse, medicao: Medicao) -> HttpResponse:
+        medicao.fim = time.perf_counter()
+        # Disponível também para quem chama a aplicação em processo (benchmark_regressao)
+        request.medicao = medicao
+        response['Server-Timing'] = medicao.server_timing()
+        registrar_se_lenta(request.method, request.path, response.status_code, medicao)
+        monitoramento.registrar_requisicao(
+            request, response.status_code, medicao.total, medicao.consultas, medicao.tempo_db
+        )
+        return response
+
+
+class InstrumentacaoViewMiddleware(HybridMiddleware):
+    """Último de MIDDLEWARE: mede a view, incluindo a renderização da resposta."""
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        inicio = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            self._registrar(inicio)
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        inicio = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            self._registrar(inicio)
+
+    def _registrar(self, inicio: float) -> None:
+        medicao = medicao_atual()
+        if medicao is not None:
+            medicao.tempo_view = time.perf_counter() - inicio
+
+
+class PerfilMiddleware(HybridMiddleware):
+    """Perfil sob demanda para usuários staff: `?perfilar=1` ou cabeçalho `X-Perfilar: 1`.
+
+    A requisição roda sob o amostrador de pilhas de `core/perfil.py` e a
+    resposta é substituída por um JSON com as pilhas no formato colapsado
+    (flame graph), a linha do tempo das consultas SQL e a resposta original;
+    com `perfilar=colapsado` volta só o texto das pilhas. Para quem não é
+    staff o pedido é ignorado; acima de PERFIL_CONCORRENTES perfis
+    simultâneos no worker a requisição segue sem perfil, com `X-Perfil: ocupado`.
+
+    Em ASGI a thread amostrada é a do event loop, então as pilhas podem
+    incluir outras requisições atendidas ao mesmo tempo.
+    """
+
+    PARAMETRO = 'perfilar'
+    CABECALHO = 'X-Perfilar'
+
+    def processar(self, request: HttpRequest) -> HttpResponse:
+        modo = self._modo(request)
+        if modo is None or not self._permitido(usuario_da_requisicao(request)):
+            return self.get_response(request)
+
+        if not perfil.reservar_vaga():
+            return self._ocupado(self.get_response(request))
+        try:
+            amostrador, medicao = self._iniciar(request)
+            try:
+                response = self.get_response(request)
+            finally:
+                amostrador.parar()
+        finally:
+            perfil.liberar_vaga()
+        return self._resposta_perfilada(request, response, amostrador, medicao, modo)
+
+    async def aprocessar(self, request: HttpRequest) -> HttpResponse:
+        modo = self._modo(request)
+        if modo is None or not self._permitido(await ausuario_da_requisicao(request)):
+            return await self.get_response(request)
+
+        if not perfil.reservar_vaga():
+            return self._ocupado(await self.get_response(request))
+        try:
+            amostrador, medicao = self._iniciar(request)
+            try:
+                response = await self.get_response(request)
+            finally:
+                amostrador.parar()
+        finally:
+            perfil.liberar_vaga()
+        return self._resposta_perfilada(request, response, amostrador, medicao, modo)
+
+    def _modo(self, request: HttpRequest) -> Optional[str]:
+        if not settings.PERFIL_HABILITADO:
+            return None
+        valor = request.GET.get(self.PARAMETRO) or request.headers.get(self.CABECALHO)
+        if not valor or valor.lower() in ('0', 'false'):
+            return None
+        return 'colapsado' if valor.lower() == 'colapsado' else 'json'
+
+    def _permitido(self, usuario: Optional[Any]) -> bool:
+        return usuario is not None and usuario.is_active and usuario.is_staff
+
+    def _ocupado(self, response: HttpResponse) -> HttpResponse:
+        response['X-Perfil'] = 'ocupado'
+        return response
+
+    def _iniciar(self, request: HttpRequest) -> Tuple[perfil.Amostrador, Optional[Medicao]]:
+        logger.info('Perfil de %s %s solicitado por %s', request.method, request.path,
+                    getattr(request._usuario_identificado, 'email', None))
+        medicao = medicao_atual()
+        if medicao is not None:
+            medicao.linha_do_tempo = []
+        return perfil.iniciar_amostragem(), medicao
+
+    def _resposta_perfilada(self, request: HttpRequest, response: HttpResponse, amostrador: perfil.Amostrador,
+                            medicao: Optional[Medicao], modo: str) -> HttpResponse:
+        if modo == 'colapsado':
+            resposta = HttpResponse(amostrador.colapsado(), content_type='text/plain; charset=utf-8')
+            resposta['X-Perfil'] = 'colapsado'
+            return resposta
+
+        original, corpo = perfil.conteudo_da_resposta(response)
+        if corpo is not None and 'json' in (original['content_type'] or ''):
+            try:
+                original['corpo'] = json.loads(corpo)
+            except ValueError:
+                pass
+
+        consultas = None
+        if medicao is not None:
+            consultas = {
+                'total': medicao.consultas,
+                'tempo_ms': round(medicao.tempo_db * 1e3, 2),
+                'linha_do_tempo': medicao.linha_do_tempo,
+            }
+
+        resposta = JsonResponse({
+            'status': 'success',
+            'message': 'Requisição perfilada',
+            'data': {
+                'requisicao': {'metodo': request.method, 'caminho': request.get_full_path()},
+                'resposta': original,
+                'perfil': amostrador.resumo(),
+                'consultas': consultas,
+            }
+        })
+        resposta['X-Perfil'] = 'json'
+        return resposta
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='absenteismo',
+            index=models.Index(fields=['data_inicio', 'id'], name='absenteismo_inicio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='absenteismo',
+            index=models.Index(fields=['data_fim', 'id'], name='absenteismo_fim_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['data_convocacao', 'id'], name='convocacao_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['data_limite_resposta', 'id'], name='convocacao_limite_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['data_resposta', 'id'], name='convocacao_resposta_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['nome', 'codigo'], name='funcionario_nome_codigo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['data_admissao', 'codigo'], name='funcionario_admissao_idx'),
+        ),
+    ]
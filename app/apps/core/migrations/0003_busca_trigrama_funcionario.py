@@ -0,0 +1,67 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:30
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations, models
+
+
+# Mantém `busca` sem acentos e em minúsculas, com o CPF também só com dígitos
+BUSCA_SQL = """
+CREATE OR REPLACE FUNCTION core_funcionario_atualizar_busca() RETURNS trigger AS $$
+BEGIN
+    NEW.busca := lower(unaccent(concat_ws(' ',
+        NEW.nome,
+        NEW.cpf,
+        regexp_replace(NEW.cpf, '\\D', '', 'g'),
+        NEW.matricula_funcionario,
+        NEW.email
+    )));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS core_funcionario_busca_trg ON core_funcionario;
+CREATE TRIGGER core_funcionario_busca_trg
+    BEFORE INSERT OR UPDATE OF nome, cpf, matricula_funcionario, email, busca
+    ON core_funcionario
+    FOR EACH ROW EXECUTE FUNCTION core_funcionario_atualizar_busca();
+
+UPDATE core_funcionario SET busca = NULL;
+"""
+
+REMOVER_BUSCA_SQL = """
+DROP TRIGGER IF EXISTS core_funcionario_busca_trg ON core_funcionario;
+DROP FUNCTION IF EXISTS core_funcionario_atualizar_busca();
+"""
+
+
+def criar_trigger_busca(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(BUSCA_SQL)
+
+
+def remover_trigger_busca(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(REMOVER_BUSCA_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_indices_paginacao_keyset'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.AddField(
+            model_name='funcionario',
+            name='busca',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(criar_trigger_busca, remover_trigger_busca),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busca'], name='funcionario_busca_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
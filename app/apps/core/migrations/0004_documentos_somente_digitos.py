@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:32
+
+import app.apps.core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_busca_trigrama_funcionario'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='empresa',
+            constraint=models.UniqueConstraint(app.apps.core.models.SomenteDigitos('cnpj'), name='empresa_cnpj_digitos_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='funcionario',
+            constraint=models.UniqueConstraint(app.apps.core.models.SomenteDigitos('cpf'), name='funcionario_cpf_digitos_uniq'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_documentos_somente_digitos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'busca'], name='funcionario_busca_prefixo_idx', opclasses=['int8_ops', 'text_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.8 on 2026-10-19 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_indice_autocompletar'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='absenteismo',
+            index=models.Index(fields=['empresa', 'data_inicio'], name='absenteismo_emp_inicio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['empresa', 'respondido', 'data_limite_resposta'], name='convocacao_emp_pendentes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'situacao'], name='funcionario_emp_situacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'nome'], name='funcionario_emp_nome_idx'),
+        ),
+    ]
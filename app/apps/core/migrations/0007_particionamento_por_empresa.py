@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import migrations
+
+from app.apps.core.particionamento import MODELOS_PARTICIONAVEIS, desparticionar, particionar
+
+
+# Opcional: só converte com CORE_PARTICOES_HASH > 0. Em bancos já migrados sem a
+# configuração, a conversão pode ser feita depois com `manage.py particionamento converter`.
+def particionar_tabelas(apps, schema_editor):
+    particoes = getattr(settings, 'CORE_PARTICOES_HASH', 0)
+    if schema_editor.connection.vendor != 'postgresql' or particoes <= 0:
+        return
+
+    for nome in MODELOS_PARTICIONAVEIS:
+        particionar(schema_editor, apps.get_model('core', nome), particoes)
+
+
+def desparticionar_tabelas(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for nome in MODELOS_PARTICIONAVEIS:
+        desparticionar(schema_editor, apps.get_model('core', nome))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_indices_por_empresa'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar_tabelas, desparticionar_tabelas),
+    ]
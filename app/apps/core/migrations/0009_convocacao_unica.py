@@ -0,0 +1,56 @@
+# Generated by Django 4.2.8 on 2026-10-19 09:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+CAMPOS_UNICOS = ('empresa', 'funcionario', 'tipo', 'data_convocacao')
+
+# Grupos repetidos listados na mensagem de erro
+GRUPOS_LISTADOS = 20
+
+
+# Antes da constraint nada impedia convocações repetidas. Elas não são mescladas
+# aqui (respostas e observações podem divergir): a migração para com a lista dos
+# ids para que sejam revisadas, e o AddConstraint não falha com IntegrityError.
+def verificar_repetidas(apps, schema_editor):
+    Convocacao = apps.get_model('core', 'Convocacao')
+    convocacoes = Convocacao.objects.using(schema_editor.connection.alias)
+
+    grupos = list(
+        convocacoes.values(*CAMPOS_UNICOS)
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .order_by(*CAMPOS_UNICOS)[:GRUPOS_LISTADOS + 1]
+    )
+    if not grupos:
+        return
+
+    linhas = []
+    for grupo in grupos[:GRUPOS_LISTADOS]:
+        ids = convocacoes.filter(**{campo: grupo[campo] for campo in CAMPOS_UNICOS}).order_by('id')
+        linhas.append(
+            f'  empresa {grupo["empresa"]}, funcionário {grupo["funcionario"]}, tipo {grupo["tipo"]}, '
+            f'{grupo["data_convocacao"]}: ids {", ".join(str(pk) for pk in ids.values_list("id", flat=True))}'
+        )
+    if len(grupos) > GRUPOS_LISTADOS:
+        linhas.append('  ...')
+
+    raise RuntimeError(
+        'Há convocações repetidas para o mesmo funcionário, tipo e data; mantenha uma de cada '
+        'grupo (removendo ou mudando a data das demais) e rode a migração de novo:\n' + '\n'.join(linhas)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_tipos_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_repetidas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='convocacao',
+            constraint=models.UniqueConstraint(fields=('empresa', 'funcionario', 'tipo', 'data_convocacao'), name='convocacao_func_tipo_data_uniq'),
+        ),
+    ]
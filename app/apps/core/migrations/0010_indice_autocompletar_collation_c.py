@@ -0,0 +1,56 @@
+# Generated by Django 4.2.8 on 2026-10-19 10:05
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+INDICE_ANTERIOR = models.Index(
+    fields=['empresa', 'busca'], name='funcionario_busca_prefixo_idx', opclasses=['int8_ops', 'text_pattern_ops']
+)
+INDICE = models.Index(
+    models.F('empresa'), django.db.models.functions.comparison.Collate('busca', 'C'), models.F('codigo'),
+    name='funcionario_busca_prefixo_idx'
+)
+
+
+# text_pattern_ops atende o LIKE 'termo%', mas não o ORDER BY busca, que segue a
+# collation do banco; com COLLATE "C" o índice comum atende os dois. A collation
+# "C" só existe no PostgreSQL: nos demais bancos o índice anterior permanece.
+def trocar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Funcionario = apps.get_model('core', 'Funcionario')
+    schema_editor.remove_index(Funcionario, INDICE_ANTERIOR)
+    schema_editor.add_index(Funcionario, INDICE)
+
+
+def restaurar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Funcionario = apps.get_model('core', 'Funcionario')
+    schema_editor.remove_index(Funcionario, INDICE)
+    schema_editor.add_index(Funcionario, INDICE_ANTERIOR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_convocacao_unica'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(trocar_indice, restaurar_indice),
+            ],
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name='funcionario',
+                    name='funcionario_busca_prefixo_idx',
+                ),
+                migrations.AddIndex(
+                    model_name='funcionario',
+                    index=INDICE,
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.8 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_indice_autocompletar_collation_c'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='absenteismo',
+            name='absenteismo_inicio_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='absenteismo',
+            name='absenteismo_fim_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='convocacao',
+            name='convocacao_data_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='convocacao',
+            name='convocacao_limite_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='convocacao',
+            name='convocacao_resposta_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_nome_codigo_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_admissao_idx',
+        ),
+        migrations.AddIndex(
+            model_name='absenteismo',
+            index=models.Index(fields=['empresa', 'data_inicio', 'id'], name='absenteismo_inicio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='absenteismo',
+            index=models.Index(fields=['empresa', 'data_fim', 'id'], name='absenteismo_fim_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['empresa', 'data_convocacao', 'id'], name='convocacao_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['empresa', 'data_limite_resposta', 'id'], name='convocacao_limite_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['empresa', 'data_resposta', 'id'], name='convocacao_resposta_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'nome', 'codigo'], name='funcionario_nome_codigo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'data_admissao', 'codigo'], name='funcionario_admissao_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.8 on 2026-10-19 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_indices_keyset_por_empresa'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='absenteismo',
+            name='absenteismo_emp_inicio_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='convocacao',
+            name='convocacao_emp_pendentes_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_emp_situacao_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_emp_nome_idx',
+        ),
+        migrations.AddIndex(
+            model_name='convocacao',
+            index=models.Index(fields=['empresa', 'respondido', 'data_limite_resposta', 'id'], name='convocacao_emp_pendentes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['empresa', 'situacao', 'nome', 'codigo'], name='funcionario_emp_situacao_idx'),
+        ),
+    ]
@@ -0,0 +1,581 @@
+import hashlib
+import logging
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import OperationalError, connections, router, transaction
+from django.db.models import Count, Max, Model, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+from .compiled_serializers import SerializerCompilado, SerializerNaoCompilavel
+from .conexoes import consulta_cancelada, registrar_cancelamento
+from .pagination import obter_ordenacao
+from .routers import ativar_replica, desativar_replica, fixado_no_primario, fixar_no_primario
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+# Plano de consulta por (modelo, serializer, campos), calculado uma única vez.
+# As combinações de `?fields=` são livres, então o cache tem tamanho limitado:
+# cheio, as combinações novas são calculadas a cada requisição sem entrar nele,
+# e as já guardadas (em geral as mais usadas, que chegam primeiro) permanecem.
+MAX_PLANOS = 512
+Plano = Tuple[Tuple[str, ...], Tuple[str, ...], Optional[Tuple[str, ...]]]
+_planos: Dict[Tuple[Type[Model], Type[serializers.BaseSerializer], Optional[FrozenSet[str]]], Plano] = {}
+
+# Serializers compilados por (modelo, serializer, campos); `None` quando não compiláveis.
+# Limitado por MAX_PLANOS como os planos
+_AUSENTE = object()
+_compilados: Dict[Tuple[Type[Model], Type[serializers.BaseSerializer], Optional[FrozenSet[str]]], Optional[SerializerCompilado]] = {}
+
+# Nomes dos campos de cada serializer
+_campos_serializer: Dict[Type[serializers.BaseSerializer], FrozenSet[str]] = {}
+
+
+def _usa_apenas_pk(campo: serializers.Field) -> bool:
+    """Indica se o campo de relacionamento só precisa da chave estrangeira."""
+    if isinstance(campo, serializers.ManyRelatedField):
+        campo = campo.child_relation
+    return isinstance(campo, serializers.RelatedField) and campo.use_pk_only_optimization()
+
+
+def planejar_relacionamentos(
+    model: Type[Model],
+    serializer: serializers.BaseSerializer,
+    prefixo: str = ''
+) -> Tuple[Set[str], Set[str]]:
+    """Deduz `select_related`/`prefetch_related` a partir dos `source` do serializer.
+
+    Percorre os caminhos pontuados (`empresa.nome_abreviado`) e os serializers
+    aninhados: cadeias de FK/OneToOne viram `select_related`; qualquer trecho
+    "para muitos" transforma o caminho em `prefetch_related`.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    select_related: Set[str] = set()
+    prefetch_related: Set[str] = set()
+
+    for campo in serializer.fields.values():
+        if campo.write_only or campo.source == '*':
+            continue
+
+        caminho = []
+        muitos = False
+        atual = model
+        partes = campo.source_attrs
+
+        for indice, parte in enumerate(partes):
+            try:
+                field = atual._meta.get_field(parte)
+            except FieldDoesNotExist:
+                break
+            if not field.is_relation:
+                break
+
+            para_muitos = field.many_to_many or field.one_to_many
+
+            # A última FK de um PrimaryKeyRelatedField já está na própria linha
+            if indice == len(partes) - 1 and _usa_apenas_pk(campo) and not para_muitos:
+                break
+
+            caminho.append(parte)
+            muitos = muitos or para_muitos
+            atual = field.related_model
+
+        if not caminho:
+            continue
+
+        path = prefixo + '__'.join(caminho)
+        if muitos:
+            prefetch_related.add(path)
+        else:
+            select_related.add(path)
+
+        # Serializers aninhados herdam o caminho do relacionamento
+        if isinstance(campo, serializers.BaseSerializer) and len(caminho) == len(partes):
+            aninhado_select, aninhado_prefetch = planejar_relacionamentos(
+                atual, campo, prefixo=path + '__'
+            )
+            if muitos:
+                prefetch_related |= aninhado_select | aninhado_prefetch
+            else:
+                select_related |= aninhado_select
+                prefetch_related |= aninhado_prefetch
+
+    return select_related, prefetch_related
+
+
+def planejar_colunas(model: Type[Model], serializer: serializers.BaseSerializer) -> Optional[Set[str]]:
+    """Deduz as colunas necessárias para `.only()` a partir dos `source` do serializer.
+
+    Retorna `None` quando algum campo depende de algo que não é uma coluna
+    (propriedades, métodos, `__str__` de relacionamentos, serializers
+    aninhados); nesse caso a consulta deve carregar todas as colunas.
+    """
+    colunas = {model._meta.pk.name}
+
+    for campo in serializer.fields.values():
+        if campo.write_only:
+            continue
+        if campo.source == '*':
+            return None
+
+        caminho = []
+        atual = model
+        partes = campo.source_attrs
+
+        for indice, parte in enumerate(partes):
+            try:
+                field = atual._meta.get_field(parte)
+            except FieldDoesNotExist:
+                return None
+
+            caminho.append(parte)
+
+            if not field.is_relation:
+                colunas.add('__'.join(caminho))
+                break
+
+            # Relacionamentos "para muitos" são carregados por prefetch
+            if field.many_to_many or field.one_to_many:
+                break
+
+            colunas.add('__'.join(caminho))
+
+            if indice == len(partes) - 1:
+                if not _usa_apenas_pk(campo):
+                    return None
+                break
+
+            atual = field.related_model
+
+    return colunas
+
+
+class SelectRelatedMixin:
+    """Mixin de ViewSet que aplica `select_related`/`prefetch_related` automaticamente.
+
+    O plano é deduzido do serializer da action, evitando consultas N+1 quando
+    novos campos relacionados forem adicionados ao serializer.
+    """
+
+    def get_sparse_fields(self) -> Optional[FrozenSet[str]]:
+        """Campos do serializer solicitados na requisição; `None` para todos."""
+        return None
+
+    def get_related_plan(self) -> Plano:
+        """Retorna o plano (select_related, prefetch_related, colunas) do serializer atual."""
+        serializer_class = self.get_serializer_class()
+        model = self.queryset.model
+        campos = self.get_sparse_fields()
+        chave = (model, serializer_class, campos)
+
+        plano = _planos.get(chave)
+        if plano is None:
+            serializer = serializer_class(context=self.get_serializer_context())
+            if campos is not None:
+                for nome in set(serializer.fields) - campos:
+                    serializer.fields.pop(nome)
+
+            select_related, prefetch_related = planejar_relacionamentos(model, serializer)
+            colunas = planejar_colunas(model, serializer)
+            plano = (
+                tuple(sorted(select_related)),
+                tuple(sorted(prefetch_related)),
+                tuple(sorted(colunas)) if colunas is not None else None
+            )
+            if len(_planos) < MAX_PLANOS:
+                _planos[chave] = plano
+
+        return plano
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        select_related, prefetch_related, _ = self.get_related_plan()
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        return queryset
+
+
+class SparseFieldsetMixin(SelectRelatedMixin):
+    """Mixin de ViewSet que aceita `?fields=` e `?omit=` nas leituras.
+
+    Os campos removidos deixam de ser serializados, os relacionamentos que só
+    eles usavam deixam de ser unidos e a seleção é reduzida com `.only()`.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self) -> Optional[FrozenSet[str]]:
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return None
+
+        fields = request.query_params.get(self.fields_query_param)
+        omit = request.query_params.get(self.omit_query_param)
+        if not fields and not omit:
+            return None
+
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in _campos_serializer:
+            _campos_serializer[serializer_class] = frozenset(
+                serializer_class(context=self.get_serializer_context()).fields
+            )
+        disponiveis = _campos_serializer[serializer_class]
+
+        campos = disponiveis
+        if fields:
+            campos = campos & {nome.strip() for nome in fields.split(',')}
+        if omit:
+            campos = campos - {nome.strip() for nome in omit.split(',')}
+
+        # Parâmetros sem nenhum campo válido não alteram a resposta
+        if not campos:
+            return None
+
+        return frozenset(campos)
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> serializers.BaseSerializer:
+        serializer = super().get_serializer(*args, **kwargs)
+        campos = self.get_sparse_fields()
+
+        if campos is not None:
+            alvo = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            for nome in set(alvo.fields) - campos:
+                alvo.fields.pop(nome)
+
+        return serializer
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+
+        if self.get_sparse_fields() is None:
+            return queryset
+
+        colunas = self.get_related_plan()[2]
+        if colunas is None:
+            return queryset
+
+        # Campos de ordenação continuam carregados para a paginação keyset
+        # (anotações, como a relevância da busca, já vêm na seleção)
+        ordenacao = [
+            termo.lstrip('-+') for termo in
+            (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(termo, str) and termo != '?' and '__' not in termo
+            and termo.lstrip('-+') not in queryset.query.annotations
+        ]
+
+        return queryset.only(*colunas, *ordenacao)
+
+
+class CompiledReadMixin:
+    """Mixin de ViewSet que serve a listagem por um serializer compilado.
+
+    A listagem lê tuplas de `values_list()` e as converte com
+    `SerializerCompilado`, mantendo a mesma saída do serializer da viewset.
+    Escritas, detalhes e serializers não compiláveis seguem o caminho normal.
+    Deve ser combinado com `SparseFieldsetMixin`, que fornece os campos pedidos.
+    """
+
+    compiled_read = True
+
+    def get_compiled_serializer(self) -> Optional[SerializerCompilado]:
+        serializer_class = self.get_serializer_class()
+        model = self.queryset.model
+        campos = self.get_sparse_fields()
+        chave = (model, serializer_class, campos)
+
+        compilado = _compilados.get(chave, _AUSENTE)
+        if compilado is _AUSENTE:
+            serializer = self.get_serializer()
+            try:
+                compilado = SerializerCompilado(model, serializer)
+            except SerializerNaoCompilavel:
+                compilado = None
+            if len(_compilados) < MAX_PLANOS:
+                _compilados[chave] = compilado
+
+        return compilado
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        compilado = self.get_compiled_serializer() if self.compiled_read else None
+        if compilado is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Colunas de ordenação acompanham as linhas para a paginação keyset
+        colunas = list(compilado.colunas)
+        for nome, _, _ in obter_ordenacao(queryset):
+            if nome not in colunas:
+                colunas.append(nome)
+
+        queryset = queryset.values_list(*colunas, named=True)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compilado.serializar(page, request))
+
+        return Response(compilado.serializar(queryset, request))
+
+
+class ConditionalGetMixin:
+    """Mixin de ViewSet com GET condicional (ETag / Last-Modified).
+
+    Os validadores vêm de `atualizado_em` da linha e das tabelas unidas pelo
+    serializer (nomes de funcionário, tipo e empresa): no detalhe, da própria
+    linha; na listagem, do `MAX` de cada uma e de `COUNT(*)` sobre o conjunto
+    filtrado, para que exclusões também invalidem o ETag. Um `If-None-Match`
+    ou `If-Modified-Since` que confira responde 304 antes da serialização.
+    A listagem não envia Last-Modified, pois o máximo não enxerga exclusões,
+    e no modo cursor não tem ETag: a agregação percorreria o conjunto inteiro
+    que a paginação keyset evita ler.
+    """
+
+    last_modified_field = 'atualizado_em'
+
+    def _campos_de_versao(self) -> List[str]:
+        """`atualizado_em` do modelo e dos relacionamentos unidos pelo serializer."""
+        campos = [self.last_modified_field]
+        if not hasattr(self, 'get_related_plan'):
+            return campos
+
+        for caminho in self.get_related_plan()[0]:
+            relacionado = self.queryset.model
+            for parte in caminho.split('__'):
+                relacionado = relacionado._meta.get_field(parte).related_model
+            try:
+                relacionado._meta.get_field(self.last_modified_field)
+            except FieldDoesNotExist:
+                continue
+            campos.append(f'{caminho}__{self.last_modified_field}')
+        return campos
+
+    def _etag(self, request: Request, *partes: Any) -> str:
+        # A representação varia com a query string (página, campos), o formato e a empresa
+        chave = '|'.join([
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            str(getattr(request, 'empresa_context', '')),
+        ] + [str(parte) for parte in partes])
+        return '"%s"' % hashlib.md5(chave.encode('utf-8')).hexdigest()
+
+    def _condicional(self, request: Request, etag: str, last_modified: Optional[int]) -> Optional[Any]:
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def _aplicar_validadores(self, response: Response, etag: str, last_modified: Optional[int]) -> Response:
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        cursor_param = getattr(self.paginator, 'cursor_query_param', None)
+        if request.method not in ('GET', 'HEAD') or (cursor_param and cursor_param in request.query_params):
+            return super().list(request, *args, **kwargs)
+
+        campos = self._campos_de_versao()
+        versao = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            *[Max(campo) for campo in campos],
+            total=Count('pk')
+        )
+        ultimas = [versao[f'{campo}__max'] for campo in campos]
+        etag = self._etag(request, *[ultima.isoformat() if ultima else '' for ultima in ultimas], versao['total'])
+
+        resposta = self._condicional(request, etag, None)
+        if resposta is not None:
+            return resposta
+
+        response = super().list(request, *args, **kwargs)
+        return self._aplicar_validadores(response, etag, None)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        versoes = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).order_by().values_list(*self._campos_de_versao()).first()
+
+        # Registro inexistente segue o fluxo normal (404)
+        if versoes is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self._etag(request, self.kwargs[lookup_url_kwarg],
+                          *[versao.isoformat() if versao else '' for versao in versoes])
+        last_modified = int(max(versao for versao in versoes if versao).timestamp())
+
+        resposta = self._condicional(request, etag, last_modified)
+        if resposta is not None:
+            return resposta
+
+        response = super().retrieve(request, *args, **kwargs)
+        return self._aplicar_validadores(response, etag, last_modified)
+
+
+class EmpresaContextMixin:
+    """Mixin de ViewSet que restringe o queryset à empresa do contexto.
+
+    Listagens, detalhes, alterações e exclusões passam a enxergar apenas as
+    linhas de `request.empresa_context`; sem empresa no contexto o queryset
+    fica vazio. Deve vir antes dos demais mixins, para que todas as consultas
+    derivadas de `get_queryset()` (contagens, ETags) já partam do recorte.
+
+    Nas escritas a empresa enviada pelo cliente é ignorada e a do contexto é
+    gravada, e chaves estrangeiras para modelos da empresa (funcionário) só
+    aceitam registros dessa mesma empresa.
+    """
+
+    empresa_field = 'empresa_id'
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        empresa_id = getattr(self.request, 'empresa_context', None)
+
+        if not empresa_id:
+            return queryset.none()
+        return queryset.filter(**{self.empresa_field: empresa_id})
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> serializers.BaseSerializer:
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.request.method in SAFE_METHODS or isinstance(serializer, serializers.ListSerializer):
+            return serializer
+
+        empresa_id = getattr(self.request, 'empresa_context', None)
+        campo_empresa = self.queryset.model._meta.get_field(self.empresa_field)
+
+        for campo in serializer.fields.values():
+            if campo.source == campo_empresa.name:
+                campo.read_only = True
+                continue
+
+            queryset = getattr(campo, 'queryset', None)
+            if queryset is None:
+                continue
+            try:
+                queryset.model._meta.get_field(self.empresa_field)
+            except FieldDoesNotExist:
+                continue
+            campo.queryset = queryset.filter(**{self.empresa_field: empresa_id})
+
+        return serializer
+
+    def _salvar_na_empresa(self, serializer: serializers.BaseSerializer) -> None:
+        empresa_id = getattr(self.request, 'empresa_context', None)
+        campo_empresa = self.queryset.model._meta.get_field(self.empresa_field)
+        empresa = campo_empresa.related_model._default_manager.filter(pk=empresa_id).first() if empresa_id else None
+        if empresa is None:
+            raise serializers.ValidationError('Contexto de empresa não definido')
+        serializer.save(**{campo_empresa.name: empresa})
+
+    def perform_create(self, serializer: serializers.BaseSerializer) -> None:
+        self._salvar_na_empresa(serializer)
+
+    def perform_update(self, serializer: serializers.BaseSerializer) -> None:
+        self._salvar_na_empresa(serializer)
+
+
+class ReplicaReadMixin:
+    """Mixin de ViewSet que envia leituras para a réplica (ver `ReplicaRouter`).
+
+    As actions de `replica_actions` em métodos seguros leem da réplica, a não
+    ser que o usuário tenha escrito há pouco: toda escrita bem-sucedida fixa
+    o usuário no primário por REPLICA_FIXACAO_SEGUNDOS (read-your-writes).
+    """
+
+    replica_actions = ('list', 'retrieve', 'metricas', 'exportar')
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        # Autenticação e permissões (super) ainda consultam o primário
+        super().initial(request, *args, **kwargs)
+
+        if (request.method in SAFE_METHODS and self.action in self.replica_actions
+                and not fixado_no_primario(request.user.pk)):
+            self._replica_token = ativar_replica()
+
+    def finalize_response(self, request: Request, response: Any, *args: Any, **kwargs: Any) -> Any:
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and request.user.is_authenticated):
+            fixar_no_primario(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            token = getattr(self, '_replica_token', None)
+            if token is not None:
+                self._replica_token = None
+                desativar_replica(token)
+
+
+class StatementTimeoutMixin:
+    """Mixin de ViewSet que limita o tempo de cada consulta SQL da requisição.
+
+    A requisição roda em uma transação no banco que vai atendê-la (réplica ou
+    primário) com `SET LOCAL statement_timeout`, cujo valor vem da action:
+    TEMPO_LIMITE_CONSULTAS nas configurações, sobrescrito por
+    `tempo_limite_acoes` na viewset. Uma consulta cancelada responde 503 com
+    o payload de erro padrão e é contada por endpoint. Exceções tratadas pela
+    viewset desfazem a transação, como em ATOMIC_REQUESTS.
+    Deve vir antes de `ReplicaReadMixin`, que escolhe o banco das leituras.
+    """
+
+    tempo_limite_acoes: Dict[str, int] = {}
+
+    def get_tempo_limite(self) -> int:
+        """Tempo limite, em milissegundos, das consultas da action atual."""
+        limites = {**settings.TEMPO_LIMITE_CONSULTAS, **self.tempo_limite_acoes}
+        return limites.get(self.action, limites['padrao'])
+
+    def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self._transacoes = ExitStack()
+        self._alias_tempo_limite = None
+        with self._transacoes:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+
+        model = self.queryset.model
+        if request.method in SAFE_METHODS:
+            alias = router.db_for_read(model)
+        else:
+            alias = router.db_for_write(model)
+
+        if connections[alias].vendor != 'postgresql':
+            return
+
+        self._transacoes.enter_context(transaction.atomic(using=alias))
+        self._alias_tempo_limite = alias
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SET LOCAL statement_timeout = %s', [self.get_tempo_limite()])
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if self._alias_tempo_limite is not None:
+            transaction.set_rollback(True, using=self._alias_tempo_limite)
+
+        if isinstance(exc, OperationalError) and consulta_cancelada(exc):
+            endpoint = f'{type(self).__name__}.{self.action}'
+            registrar_cancelamento(endpoint)
+            logger.warning('Consulta cancelada por tempo limite em %s (%d ms)', endpoint, self.get_tempo_limite())
+
+            return Response({
+                'status': 'error',
+                'message': 'A consulta excedeu o tempo limite. Refine os filtros e tente novamente.',
+                'codigo': 'tempo_limite_excedido'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '30'})
+
+        return super().handle_exception(exc)
@@ -1,6 +1,10 @@
+import re
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Collate
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import RegexValidator
-from typing import List, Tuple, Optional
+from typing import Any, List, Tuple, Optional
 
 
 # Constantes
@@ -26,6 +30,69 @@ cep_validator = RegexValidator(
 )
 
 
+# Caracteres de formatação de CPF e CNPJ (para bancos sem expressões regulares)
+PONTUACAO_DOCUMENTOS = '.-/ '
+
+
+def somente_digitos(valor: Optional[str]) -> str:
+    """Remove a formatação de documentos (CPF, CNPJ), mantendo só os dígitos."""
+    return re.sub(r'[^0-9]', '', valor or '')
+
+
+class SomenteDigitos(models.Func):
+    """Expressão `regexp_replace(campo, '[^0-9]', '', 'g')`, usada nos índices de documentos."""
+    
+    function = 'REGEXP_REPLACE'
+    
+    def __init__(self, expression: Any, **extra: Any) -> None:
+        super().__init__(
+            expression,
+            models.Value('[^0-9]'),
+            models.Value(''),
+            models.Value('g'),
+            output_field=models.CharField(),
+            **extra
+        )
+    
+    def as_sqlite(self, compiler: Any, connection: Any, **extra_context: Any) -> Tuple[str, List[Any]]:
+        # O SQLite não tem regexp_replace: remove a pontuação usada em CPF e CNPJ
+        expressao = self.source_expressions[0]
+        for caractere in PONTUACAO_DOCUMENTOS:
+            expressao = models.Func(
+                expressao, models.Value(caractere), models.Value(''),
+                function='REPLACE', output_field=models.CharField()
+            )
+        return compiler.compile(expressao)
+
+
+class EmpresaQuerySet(models.QuerySet):
+    """QuerySet de Empresa."""
+    
+    def por_cnpj(self, cnpj: str) -> 'EmpresaQuerySet':
+        """Busca pelo CNPJ com ou sem formatação, usando o índice de dígitos."""
+        return self.alias(cnpj_digitos=SomenteDigitos('cnpj')).filter(
+            cnpj_digitos=somente_digitos(cnpj)
+        )
+
+
+class PorEmpresaQuerySet(models.QuerySet):
+    """QuerySet de modelos que pertencem a uma empresa."""
+    
+    def da_empresa(self, empresa_id: int) -> 'PorEmpresaQuerySet':
+        """Restringe às linhas da empresa, usando a coluna da FK (sem join)."""
+        return self.filter(empresa_id=empresa_id)
+
+
+class FuncionarioQuerySet(PorEmpresaQuerySet):
+    """QuerySet de Funcionário."""
+    
+    def por_cpf(self, cpf: str) -> 'FuncionarioQuerySet':
+        """Busca pelo CPF com ou sem formatação, usando o índice de dígitos."""
+        return self.alias(cpf_digitos=SomenteDigitos('cpf')).filter(
+            cpf_digitos=somente_digitos(cpf)
+        )
+
+
 class Empresa(models.Model):
     """Modelo de Empresa"""
     
@@ -65,10 +132,16 @@ class Empresa(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
+    objects = EmpresaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Empresa'
         verbose_name_plural = 'Empresas'
         ordering = ['nome_abreviado']
+        constraints = [
+            # CNPJ só com dígitos, para buscas independentes da formatação
+            models.UniqueConstraint(SomenteDigitos('cnpj'), name='empresa_cnpj_digitos_uniq'),
+        ]
     
     def __str__(self) -> str:
         return f"{self.nome_abreviado} ({self.codigo})"
@@ -137,15 +210,39 @@ class Funcionario(models.Model):
     email = models.EmailField(max_length=400, null=True, blank=True)
     telefone = models.CharField(max_length=20, null=True, blank=True)
     
+    # Busca textual (mantida por trigger no banco: sem acentos e em minúsculas)
+    busca = models.TextField(null=True, blank=True, editable=False)
+    
     # Metadados
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
+    objects = FuncionarioQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Funcionário'
         verbose_name_plural = 'Funcionários'
         ordering = ['nome']
         unique_together = ('empresa', 'codigo')
+        constraints = [
+            # CPF só com dígitos, para buscas independentes da formatação
+            models.UniqueConstraint(SomenteDigitos('cpf'), name='funcionario_cpf_digitos_uniq'),
+        ]
+        indexes = [
+            # Paginação keyset: empresa do contexto, ordenação e PK como desempate
+            models.Index(fields=['empresa', 'nome', 'codigo'], name='funcionario_nome_codigo_idx'),
+            models.Index(fields=['empresa', 'data_admissao', 'codigo'], name='funcionario_admissao_idx'),
+            # Listagem filtrada por situação, na ordenação padrão
+            models.Index(fields=['empresa', 'situacao', 'nome', 'codigo'], name='funcionario_emp_situacao_idx'),
+            # Busca por trigramas (LIKE '%termo%' e similaridade)
+            GinIndex(fields=['busca'], name='funcionario_busca_trgm_idx', opclasses=['gin_trgm_ops']),
+            # Autocompletar por prefixo dentro da empresa (LIKE 'termo%' ordenado por busca):
+            # com a collation C o mesmo índice filtra e já entrega as linhas em ordem
+            models.Index(
+                F('empresa'), Collate('busca', 'C'), F('codigo'),
+                name='funcionario_busca_prefixo_idx'
+            ),
+        ]
     
     def __str__(self) -> str:
         return f"{self.nome} - {self.empresa.nome_abreviado}"
@@ -161,6 +258,9 @@ class TipoConvocacao(models.Model):
     nome = models.CharField(max_length=100)
     descricao = models.TextField(blank=True, null=True)
     
+    # Versão do cadastro, usada nos ETags das listagens que exibem o nome
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
     class Meta:
         verbose_name = 'Tipo de Convocação'
         verbose_name_plural = 'Tipos de Convocação'
@@ -217,10 +317,31 @@ class Convocacao(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
+    objects = PorEmpresaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Convocação'
         verbose_name_plural = 'Convocações'
         ordering = ['-data_convocacao']
+        constraints = [
+            # Uma convocação por funcionário, tipo e data (reenvio de lote não duplica);
+            # inclui `empresa`, como exige a tabela particionada por empresa
+            models.UniqueConstraint(
+                fields=['empresa', 'funcionario', 'tipo', 'data_convocacao'],
+                name='convocacao_func_tipo_data_uniq'
+            ),
+        ]
+        indexes = [
+            # Paginação keyset: empresa do contexto, ordenação e PK como desempate
+            models.Index(fields=['empresa', 'data_convocacao', 'id'], name='convocacao_data_id_idx'),
+            models.Index(fields=['empresa', 'data_limite_resposta', 'id'], name='convocacao_limite_id_idx'),
+            models.Index(fields=['empresa', 'data_resposta', 'id'], name='convocacao_resposta_id_idx'),
+            # Pendências da empresa por prazo de resposta (também paginadas por keyset)
+            models.Index(
+                fields=['empresa', 'respondido', 'data_limite_resposta', 'id'],
+                name='convocacao_emp_pendentes_idx'
+            ),
+        ]
     
     def __str__(self) -> str:
         return f"Convocação {self.id} - {self.funcionario.nome} ({self.data_convocacao})"
@@ -239,6 +360,9 @@ class TipoAbsenteismo(models.Model):
     descricao = models.TextField(blank=True, null=True)
     requer_atestado = models.BooleanField(default=False)
     
+    # Versão do cadastro, usada nos ETags das listagens que exibem o nome
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
     class Meta:
         verbose_name = 'Tipo de Absenteísmo'
         verbose_name_plural = 'Tipos de Absenteísmo'
@@ -292,10 +416,17 @@ class Absenteismo(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
+    objects = PorEmpresaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Absenteísmo'
         verbose_name_plural = 'Absenteísmos'
         ordering = ['-data_inicio']
+        indexes = [
+            # Paginação keyset: empresa do contexto, ordenação e PK como desempate
+            models.Index(fields=['empresa', 'data_inicio', 'id'], name='absenteismo_inicio_id_idx'),
+            models.Index(fields=['empresa', 'data_fim', 'id'], name='absenteismo_fim_id_idx'),
+        ]
     
     def __str__(self) -> str:
         return f"{self.funcionario.nome} - {self.tipo.nome} ({self.data_inicio} a {self.data_fim})"
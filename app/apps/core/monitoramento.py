@@ -0,0 +1,116 @@
+import os
+import time
+from django.http import HttpRequest
+from typing import Tuple
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+        generate_latest, multiprocess
+    )
+except ImportError:  # prometheus-client é opcional; sem ele nada é medido
+    DISPONIVEL = False
+else:
+    DISPONIVEL = True
+
+# Com PROMETHEUS_MULTIPROC_DIR (definido no gunicorn.conf.py) cada worker grava
+# as métricas em arquivos mapeados em memória nesse diretório, e a coleta soma
+# os de todos os workers
+MULTIPROCESSO = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+# Rota não resolvida (404): um rótulo só, para não multiplicar as séries
+VIEW_NAO_RESOLVIDA = '<nao_resolvida>'
+
+# Profundidade das filas é atualizada no máximo uma vez por segundo por worker
+INTERVALO_FILAS = 1.0
+_filas_em = 0.0
+
+if DISPONIVEL:
+    DURACAO = Histogram(
+        'portal_http_requisicao_segundos', 'Duração das requisições',
+        ['view', 'metodo', 'status'],
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    )
+    CONSULTAS = Histogram(
+        'portal_http_requisicao_consultas', 'Consultas SQL por requisição',
+        ['view'],
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250)
+    )
+    TEMPO_DB = Counter(
+        'portal_http_banco_segundos', 'Tempo somado das consultas SQL das requisições',
+        ['view']
+    )
+    CACHE = Counter(
+        'portal_cache_consultas', 'Consultas aos caches em memória por resultado',
+        ['cache', 'resultado']
+    )
+    FILAS = Gauge(
+        'portal_fila_profundidade', 'Itens aguardando nas filas internas do worker',
+        ['fila'], multiprocess_mode='livesum'
+    )
+    POOL_EM_EXECUCAO = Gauge(
+        'portal_pool_consultas_em_execucao', 'Consultas em execução no pool das views assíncronas',
+        multiprocess_mode='livesum'
+    )
+
+
+def nome_da_view(request: HttpRequest) -> str:
+    """Nome da rota resolvida (`funcionario-list`), ou o caminho da função da view."""
+    resolucao = getattr(request, 'resolver_match', None)
+    if resolucao is None:
+        return VIEW_NAO_RESOLVIDA
+    return resolucao.view_name or resolucao._func_path
+
+
+def registrar_requisicao(request: HttpRequest, status: int, duracao: float, consultas: int, tempo_db: float) -> None:
+    """Chamado pelo InstrumentacaoMiddleware ao fim de cada requisição."""
+    if not DISPONIVEL:
+        return
+
+    view = nome_da_view(request)
+    DURACAO.labels(view, request.method, str(status)).observe(duracao)
+    CONSULTAS.labels(view).observe(consultas)
+    if tempo_db:
+        TEMPO_DB.labels(view).inc(tempo_db)
+
+    _atualizar_filas()
+
+
+def registrar_cache(cache: str, acerto: bool) -> None:
+    if DISPONIVEL:
+        CACHE.labels(cache, 'acerto' if acerto else 'falha').inc()
+
+
+def _atualizar_filas(forcar: bool = False) -> None:
+    global _filas_em
+
+    agora = time.monotonic()
+    if not forcar and agora - _filas_em < INTERVALO_FILAS:
+        return
+    _filas_em = agora
+
+    from app.apps.autenticacao.middleware import logs_pendentes
+    from .assincrono import situacao_pool
+
+    pool = situacao_pool()
+    FILAS.labels('consultas').set(pool['na_fila'])
+    FILAS.labels('logs_acesso').set(logs_pendentes())
+    POOL_EM_EXECUCAO.set(pool['em_execucao'])
+
+
+def exportar() -> Tuple[bytes, str]:
+    """Métricas no formato texto do Prometheus (de todos os workers, em multiprocesso)."""
+    _atualizar_filas(forcar=True)
+
+    if MULTIPROCESSO:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def encerrar_processo(pid: int) -> None:
+    """Gancho `child_exit` do gunicorn: descarta os gauges do worker encerrado."""
+    if DISPONIVEL and MULTIPROCESSO:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,266 @@
+import base64
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+def _resolve_field(model: Any, caminho: str) -> Any:
+    """Resolve um caminho com `__` até o campo final do modelo."""
+    campo = None
+    for parte in caminho.split('__'):
+        try:
+            campo = model._meta.get_field(parte)
+        except FieldDoesNotExist:
+            return None
+        if campo.is_relation:
+            model = campo.related_model
+    return campo
+
+
+def _codificar_valor(valor: Any) -> Any:
+    # O DjangoJSONEncoder trunca datas e horas em milissegundos; no cursor elas
+    # precisam da precisão completa, ou linhas empatadas até o milissegundo se repetem
+    if isinstance(valor, datetime.datetime):
+        return {'t': 'dt', 'v': valor.isoformat()}
+    if isinstance(valor, datetime.date):
+        return {'t': 'd', 'v': valor.isoformat()}
+    if isinstance(valor, datetime.time):
+        return {'t': 'h', 'v': valor.isoformat()}
+    return valor
+
+
+def _decodificar_valor(valor: Any) -> Any:
+    if not isinstance(valor, dict):
+        return valor
+    tipos = {
+        'dt': datetime.datetime.fromisoformat,
+        'd': datetime.date.fromisoformat,
+        'h': datetime.time.fromisoformat,
+    }
+    return tipos[valor['t']](valor['v'])
+
+
+def obter_ordenacao(queryset: QuerySet) -> List[Tuple[str, bool, bool]]:
+    """Retorna a ordenação como (campo, descendente, anulável), com a PK como desempate."""
+    model = queryset.model
+    termos = list(queryset.query.order_by) or list(model._meta.ordering)
+
+    ordering: List[Tuple[str, bool, bool]] = []
+    for termo in termos:
+        if not isinstance(termo, str) or termo == '?':
+            continue
+
+        descendente = termo.startswith('-')
+        nome = termo.lstrip('-+')
+        if nome == 'pk':
+            nome = model._meta.pk.name
+
+        campo = _resolve_field(model, nome)
+        if campo is None:
+            # Anotações (como a relevância da busca) também entram na posição do cursor
+            if nome in queryset.query.annotations:
+                ordering.append((nome, descendente, True))
+            continue
+
+        # Chaves estrangeiras são ordenadas pela própria coluna
+        if campo.is_relation and '__' not in nome:
+            nome = campo.attname
+
+        ordering.append((nome, descendente, campo.null))
+
+    pk = model._meta.pk
+    if not any(nome in (pk.name, pk.attname) for nome, _, _ in ordering):
+        descendente = ordering[-1][1] if ordering else False
+        ordering.append((pk.attname, descendente, False))
+
+    return ordering
+
+
+class KeysetPagination(PageNumberPagination):
+    """Paginação por número de página com modo keyset (cursor) opcional.
+
+    Sem o parâmetro `cursor` a paginação funciona exatamente como a
+    `PageNumberPagination`. Com `?cursor=` (vazio na primeira página) a
+    listagem passa a ser paginada pelos valores da ordenação atual mais a
+    chave primária como desempate, sem `OFFSET` e sem `COUNT(*)`, de modo
+    que qualquer página custa o mesmo que a primeira. O total só é calculado
+    quando solicitado com `?contar=true`.
+    """
+
+    cursor_query_param = 'cursor'
+    count_query_param = 'contar'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> Optional[List[Any]]:
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.display_page_controls = False
+        self.ordering = obter_ordenacao(queryset)
+
+        # Total opcional, calculado sobre o conjunto filtrado
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.count()
+
+        posicao, reverso = self._decode_cursor(request)
+
+        queryset = queryset.order_by(*self._order_by(reverso))
+        if posicao is not None:
+            queryset = queryset.filter(self._after(posicao, reverso))
+
+        resultados = list(queryset[:page_size + 1])
+        tem_mais = len(resultados) > page_size
+        resultados = resultados[:page_size]
+
+        if reverso:
+            resultados.reverse()
+            self.has_next = posicao is not None
+            self.has_previous = tem_mais
+        else:
+            self.has_next = tem_mais
+            self.has_previous = posicao is not None
+
+        self.primeiro = self._position(resultados[0]) if resultados else None
+        self.ultimo = self._position(resultados[-1]) if resultados else None
+
+        return resultados
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        resposta: Dict[str, Any] = {}
+        if self.count is not None:
+            resposta['count'] = self.count
+
+        resposta['next'] = self.get_next_link()
+        resposta['previous'] = self.get_previous_link()
+        resposta['results'] = data
+        return Response(resposta)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or self.ultimo is None:
+            return None
+        return self._link(self.ultimo, reverso=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or self.primeiro is None:
+            return None
+        return self._link(self.primeiro, reverso=True)
+
+    def get_html_context(self) -> Dict[str, Any]:
+        if not self.keyset:
+            return super().get_html_context()
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+    # Ordenação
+
+    def _order_by(self, reverso: bool) -> List[Any]:
+        # Nulos são tratados como maiores que qualquer valor, como no PostgreSQL
+        termos = []
+        for nome, descendente, _ in self.ordering:
+            if descendente != reverso:
+                termos.append(F(nome).desc(nulls_first=True))
+            else:
+                termos.append(F(nome).asc(nulls_last=True))
+        return termos
+
+    def _after(self, posicao: List[Any], reverso: bool) -> Q:
+        """Monta o filtro que seleciona as linhas posteriores à posição."""
+        condicao = Q(pk__in=[])
+        anteriores = Q()
+
+        for (nome, descendente, anulavel), valor in zip(self.ordering, posicao):
+            if descendente != reverso:
+                if valor is None:
+                    posterior = Q(**{f'{nome}__isnull': False})
+                else:
+                    posterior = Q(**{f'{nome}__lt': valor})
+            else:
+                if valor is None:
+                    posterior = Q(pk__in=[])
+                else:
+                    posterior = Q(**{f'{nome}__gt': valor})
+                    if anulavel:
+                        posterior |= Q(**{f'{nome}__isnull': True})
+
+            condicao |= anteriores & posterior
+
+            if valor is None:
+                anteriores &= Q(**{f'{nome}__isnull': True})
+            else:
+                anteriores &= Q(**{nome: valor})
+
+        return condicao
+
+    def _position(self, instancia: Any) -> List[Any]:
+        # Linhas de values_list(named=True) já trazem as colunas pelo nome
+        if hasattr(instancia, '_fields'):
+            return [getattr(instancia, nome) for nome, _, _ in self.ordering]
+
+        posicao = []
+        for nome, _, _ in self.ordering:
+            valor = instancia
+            for parte in nome.split('__'):
+                valor = getattr(valor, parte, None) if valor is not None else None
+            posicao.append(valor)
+        return posicao
+
+    # Cursor
+
+    def _signature(self) -> List[str]:
+        return [('-' if descendente else '') + nome for nome, descendente, _ in self.ordering]
+
+    def _link(self, posicao: List[Any], reverso: bool) -> str:
+        payload = {'o': self._signature(), 'p': [_codificar_valor(valor) for valor in posicao]}
+        if reverso:
+            payload['r'] = 1
+
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _decode_cursor(self, request: Request) -> Tuple[Optional[List[Any]], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            posicao = [_decodificar_valor(valor) for valor in payload['p']]
+            valido = payload['o'] == self._signature() and len(posicao) == len(self.ordering)
+        except (TypeError, ValueError, KeyError, AttributeError, UnicodeError):
+            valido = False
+
+        # Cursores emitidos para outra ordenação não podem ser reaproveitados
+        if not valido:
+            raise NotFound(self.invalid_cursor_message)
+
+        return posicao, bool(payload.get('r'))
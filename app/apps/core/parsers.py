@@ -0,0 +1,30 @@
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from typing import Any, Dict, Optional
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """Parser JSON baseado em orjson. NaN e Infinity são rejeitados, como no modo estrito do DRF."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: Optional[str] = None,
+        parser_context: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            conteudo = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                conteudo = conteudo.decode(encoding)
+            return orjson.loads(conteudo)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
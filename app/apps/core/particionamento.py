@@ -0,0 +1,228 @@
+from django.db.models import Model
+from typing import Any, Dict, List, Optional, Type
+
+
+# Sufixos das partições: a LIST por empresa tem uma partição DEFAULT, que por sua
+# vez é dividida por HASH; empresas grandes ganham partições LIST próprias.
+SUFIXO_PADRAO = '_p_padrao'
+SUFIXO_HASH = '_p_h%d'
+SUFIXO_EMPRESA = '_p_e%d'
+
+# Tabelas particionáveis. Funcionario fica de fora: é referenciado por chaves
+# estrangeiras e tem CPF único global, e no PostgreSQL toda chave única de uma
+# tabela particionada precisa incluir `empresa_id`.
+MODELOS_PARTICIONAVEIS = ('convocacao', 'absenteismo')
+
+
+class ParticionamentoIndisponivel(Exception):
+    """A operação exige uma tabela particionada por empresa (PostgreSQL)."""
+
+
+def esta_particionada(connection: Any, tabela: str) -> bool:
+    """Indica se a tabela já é particionada."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+            [tabela]
+        )
+        return cursor.fetchone()[0]
+
+
+def _colunas(schema_editor: Any, model: Type[Model]) -> str:
+    return ', '.join(schema_editor.quote_name(field.column) for field in model._meta.concrete_fields)
+
+
+def _recriar(schema_editor: Any, model: Type[Model], particoes: int) -> None:
+    """Recria a tabela do modelo, particionada por empresa ou comum, preservando dados e sequência.
+
+    A tabela atual é renomeada, a nova é criada com as mesmas colunas, os
+    dados são copiados e só então chave primária, chaves estrangeiras,
+    índices e constraints do modelo são recriados (com os mesmos nomes gerados pelo Django).
+    Com particionamento a chave primária passa a incluir `empresa_id`, como
+    exige o PostgreSQL; para o ORM a PK continua sendo apenas `id`.
+    """
+    q = schema_editor.quote_name
+    tabela = model._meta.db_table
+    antiga = f'{tabela}_antiga'
+    pk = model._meta.pk.column
+    empresa = model._meta.get_field('empresa').column
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {q(tabela)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            'SELECT attidentity <> %s FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = %s',
+            ['', tabela, pk]
+        )
+        identidade = cursor.fetchone()[0]
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [tabela, pk])
+        sequencia = cursor.fetchone()[0]
+
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} RENAME TO {q(antiga)}')
+
+    particionamento = f' PARTITION BY LIST ({q(empresa)})' if particoes else ''
+    schema_editor.execute(
+        f'CREATE TABLE {q(tabela)} (LIKE {q(antiga)} INCLUDING DEFAULTS INCLUDING IDENTITY '
+        f'INCLUDING CONSTRAINTS){particionamento}'
+    )
+
+    if particoes:
+        padrao = tabela + SUFIXO_PADRAO
+        schema_editor.execute(
+            f'CREATE TABLE {q(padrao)} PARTITION OF {q(tabela)} DEFAULT PARTITION BY HASH ({q(empresa)})'
+        )
+        for resto in range(particoes):
+            schema_editor.execute(
+                f'CREATE TABLE {q(tabela + SUFIXO_HASH % resto)} PARTITION OF {q(padrao)} '
+                f'FOR VALUES WITH (MODULUS {particoes}, REMAINDER {resto})'
+            )
+
+    colunas = _colunas(schema_editor, model)
+    schema_editor.execute(f'INSERT INTO {q(tabela)} ({colunas}) SELECT {colunas} FROM {q(antiga)}')
+
+    if identidade:
+        # A coluna identity ganhou uma sequência nova: recebe o nome e a posição da antiga
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [tabela, pk])
+            nova = cursor.fetchone()[0]
+        schema_editor.execute(f'DROP TABLE {q(antiga)}')
+        nome_sequencia = sequencia.split('.')[-1].strip('"')
+        schema_editor.execute(f'ALTER SEQUENCE {nova} RENAME TO {q(nome_sequencia)}')
+        schema_editor.execute(
+            f'SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({q(pk)}), 0) + 1, false) FROM {q(tabela)}',
+            [tabela, pk]
+        )
+    else:
+        # `serial`: a nova coluna usa a mesma sequência, que precisa mudar de dono antes do DROP
+        if sequencia:
+            schema_editor.execute(f'ALTER SEQUENCE {sequencia} OWNED BY {q(tabela)}.{q(pk)}')
+        schema_editor.execute(f'DROP TABLE {q(antiga)}')
+
+    chave = f'{q(pk)}, {q(empresa)}' if particoes else q(pk)
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} ADD CONSTRAINT {q(tabela + "_pkey")} PRIMARY KEY ({chave})')
+
+    for field in model._meta.local_concrete_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+        if field.db_index and not field.unique:
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+    # Chaves únicas dos modelos particionáveis incluem `empresa_id`
+    for constraint in model._meta.constraints:
+        schema_editor.add_constraint(model, constraint)
+
+
+def particionar(schema_editor: Any, model: Type[Model], particoes: int) -> None:
+    """Converte a tabela do modelo em LIST por empresa com DEFAULT dividido em `particoes` por HASH."""
+    if particoes < 1:
+        raise ValueError('O número de partições hash deve ser positivo.')
+    if esta_particionada(schema_editor.connection, model._meta.db_table):
+        return
+    _recriar(schema_editor, model, particoes)
+
+
+def desparticionar(schema_editor: Any, model: Type[Model]) -> None:
+    """Volta a tabela do modelo a uma tabela comum, com todos os dados."""
+    if not esta_particionada(schema_editor.connection, model._meta.db_table):
+        return
+    _recriar(schema_editor, model, 0)
+
+
+def isolar_empresa(schema_editor: Any, model: Type[Model], empresa_id: int) -> str:
+    """Move as linhas da empresa para uma partição LIST própria e retorna o nome dela.
+
+    Escritas na tabela ficam bloqueadas durante toda a operação; leituras
+    continuam durante a cópia e a remoção das linhas. O ATTACH, com a partição
+    DEFAULT existente, trava em ACCESS EXCLUSIVE a DEFAULT e todas as partições
+    hash e as varre inteiras, para confirmar que nenhuma linha da empresa ficou
+    nelas: dali até o fim da transação também as leituras da tabela esperam.
+    O CHECK temporário só evita que o ATTACH varra também a partição nova.
+    """
+    q = schema_editor.quote_name
+    tabela = model._meta.db_table
+    empresa_id = int(empresa_id)
+    particao = tabela + SUFIXO_EMPRESA % empresa_id
+    coluna = model._meta.get_field('empresa').column
+
+    if not esta_particionada(schema_editor.connection, tabela):
+        raise ParticionamentoIndisponivel(f'{tabela} não está particionada.')
+
+    colunas = _colunas(schema_editor, model)
+    restricao = q(f'{particao}_empresa_chk')
+
+    schema_editor.execute(f'LOCK TABLE {q(tabela)} IN SHARE ROW EXCLUSIVE MODE')
+    schema_editor.execute(f'CREATE TABLE {q(particao)} (LIKE {q(tabela)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    schema_editor.execute(
+        f'INSERT INTO {q(particao)} ({colunas}) SELECT {colunas} FROM {q(tabela + SUFIXO_PADRAO)} '
+        f'WHERE {q(coluna)} = {empresa_id}'
+    )
+    schema_editor.execute(f'DELETE FROM {q(tabela + SUFIXO_PADRAO)} WHERE {q(coluna)} = {empresa_id}')
+    schema_editor.execute(
+        f'ALTER TABLE {q(particao)} ADD CONSTRAINT {restricao} '
+        f'CHECK ({q(coluna)} IS NOT NULL AND {q(coluna)} = {empresa_id})'
+    )
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} ATTACH PARTITION {q(particao)} FOR VALUES IN ({empresa_id})')
+    schema_editor.execute(f'ALTER TABLE {q(particao)} DROP CONSTRAINT {restricao}')
+    schema_editor.execute(f'ANALYZE {q(particao)}')
+
+    return particao
+
+
+def devolver_empresa(schema_editor: Any, model: Type[Model], empresa_id: int) -> None:
+    """Desfaz `isolar_empresa`: as linhas voltam para as partições hash."""
+    q = schema_editor.quote_name
+    tabela = model._meta.db_table
+    particao = tabela + SUFIXO_EMPRESA % int(empresa_id)
+    colunas = _colunas(schema_editor, model)
+
+    schema_editor.execute(f'LOCK TABLE {q(tabela)} IN SHARE ROW EXCLUSIVE MODE')
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} DETACH PARTITION {q(particao)}')
+    schema_editor.execute(f'INSERT INTO {q(tabela)} ({colunas}) SELECT {colunas} FROM {q(particao)}')
+    schema_editor.execute(f'DROP TABLE {q(particao)}')
+
+
+def situacao(connection: Any, model: Type[Model]) -> List[Dict[str, Any]]:
+    """Partições da tabela com limites, linhas estimadas e tamanho em disco."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, arvore.level, arvore.isleaf,
+                   COALESCE(pg_get_expr(c.relpartbound, c.oid), ''),
+                   GREATEST(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid)
+            FROM pg_partition_tree(to_regclass(%s)) AS arvore
+            JOIN pg_class c ON c.oid = arvore.relid
+            ORDER BY arvore.level, c.relname
+            """,
+            [model._meta.db_table]
+        )
+        return [
+            {'particao': nome, 'nivel': nivel, 'folha': folha, 'limites': limites,
+             'linhas_estimadas': linhas, 'bytes': tamanho}
+            for nome, nivel, folha, limites, linhas, tamanho in cursor.fetchall()
+        ]
+
+
+def maiores_empresas(connection: Any, model: Type[Model], limite: int = 10) -> List[Dict[str, Any]]:
+    """Empresas com mais linhas ainda nas partições hash (candidatas a partição própria)."""
+    tabela = model._meta.db_table + SUFIXO_PADRAO
+    coluna = model._meta.get_field('empresa').column
+    q = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {q(coluna)}, COUNT(*) FROM {q(tabela)} GROUP BY 1 ORDER BY 2 DESC LIMIT %s',
+            [limite]
+        )
+        return [{'empresa': empresa, 'linhas': linhas} for empresa, linhas in cursor.fetchall()]
+
+
+def modelo_particionavel(nome: str, apps: Optional[Any] = None) -> Type[Model]:
+    """Resolve o nome (`convocacao`, `absenteismo`) para o modelo."""
+    if nome not in MODELOS_PARTICIONAVEIS:
+        raise ParticionamentoIndisponivel(f'{nome} não é particionável por empresa.')
+
+    if apps is None:
+        from django.apps import apps
+    return apps.get_model('core', nome)
@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from typing import Any, Dict, List, Optional, Tuple
+
+# Perfis em andamento neste worker; além do limite a requisição segue sem perfil
+_vagas: Optional[threading.BoundedSemaphore] = None
+_vagas_lock = threading.Lock()
+
+# Profundidade máxima das pilhas amostradas (o excesso, junto à raiz, é descartado)
+PROFUNDIDADE_MAXIMA = 128
+
+# Rótulos por objeto de código, para não formatar o mesmo frame a cada amostra
+_rotulos: Dict[Any, str] = {}
+
+# Prefixos removidos dos caminhos dos arquivos, do mais específico ao mais geral
+_PREFIXOS = sorted(
+    {str(settings.BASE_DIR.parent) + os.sep}
+    | {caminho + os.sep for caminho in sys.path if caminho and os.path.isdir(caminho)},
+    key=len, reverse=True
+)
+
+
+def _vagas_do_worker() -> threading.BoundedSemaphore:
+    global _vagas
+    if _vagas is None:
+        with _vagas_lock:
+            if _vagas is None:
+                _vagas = threading.BoundedSemaphore(settings.PERFIL_CONCORRENTES)
+    return _vagas
+
+
+def reservar_vaga() -> bool:
+    """Reserva uma das PERFIL_CONCORRENTES vagas de perfil do worker, sem esperar."""
+    return _vagas_do_worker().acquire(blocking=False)
+
+
+def liberar_vaga() -> None:
+    _vagas_do_worker().release()
+
+
+def _rotulo(codigo: Any) -> str:
+    rotulo = _rotulos.get(codigo)
+    if rotulo is None:
+        arquivo = codigo.co_filename
+        for prefixo in _PREFIXOS:
+            if arquivo.startswith(prefixo):
+                arquivo = arquivo[len(prefixo):]
+                break
+        # `;` separa os frames no formato de pilhas colapsadas
+        rotulo = f'{codigo.co_name} ({arquivo}:{codigo.co_firstlineno})'.replace(';', ',')
+        _rotulos[codigo] = rotulo
+    return rotulo
+
+
+class Amostrador(threading.Thread):
+    """Amostra periodicamente a pilha da thread da requisição.
+
+    A sobrecarga é limitada de duas formas: o intervalo entre amostras cresce
+    para manter o tempo gasto amostrando abaixo de PERFIL_SOBRECARGA_MAXIMA
+    do tempo total, e a amostragem para depois de PERFIL_DURACAO_MAXIMA_S.
+    """
+
+    def __init__(self, thread_id: int) -> None:
+        super().__init__(name='perfil-amostrador', daemon=True)
+        self.thread_id = thread_id
+        self.intervalo = settings.PERFIL_INTERVALO_MS / 1e3
+        self.sobrecarga_maxima = settings.PERFIL_SOBRECARGA_MAXIMA
+        self.duracao_maxima = settings.PERFIL_DURACAO_MAXIMA_S
+        self.pilhas: Counter = Counter()
+        self.amostras = 0
+        self.custo = 0.0
+        self.truncado = False
+        self.inicio = 0.0
+        self.fim = 0.0
+        self._parar = threading.Event()
+
+    def run(self) -> None:
+        self.inicio = time.perf_counter()
+        limite = self.inicio + self.duracao_maxima
+        espera = self.intervalo
+
+        while not self._parar.wait(espera):
+            antes = time.perf_counter()
+            if antes >= limite:
+                self.truncado = True
+                break
+
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            pilha = []
+            while frame is not None and len(pilha) < PROFUNDIDADE_MAXIMA:
+                pilha.append(_rotulo(frame.f_code))
+                frame = frame.f_back
+            del frame
+            self.pilhas[';'.join(reversed(pilha))] += 1
+            self.amostras += 1
+
+            custo = time.perf_counter() - antes
+            self.custo += custo
+            # Ciclo de trabalho: custo / (custo + espera) <= sobrecarga máxima
+            espera = max(self.intervalo, custo * (1 / self.sobrecarga_maxima - 1))
+
+        self.fim = time.perf_counter()
+
+    def parar(self) -> None:
+        self._parar.set()
+        self.join()
+
+    def colapsado(self) -> str:
+        """Pilhas no formato colapsado (`raiz;...;folha contagem`), aceito por flamegraph.pl e speedscope."""
+        return '\n'.join(f'{pilha} {contagem}' for pilha, contagem in self.pilhas.most_common())
+
+    def mais_frequentes(self, limite: int = 20) -> List[Dict[str, Any]]:
+        """Funções em que a requisição mais esteve (tempo próprio, pela folha da pilha)."""
+        folhas: Counter = Counter()
+        for pilha, contagem in self.pilhas.items():
+            folhas[pilha.rsplit(';', 1)[-1]] += contagem
+        return [
+            {'funcao': funcao, 'amostras': contagem, 'fracao': round(contagem / self.amostras, 3)}
+            for funcao, contagem in folhas.most_common(limite)
+        ]
+
+    def resumo(self) -> Dict[str, Any]:
+        duracao = max(self.fim - self.inicio, 1e-9)
+        return {
+            'formato': 'colapsado',
+            'intervalo_ms': settings.PERFIL_INTERVALO_MS,
+            'amostras': self.amostras,
+            'duracao_ms': round(duracao * 1e3, 2),
+            'sobrecarga_ms': round(self.custo * 1e3, 2),
+            'sobrecarga_fracao': round(self.custo / duracao, 4),
+            'truncado': self.truncado,
+            'mais_frequentes': self.mais_frequentes(),
+            'pilhas': self.colapsado(),
+        }
+
+
+def iniciar_amostragem() -> Amostrador:
+    amostrador = Amostrador(threading.get_ident())
+    amostrador.start()
+    return amostrador
+
+
+def conteudo_da_resposta(response: Any) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """Metadados da resposta original e, se não for streaming, o corpo."""
+    dados = {
+        'status_code': response.status_code,
+        'content_type': response.get('Content-Type'),
+    }
+    if getattr(response, 'streaming', False):
+        return dados, None
+    dados['tamanho'] = len(response.content)
+    return dados, response.content
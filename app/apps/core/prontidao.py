@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from django.utils import timezone
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+DEGRADADO = 'degradado'
+FALHA = 'falha'
+
+_GRAVIDADE = {OK: 0, DEGRADADO: 1, FALHA: 2}
+
+# Último resultado: (momento, resultado). Só uma thread verifica por vez; as
+# demais recebem o resultado anterior enquanto isso.
+_ultimo: Optional[Tuple[float, Dict[str, Any]]] = None
+_verificando = threading.Lock()
+
+
+def _classificar(valor: float, limites: Tuple[float, float]) -> str:
+    """Situação do valor diante de (degradado a partir de, falha a partir de)."""
+    degradado, falha = limites
+    if valor >= falha:
+        return FALHA
+    if valor >= degradado:
+        return DEGRADADO
+    return OK
+
+
+def _pior(*situacoes: str) -> str:
+    return max(situacoes, key=_GRAVIDADE.__getitem__)
+
+
+def verificar_banco(alias: str) -> Dict[str, Any]:
+    """Latência de ida e volta (`SELECT 1`) até o banco do alias."""
+    limites = settings.PRONTIDAO_LIMITES['banco_ms']
+    inicio = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as exc:
+        # O endpoint é público: o detalhe (hosts, usuários) fica só no log
+        logger.warning('Prontidão: banco %s indisponível: %s', alias, exc)
+        return {'status': FALHA, 'erro': type(exc).__name__}
+
+    latencia = (time.perf_counter() - inicio) * 1e3
+    return {'status': _classificar(latencia, limites), 'latencia_ms': round(latencia, 2), 'limites_ms': limites}
+
+
+def verificar_cache(alias: str = 'default') -> Dict[str, Any]:
+    """Latência de escrita e leitura de uma chave no cache."""
+    cache = caches[alias]
+    backend = type(cache).__name__
+    if backend == 'DummyCache':
+        return {'status': OK, 'backend': backend, 'ativo': False}
+
+    limites = settings.PRONTIDAO_LIMITES['cache_ms']
+    chave = f'prontidao:{threading.get_ident()}'
+    inicio = time.perf_counter()
+    try:
+        cache.set(chave, 1, 10)
+        lido = cache.get(chave)
+    except Exception as exc:
+        logger.warning('Prontidão: cache indisponível: %s', exc)
+        return {'status': FALHA, 'backend': backend, 'erro': type(exc).__name__}
+
+    latencia = (time.perf_counter() - inicio) * 1e3
+    if lido != 1:
+        return {'status': FALHA, 'backend': backend, 'erro': 'valor gravado não foi lido de volta'}
+    return {'status': _classificar(latencia, limites), 'backend': backend,
+            'latencia_ms': round(latencia, 2), 'limites_ms': limites}
+
+
+def verificar_pool() -> Dict[str, Any]:
+    """Ocupação das conexões do worker e do pool de consultas paralelas."""
+    from .assincrono import situacao_pool
+    from .conexoes import estatisticas
+
+    pool = situacao_pool()
+    limites = settings.PRONTIDAO_LIMITES['fila_consultas']
+    limite_conexoes = settings.DB_MAX_CONEXOES_POR_WORKER + settings.DB_CONSULTAS_PARALELAS
+    abertas = {alias: dados['abertas_agora'] for alias, dados in estatisticas()['aliases'].items()}
+
+    return {
+        'status': _classificar(pool['na_fila'], limites),
+        'conexoes_abertas': abertas,
+        'limite_conexoes': limite_conexoes,
+        'saturacao': round(pool['em_execucao'] / pool['tamanho'], 2) if pool['tamanho'] else None,
+        **pool,
+        'limites_fila': limites,
+    }
+
+
+def verificar_fila_logs() -> Dict[str, Any]:
+    """Logs de acesso aguardando gravação (ASGI)."""
+    from app.apps.autenticacao.middleware import logs_pendentes
+
+    pendentes = logs_pendentes()
+    limites = settings.PRONTIDAO_LIMITES['fila_logs']
+    return {'status': _classificar(pendentes, limites), 'pendentes': pendentes, 'limites': limites}
+
+
+def _verificar() -> Dict[str, Any]:
+    inicio = time.perf_counter()
+    verificacoes: Dict[str, Dict[str, Any]] = {}
+
+    for alias in settings.DATABASES:
+        verificacoes[f'banco.{alias}'] = verificar_banco(alias)
+    verificacoes['cache'] = verificar_cache()
+    verificacoes['pool_consultas'] = verificar_pool()
+    verificacoes['fila_logs'] = verificar_fila_logs()
+
+    situacoes = []
+    for nome, verificacao in verificacoes.items():
+        situacao = verificacao['status']
+        # Sem o primário não há como atender; réplica e cache têm alternativa
+        if situacao == FALHA and nome != 'banco.default' and nome.startswith(('banco.', 'cache')):
+            situacao = DEGRADADO
+        situacoes.append(situacao)
+
+    return {
+        'status': _pior(*situacoes),
+        'verificado_em': timezone.now().isoformat(),
+        'duracao_ms': round((time.perf_counter() - inicio) * 1e3, 2),
+        'verificacoes': verificacoes,
+    }
+
+
+def prontidao(forcar: bool = False) -> Dict[str, Any]:
+    """Resultado da verificação de prontidão, refeita no máximo a cada PRONTIDAO_INTERVALO_SEGUNDOS.
+
+    Pode ser consultada a cada segundo: entre uma verificação e outra o
+    resultado vem da memória, com `idade_s` indicando há quanto tempo foi
+    medido.
+    """
+    global _ultimo
+
+    agora = time.monotonic()
+    ultimo = _ultimo
+    expirado = ultimo is None or agora - ultimo[0] >= settings.PRONTIDAO_INTERVALO_SEGUNDOS
+
+    # Sem resultado anterior, quem chega durante a verificação espera por ela
+    if (forcar or expirado) and _verificando.acquire(blocking=ultimo is None):
+        try:
+            atual = _ultimo
+            if forcar or atual is None or time.monotonic() - atual[0] >= settings.PRONTIDAO_INTERVALO_SEGUNDOS:
+                _ultimo = (time.monotonic(), _verificar())
+            ultimo = _ultimo
+        finally:
+            _verificando.release()
+
+    medido_em, resultado = ultimo
+    return {**resultado, 'idade_s': round(time.monotonic() - medido_em, 2)}
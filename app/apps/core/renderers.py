@@ -0,0 +1,71 @@
+import orjson
+import time
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from .instrumentacao import medicao_atual
+from typing import Any, Dict, Optional
+
+
+# Encoder do DRF usado para os tipos que o orjson não serializa nativamente
+_encoder = JSONEncoder()
+
+# Datas e dataclasses passam pelo encoder do DRF para manter o mesmo formato
+OPCOES_ORJSON = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+def _default(obj: Any) -> Any:
+    """Converte tipos não nativos (Decimal, strings lazy, QuerySet, ...) como o DRF."""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Renderer JSON baseado em orjson, com a mesma saída do `JSONRenderer` do DRF.
+
+    Respostas indentadas (API navegável, `indent=` no Accept) e objetos que o
+    orjson não aceita, como inteiros acima de 64 bits, usam o renderer padrão.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        medicao = medicao_atual()
+        if medicao is None:
+            return self._render(data, accepted_media_type, renderer_context)
+
+        # Tempo de serialização da requisição (Server-Timing)
+        inicio = time.perf_counter()
+        try:
+            return self._render(data, accepted_media_type, renderer_context)
+        finally:
+            medicao.registrar_serializacao(time.perf_counter() - inicio)
+
+    def _render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPCOES_ORJSON)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Mesmo escape de \u2028 e \u2029 aplicado pelo DRF
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
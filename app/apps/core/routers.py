@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+PRIMARIO = 'default'
+
+# Leituras da requisição atual podem ir para a réplica (ativado pelo ReplicaReadMixin)
+_leitura_na_replica: ContextVar[bool] = ContextVar('leitura_na_replica', default=False)
+
+# Usuários fixados no primário após uma escrita: {usuario_id: expiração}. O cache
+# compartilha a fixação entre workers; o dicionário cobre o próprio processo
+# mesmo com o DummyCache. As entradas vencidas saem a cada escrita.
+_fixados: Dict[Any, float] = {}
+_fixados_lock = threading.Lock()
+
+# Última verificação de atraso da réplica: (momento, disponível)
+_estado_replica: Tuple[float, bool] = (0.0, False)
+
+ATRASO_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def replica_configurada() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+def ativar_replica() -> Token:
+    """Direciona as leituras do contexto atual para a réplica; retorna o token para desfazer."""
+    return _leitura_na_replica.set(True)
+
+
+def desativar_replica(token: Token) -> None:
+    _leitura_na_replica.reset(token)
+
+
+@contextmanager
+def usar_replica() -> Iterator[None]:
+    """Bloco cujas leituras podem ir para a réplica (serviços, comandos)."""
+    token = ativar_replica()
+    try:
+        yield
+    finally:
+        desativar_replica(token)
+
+
+def _chave_fixacao(usuario_id: Any) -> str:
+    return f'replica:primario:{usuario_id}'
+
+
+def fixar_no_primario(usuario_id: Any) -> None:
+    """Mantém as leituras do usuário no primário logo após uma escrita (read-your-writes)."""
+    janela = settings.REPLICA_FIXACAO_SEGUNDOS
+    agora = time.monotonic()
+    with _fixados_lock:
+        for vencido in [usuario for usuario, expiracao in _fixados.items() if expiracao <= agora]:
+            del _fixados[vencido]
+        _fixados[usuario_id] = agora + janela
+    cache.set(_chave_fixacao(usuario_id), True, janela)
+
+
+def fixado_no_primario(usuario_id: Any) -> bool:
+    expiracao = _fixados.get(usuario_id)
+    if expiracao is not None:
+        if expiracao > time.monotonic():
+            return True
+        _fixados.pop(usuario_id, None)
+    return bool(cache.get(_chave_fixacao(usuario_id)))
+
+
+def atraso_replica() -> Optional[float]:
+    """Atraso da réplica em segundos; `None` se ela não responder."""
+    conexao = connections[REPLICA]
+    if conexao.vendor != 'postgresql':
+        return 0.0
+
+    try:
+        with conexao.cursor() as cursor:
+            cursor.execute(ATRASO_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning('Réplica de leitura indisponível', exc_info=True)
+        return None
+
+
+def replica_disponivel() -> bool:
+    """Réplica acessível e dentro do atraso máximo, verificado no máximo a cada poucos segundos."""
+    global _estado_replica
+
+    verificado_em, disponivel = _estado_replica
+    agora = time.monotonic()
+    if agora - verificado_em < settings.REPLICA_VERIFICACAO_SEGUNDOS:
+        return disponivel
+
+    atraso = atraso_replica()
+    disponivel = atraso is not None and atraso <= settings.REPLICA_ATRASO_MAXIMO
+    if atraso is not None and not disponivel:
+        logger.warning('Réplica com %.1fs de atraso; leituras voltam ao primário', atraso)
+
+    _estado_replica = (agora, disponivel)
+    return disponivel
+
+
+class ReplicaRouter:
+    """Roteador que envia para a réplica as leituras marcadas com `usar_replica`.
+
+    Escritas, migrações e qualquer leitura fora de um bloco marcado ficam no
+    primário. Sem o alias `replica` em DATABASES, ou com a réplica atrasada
+    além de REPLICA_ATRASO_MAXIMO, tudo segue para o primário.
+    """
+
+    def db_for_read(self, model: Any, **hints: Any) -> Optional[str]:
+        if _leitura_na_replica.get() and replica_configurada() and replica_disponivel():
+            return REPLICA
+        return PRIMARIO
+
+    def db_for_write(self, model: Any, **hints: Any) -> Optional[str]:
+        return PRIMARIO
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> Optional[bool]:
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> Optional[bool]:
+        return db == PRIMARIO
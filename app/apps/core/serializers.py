@@ -17,7 +17,7 @@ class FuncionarioSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Funcionario
-        fields = '__all__'
+        exclude = ['busca']
 
 
 class TipoConvocacaoSerializer(serializers.ModelSerializer):
@@ -36,6 +36,83 @@ class ConvocacaoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class ConvocacaoLoteSerializer(serializers.Serializer):
+    """Serializer para criação de convocações em lote."""
+    
+    # Convocação
+    tipo = serializers.PrimaryKeyRelatedField(queryset=TipoConvocacao.objects.all())
+    data_convocacao = serializers.DateField()
+    data_limite_resposta = serializers.DateField()
+    observacoes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    
+    # Seleção dos funcionários
+    codigo_unidade = serializers.CharField(required=False, max_length=20)
+    codigo_setor = serializers.CharField(required=False, max_length=12)
+    codigo_cargo = serializers.CharField(required=False, max_length=10)
+    situacao = serializers.ChoiceField(
+        required=False,
+        choices=Funcionario._meta.get_field('situacao').choices
+    )
+    funcionarios = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False
+    )
+    
+    def validate(self, attrs):
+        """Valida o período da convocação."""
+        if attrs['data_limite_resposta'] < attrs['data_convocacao']:
+            raise serializers.ValidationError(
+                {"data_limite_resposta": "A data limite deve ser posterior à data da convocação."}
+            )
+            
+        return attrs
+
+
+class ConvocacaoRespostaSerializer(serializers.Serializer):
+    """Serializer para um item de resposta de convocação."""
+    
+    id = serializers.IntegerField()
+    resposta = serializers.ChoiceField(
+        choices=Convocacao._meta.get_field('resposta').choices
+    )
+    data_resposta = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class ConvocacaoRespostaLoteSerializer(serializers.Serializer):
+    """Serializer para registro de respostas de convocações em lote.
+    
+    Um item inválido não invalida o lote: cada item de `respostas` volta
+    validado ou, no lugar dele, com `id` e `errors`, na ordem da entrada.
+    """
+    
+    respostas = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=5000
+    )
+    
+    def validate_respostas(self, itens):
+        """Valida cada item individualmente e marca as convocações repetidas."""
+        respostas = []
+        vistos = set()
+        
+        for item in itens:
+            serializer = ConvocacaoRespostaSerializer(data=item)
+            if not serializer.is_valid():
+                respostas.append({'id': item.get('id'), 'errors': serializer.errors})
+            elif serializer.validated_data['id'] in vistos:
+                respostas.append({
+                    'id': serializer.validated_data['id'],
+                    'errors': {'id': ['Convocação repetida no lote.']}
+                })
+            else:
+                vistos.add(serializer.validated_data['id'])
+                respostas.append(dict(serializer.validated_data))
+        
+        return respostas
+
+
 class TipoAbsenteismoSerializer(serializers.ModelSerializer):
     class Meta:
         model = TipoAbsenteismo
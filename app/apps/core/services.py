@@ -1,191 +1,504 @@
-from django.db.models import Count, Q, Sum, Avg, F, Value
-from django.db.models.functions import Coalesce
+import threading
+from bisect import bisect_left
+from datetime import date, timedelta
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+from django.db.models import Count, Exists, OuterRef, Q, Sum, F
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Coalesce, Collate
+from .assincrono import executar_em_paralelo
+from .conexoes import consulta_cancelada, registrar_cancelamento
+from .memoria import CacheTemporario
 from .models import Funcionario, Absenteismo, Convocacao
-from typing import Dict, Any, List
+from .filters import normalizar_busca
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 
 class FuncionarioService:
     """Serviço para métricas e operações relacionadas a funcionários."""
     
     @staticmethod
-    def obter_metricas(empresa_id: int) -> Dict[str, Any]:
-        """Retorna métricas gerais de funcionários da empresa."""
+    def consultas_metricas(empresa_id: int) -> Dict[str, Callable[[], Any]]:
+        """Consultas independentes que compõem as métricas, para execução sequencial ou paralela."""
+        queryset = Funcionario.objects.da_empresa(empresa_id)
         
-        # Contagem total de funcionários
-        total = Funcionario.objects.filter(empresa__codigo=empresa_id).count()
-        
-        # Distribuição por situação
-        situacao = Funcionario.objects.filter(
-            empresa__codigo=empresa_id
-        ).values('situacao').annotate(
-            total=Count('id')
-        ).order_by('situacao')
-        
-        # Distribuição por unidade
-        unidades = Funcionario.objects.filter(
-            empresa__codigo=empresa_id
-        ).values('codigo_unidade', 'nome_unidade').annotate(
-            total=Count('id')
-        ).order_by('-total')[:10]
-        
-        # Distribuição por setor
-        setores = Funcionario.objects.filter(
-            empresa__codigo=empresa_id
-        ).values('codigo_setor', 'nome_setor').annotate(
-            total=Count('id')
-        ).order_by('-total')[:10]
-        
-        # Distribuição por cargo
-        cargos = Funcionario.objects.filter(
-            empresa__codigo=empresa_id
-        ).values('codigo_cargo', 'nome_cargo').annotate(
-            total=Count('id')
-        ).order_by('-total')[:10]
+        def distribuicao(*campos: str, limite: Optional[int] = None) -> Callable[[], List[Dict[str, Any]]]:
+            consulta = queryset.values(*campos).annotate(total=Count('pk'))
+            consulta = consulta.order_by('-total')[:limite] if limite else consulta.order_by(*campos)
+            return lambda: list(consulta)
         
         return {
-            'total_funcionarios': total,
-            'distribuicao_situacao': list(situacao),
-            'distribuicao_unidades': list(unidades),
-            'distribuicao_setores': list(setores),
-            'distribuicao_cargos': list(cargos)
+            # Contagem total de funcionários
+            'total_funcionarios': queryset.count,
+            # Distribuição por situação
+            'distribuicao_situacao': distribuicao('situacao'),
+            # Distribuição por unidade, setor e cargo
+            'distribuicao_unidades': distribuicao('codigo_unidade', 'nome_unidade', limite=10),
+            'distribuicao_setores': distribuicao('codigo_setor', 'nome_setor', limite=10),
+            'distribuicao_cargos': distribuicao('codigo_cargo', 'nome_cargo', limite=10),
         }
+    
+    @staticmethod
+    def obter_metricas(empresa_id: int) -> Dict[str, Any]:
+        """Retorna métricas gerais de funcionários da empresa."""
+        consultas = FuncionarioService.consultas_metricas(empresa_id)
+        return {nome: consulta() for nome, consulta in consultas.items()}
+    
+    @staticmethod
+    async def aobter_metricas(empresa_id: int, tempo_limite_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Versão assíncrona de `obter_metricas`, com as consultas em paralelo."""
+        consultas = FuncionarioService.consultas_metricas(empresa_id)
+        return await executar_em_paralelo(consultas, Funcionario, tempo_limite_ms)
 
 class AbsenteismoService:
     """Serviço para métricas e operações relacionadas a absenteísmo."""
     
     @staticmethod
-    def obter_metricas(empresa_id: int, periodo_inicio=None, periodo_fim=None) -> Dict[str, Any]:
-        """Retorna métricas gerais de absenteísmo da empresa."""
+    def consultas_metricas(empresa_id: int, periodo_inicio=None, periodo_fim=None) -> Dict[str, Callable[[], Any]]:
+        """Consultas independentes que compõem as métricas, para execução sequencial ou paralela."""
         
         # Filtragem por período
-        queryset = Absenteismo.objects.filter(empresa__codigo=empresa_id)
+        queryset = Absenteismo.objects.da_empresa(empresa_id)
         
         if periodo_inicio:
             queryset = queryset.filter(data_inicio__gte=periodo_inicio)
         if periodo_fim:
             queryset = queryset.filter(data_fim__lte=periodo_fim)
         
-        # Total de registros
-        total_registros = queryset.count()
-        
-        # Total de dias
-        total_dias = queryset.aggregate(
-            total=Sum(F('data_fim') - F('data_inicio') + Value(1))
-        )['total'] or 0
-        
-        # Média de dias
-        media_dias = queryset.aggregate(
-            media=Avg(F('data_fim') - F('data_inicio') + Value(1))
-        )['media'] or 0
-        
-        # Número de funcionários afastados
-        funcionarios_afastados = queryset.values('funcionario').distinct().count()
+        return {
+            # Registros, duração somada e funcionários afastados numa só passada
+            'totais': lambda: queryset.aggregate(
+                registros=Count('pk'),
+                duracao=Sum(F('data_fim') - F('data_inicio')),
+                afastados=Count('funcionario', distinct=True)
+            ),
+            # Total de funcionários ativos para cálculo do índice
+            'funcionarios_ativos': Funcionario.objects.da_empresa(empresa_id).filter(situacao='ATIVO').count,
+            # Distribuição por tipo
+            'distribuicao_por_tipo': lambda: list(
+                queryset.values('tipo__nome').annotate(total=Count('pk')).order_by('-total')
+            ),
+            # Absenteísmo por setor
+            'absenteismo_por_setor': lambda: list(
+                queryset.values('funcionario__codigo_setor', 'funcionario__nome_setor')
+                .annotate(total=Count('pk')).order_by('-total')[:5]
+            ),
+            # Funcionários com maior frequência de absenteísmo
+            'top_funcionarios': lambda: list(
+                queryset.values('funcionario__nome', 'funcionario__codigo')
+                .annotate(total=Count('pk')).order_by('-total')[:5]
+            ),
+        }
+    
+    @staticmethod
+    def montar_metricas(resultados: Dict[str, Any]) -> Dict[str, Any]:
+        """Calcula os indicadores a partir dos resultados de `consultas_metricas`."""
+        totais = resultados['totais']
+        total_registros = totais['registros']
         
-        # Total de funcionários ativos para cálculo do índice
-        total_funcionarios = Funcionario.objects.filter(
-            empresa__codigo=empresa_id, 
-            situacao='ATIVO'
-        ).count()
+        # Cada atestado conta o dia inicial e o final
+        duracao = totais['duracao']
+        total_dias = (duracao.days if duracao else 0) + total_registros
+        media_dias = total_dias / total_registros if total_registros else 0
         
         # Índice de absenteísmo (dias de afastamento / (dias do período * total de funcionários))
+        total_funcionarios = resultados['funcionarios_ativos']
         if total_funcionarios > 0:
             periodo_dias = 30  # Valor padrão
             indice_absenteismo = (total_dias / (periodo_dias * total_funcionarios)) * 100
         else:
             indice_absenteismo = 0
         
-        # Distribuição por tipo
-        tipos = queryset.values('tipo__nome').annotate(
-            total=Count('id')
-        ).order_by('-total')
-        
-        # Absenteísmo por setor
-        setores = queryset.values(
-            'funcionario__codigo_setor', 
-            'funcionario__nome_setor'
-        ).annotate(
-            total=Count('id')
-        ).order_by('-total')[:5]
-        
-        # Funcionários com maior frequência de absenteísmo
-        top_funcionarios = queryset.values(
-            'funcionario__nome', 
-            'funcionario__codigo'
-        ).annotate(
-            total=Count('id')
-        ).order_by('-total')[:5]
-        
         return {
             'total_registros': total_registros,
             'total_dias_afastamento': total_dias,
             'media_dias_por_atestado': round(media_dias, 2) if media_dias else 0,
-            'funcionarios_afastados': funcionarios_afastados,
+            'funcionarios_afastados': totais['afastados'],
             'indice_absenteismo': round(indice_absenteismo, 2),
-            'distribuicao_por_tipo': list(tipos),
-            'absenteismo_por_setor': list(setores),
-            'top_funcionarios': list(top_funcionarios)
+            'distribuicao_por_tipo': resultados['distribuicao_por_tipo'],
+            'absenteismo_por_setor': resultados['absenteismo_por_setor'],
+            'top_funcionarios': resultados['top_funcionarios']
         }
+    
+    @staticmethod
+    def obter_metricas(empresa_id: int, periodo_inicio=None, periodo_fim=None) -> Dict[str, Any]:
+        """Retorna métricas gerais de absenteísmo da empresa."""
+        consultas = AbsenteismoService.consultas_metricas(empresa_id, periodo_inicio, periodo_fim)
+        return AbsenteismoService.montar_metricas({nome: consulta() for nome, consulta in consultas.items()})
+    
+    @staticmethod
+    async def aobter_metricas(
+        empresa_id: int, periodo_inicio=None, periodo_fim=None, tempo_limite_ms: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de `obter_metricas`, com as consultas em paralelo."""
+        consultas = AbsenteismoService.consultas_metricas(empresa_id, periodo_inicio, periodo_fim)
+        return AbsenteismoService.montar_metricas(
+            await executar_em_paralelo(consultas, Absenteismo, tempo_limite_ms)
+        )
 
 class ConvocacaoService:
     """Serviço para métricas e operações relacionadas a convocações."""
     
+    @staticmethod
+    def consultas_metricas(empresa_id: int) -> Dict[str, Callable[[], Any]]:
+        """Consultas independentes que compõem as métricas, para execução sequencial ou paralela."""
+        
+        # Base queryset
+        queryset = Convocacao.objects.da_empresa(empresa_id)
+        
+        # Prazo próximo para exames a vencer
+        hoje = date.today()
+        prazo_futuro = hoje + timedelta(days=30)
+        
+        return {
+            # Total de exames vencidos (respondidos após a data limite)
+            'total_exames_vencidos': queryset.filter(
+                data_resposta__gt=F('data_limite_resposta'),
+                respondido=True
+            ).count,
+            # Total de exames pendentes (ainda não respondidos)
+            'total_exames_pendentes': queryset.filter(respondido=False).count,
+            # Total de exames a vencer (prazo próximo)
+            'total_exames_a_vencer': queryset.filter(
+                respondido=False,
+                data_limite_resposta__gte=hoje,
+                data_limite_resposta__lte=prazo_futuro
+            ).count,
+            # Total de exames em dia (respondidos dentro do prazo)
+            'total_exames_em_dia': queryset.filter(
+                respondido=True,
+                data_resposta__lte=F('data_limite_resposta')
+            ).count,
+            # Distribuição por unidade
+            'distribuicao_por_unidade': lambda: list(
+                queryset.values(
+                    'funcionario__codigo_unidade',
+                    'funcionario__nome_unidade'
+                ).annotate(
+                    pendentes=Count('id', filter=Q(respondido=False)),
+                    em_dia=Count('id', filter=Q(respondido=True, data_resposta__lte=F('data_limite_resposta'))),
+                    vencidos=Count('id', filter=Q(respondido=True, data_resposta__gt=F('data_limite_resposta')))
+                ).order_by('funcionario__nome_unidade')
+            ),
+        }
+    
+    @staticmethod
+    def montar_metricas(resultados: Dict[str, Any]) -> Dict[str, Any]:
+        """Acrescenta a distribuição por status aos resultados de `consultas_metricas`."""
+        return {
+            'total_exames_vencidos': resultados['total_exames_vencidos'],
+            'total_exames_pendentes': resultados['total_exames_pendentes'],
+            'total_exames_a_vencer': resultados['total_exames_a_vencer'],
+            'total_exames_em_dia': resultados['total_exames_em_dia'],
+            'distribuicao_por_status': [
+                {'status': 'Vencidos', 'total': resultados['total_exames_vencidos']},
+                {'status': 'Pendentes', 'total': resultados['total_exames_pendentes']},
+                {'status': 'A Vencer', 'total': resultados['total_exames_a_vencer']},
+                {'status': 'Em Dia', 'total': resultados['total_exames_em_dia']}
+            ],
+            'distribuicao_por_unidade': resultados['distribuicao_por_unidade']
+        }
+    
     @staticmethod
     def obter_metricas(empresa_id: int) -> Dict[str, Any]:
         """Retorna métricas gerais de convocações da empresa."""
+        consultas = ConvocacaoService.consultas_metricas(empresa_id)
+        return ConvocacaoService.montar_metricas({nome: consulta() for nome, consulta in consultas.items()})
+    
+    @staticmethod
+    async def aobter_metricas(empresa_id: int, tempo_limite_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Versão assíncrona de `obter_metricas`, com as consultas em paralelo."""
+        consultas = ConvocacaoService.consultas_metricas(empresa_id)
+        return ConvocacaoService.montar_metricas(
+            await executar_em_paralelo(consultas, Convocacao, tempo_limite_ms)
+        )
+    
+    @staticmethod
+    def criar_em_lote(
+        empresa_id: int,
+        dados: Dict[str, Any],
+        usuario: Optional[Any] = None
+    ) -> Dict[str, int]:
+        """Cria convocações para todos os funcionários selecionados em uma única transação.
         
-        # Base queryset
-        queryset = Convocacao.objects.filter(empresa__codigo=empresa_id)
-        
-        # Total de exames vencidos (respondidos após a data limite)
-        exames_vencidos = queryset.filter(
-            data_resposta__gt=F('data_limite_resposta'),
-            respondido=True
-        ).count()
-        
-        # Total de exames pendentes (ainda não respondidos)
-        exames_pendentes = queryset.filter(
-            respondido=False
-        ).count()
-        
-        # Total de exames a vencer (prazo próximo)
-        from datetime import date, timedelta
-        prazo_futuro = date.today() + timedelta(days=30)
-        
-        exames_a_vencer = queryset.filter(
-            respondido=False,
-            data_limite_resposta__gte=date.today(),
-            data_limite_resposta__lte=prazo_futuro
-        ).count()
-        
-        # Total de exames em dia (respondidos dentro do prazo)
-        exames_em_dia = queryset.filter(
-            respondido=True,
-            data_resposta__lte=F('data_limite_resposta')
-        ).count()
-        
-        # Distribuição por status
-        status_distribuicao = [
-            {'status': 'Vencidos', 'total': exames_vencidos},
-            {'status': 'Pendentes', 'total': exames_pendentes},
-            {'status': 'A Vencer', 'total': exames_a_vencer},
-            {'status': 'Em Dia', 'total': exames_em_dia}
-        ]
-        
-        # Distribuição por unidade
-        unidades = queryset.values(
-            'funcionario__codigo_unidade', 
-            'funcionario__nome_unidade'
-        ).annotate(
-            pendentes=Count('id', filter=Q(respondido=False)),
-            em_dia=Count('id', filter=Q(respondido=True, data_resposta__lte=F('data_limite_resposta'))),
-            vencidos=Count('id', filter=Q(respondido=True, data_resposta__gt=F('data_limite_resposta')))
-        ).order_by('funcionario__nome_unidade')
+        Funcionários que já possuem convocação do mesmo tipo na mesma data
+        são ignorados, permitindo reenviar a mesma campanha sem duplicar registros.
+        A constraint única da convocação descarta também as criadas por um lote
+        concorrente entre a verificação e o INSERT.
+        """
+        
+        # Seleção dos funcionários alvo
+        funcionarios = Funcionario.objects.da_empresa(empresa_id)
+        
+        for campo in ['codigo_unidade', 'codigo_setor', 'codigo_cargo', 'situacao']:
+            if dados.get(campo):
+                funcionarios = funcionarios.filter(**{campo: dados[campo]})
+                
+        if dados.get('funcionarios'):
+            funcionarios = funcionarios.filter(codigo__in=dados['funcionarios'])
+        
+        tipo = dados['tipo']
+        data_convocacao = dados['data_convocacao']
+        
+        mesma_convocacao = Convocacao.objects.filter(
+            empresa__codigo=empresa_id,
+            tipo=tipo,
+            data_convocacao=data_convocacao
+        )
+        
+        with transaction.atomic():
+            # Funcionários selecionados, marcando os que já possuem a mesma convocação
+            selecionados = list(
+                funcionarios.order_by().annotate(
+                    convocado=Exists(mesma_convocacao.filter(funcionario=OuterRef('pk')))
+                ).values_list('codigo', 'convocado')
+            )
+            codigos = [codigo for codigo, _ in selecionados]
+            existentes = {codigo for codigo, convocado in selecionados if convocado}
+            
+            novas = [
+                Convocacao(
+                    empresa_id=empresa_id,
+                    funcionario_id=codigo,
+                    tipo=tipo,
+                    data_convocacao=data_convocacao,
+                    data_limite_resposta=dados['data_limite_resposta'],
+                    observacoes=dados.get('observacoes'),
+                    criado_por=usuario
+                )
+                for codigo in codigos
+                if codigo not in existentes
+            ]
+            
+            # O bulk_create com ignore_conflicts não informa o que foi descartado; o
+            # mesmo INSERT, com ON CONFLICT DO NOTHING RETURNING id, devolve só as
+            # linhas gravadas (uma convocação criada por um lote concorrente fica de fora)
+            campos = [campo for campo in Convocacao._meta.concrete_fields if not campo.primary_key]
+            total_criados = 0
+            for inicio in range(0, len(novas), 1000):
+                linhas = Convocacao.objects._insert(
+                    novas[inicio:inicio + 1000],
+                    fields=campos,
+                    returning_fields=[Convocacao._meta.pk],
+                    on_conflict=OnConflict.IGNORE
+                )
+                # Num INSERT de uma só linha o conflito volta como None
+                total_criados += sum(1 for linha in linhas if linha)
+        
+        return {
+            'total_selecionados': len(codigos),
+            'total_criados': total_criados,
+            'total_ignorados': len(codigos) - total_criados
+        }
+    
+    @staticmethod
+    def registrar_respostas_em_lote(
+        empresa_id: int,
+        itens: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Registra respostas de várias convocações com um único UPDATE em lote.
+        
+        Recebe os itens já validados por `ConvocacaoRespostaLoteSerializer`
+        (os inválidos trazem `errors`) e devolve o resultado de cada um na
+        mesma ordem da entrada, para que o cliente saiba o que foi aplicado.
+        """
+        
+        resultados: List[Dict[str, Any]] = []
+        validos: Dict[int, Dict[str, Any]] = {}
+        
+        for item in itens:
+            if 'errors' in item:
+                resultados.append({
+                    'id': item['id'],
+                    'status': 'invalido',
+                    'errors': item['errors']
+                })
+                continue
+                
+            validos[item['id']] = item
+            resultados.append({'id': item['id'], 'status': None})
+        
+        agora = timezone.now()
+        atualizacoes = []
+        
+        with transaction.atomic():
+            # Uma única consulta confirma que as convocações pertencem à empresa e
+            # as trava até o UPDATE, em ordem de id para não haver deadlock entre lotes
+            encontrados = set(
+                Convocacao.objects.select_for_update().filter(
+                    empresa__codigo=empresa_id,
+                    id__in=list(validos)
+                ).order_by('id').values_list('id', flat=True)
+            )
+            
+            for id_convocacao in encontrados:
+                dados = validos[id_convocacao]
+                respondido = dados['resposta'] != 'PENDENTE'
+                data_resposta = dados.get('data_resposta')
+                if respondido and not data_resposta:
+                    data_resposta = agora
+                    
+                atualizacoes.append(Convocacao(
+                    id=id_convocacao,
+                    resposta=dados['resposta'],
+                    respondido=respondido,
+                    data_resposta=data_resposta if respondido else None,
+                    atualizado_em=agora
+                ))
+            
+            Convocacao.objects.bulk_update(
+                atualizacoes,
+                ['resposta', 'respondido', 'data_resposta', 'atualizado_em'],
+                batch_size=500
+            )
+        
+        for resultado in resultados:
+            if resultado['status'] is None:
+                resultado['status'] = (
+                    'atualizado' if resultado['id'] in encontrados else 'nao_encontrado'
+                )
+        
+        return {
+            'total_atualizados': len(atualizacoes),
+            'total_nao_encontrados': len(validos) - len(encontrados),
+            'total_invalidos': len(itens) - len(validos),
+            'resultados': resultados
+        }
+
+
+class IndicePrefixos:
+    """Índice em memória para busca por prefixo em listas pequenas.
+    
+    Cada nome é indexado pelo início de cada uma de suas palavras, já sem
+    acentos e em minúsculas, em uma lista ordenada consultada com bisect.
+    """
+    
+    def __init__(self, itens: List[Tuple[Any, str]]) -> None:
+        self.itens = itens
+        self.chaves: List[Tuple[str, int]] = []
+        
+        for posicao, (_, nome) in enumerate(itens):
+            palavras = normalizar_busca(nome).split()
+            for inicio in range(len(palavras)):
+                self.chaves.append((' '.join(palavras[inicio:]), posicao))
+                
+        self.chaves.sort()
+    
+    def buscar(self, prefixo: str, limite: int) -> List[Tuple[Any, str]]:
+        """Retorna até `limite` itens com alguma palavra começando pelo prefixo."""
+        prefixo = normalizar_busca(prefixo)
+        encontrados: List[int] = []
+        
+        indice = bisect_left(self.chaves, (prefixo, -1))
+        while indice < len(self.chaves) and len(encontrados) < limite:
+            chave, posicao = self.chaves[indice]
+            if not chave.startswith(prefixo):
+                break
+            if posicao not in encontrados:
+                encontrados.append(posicao)
+            indice += 1
+        
+        return [self.itens[posicao] for posicao in sorted(encontrados, key=lambda p: self.itens[p][1])]
+
+
+class AutocompletarService:
+    """Serviço de autocompletar para os seletores de funcionário, unidade, setor e cargo."""
+    
+    # Dimensões atendidas pelo índice em memória: (coluna do código, coluna do nome)
+    DIMENSOES = {
+        'unidade': ('codigo_unidade', 'nome_unidade'),
+        'setor': ('codigo_setor', 'nome_setor'),
+        'cargo': ('codigo_cargo', 'nome_cargo'),
+    }
+    
+    # Tempo máximo da consulta de funcionários, validade e quantidade máxima
+    # dos índices em memória (um por empresa e dimensão)
+    ORCAMENTO_MS = 150
+    VALIDADE_INDICE = 300
+    MAX_INDICES = 3000
+    
+    _indices = CacheTemporario('autocompletar', VALIDADE_INDICE, MAX_INDICES)
+    _lock = threading.Lock()
+    
+    @classmethod
+    def buscar(cls, empresa_id: int, tipo: str, termo: str, limite: int) -> Dict[str, Any]:
+        """Retorna até `limite` pares (código, nome) que começam pelo termo, sem contagem."""
+        if tipo == 'funcionario':
+            itens, parcial = cls._buscar_funcionarios(empresa_id, termo, limite)
+        else:
+            itens, parcial = cls._obter_indice(empresa_id, tipo).buscar(termo, limite), False
         
         return {
-            'total_exames_vencidos': exames_vencidos,
-            'total_exames_pendentes': exames_pendentes,
-            'total_exames_a_vencer': exames_a_vencer,
-            'total_exames_em_dia': exames_em_dia,
-            'distribuicao_por_status': status_distribuicao,
-            'distribuicao_por_unidade': list(unidades)
-        }
\ No newline at end of file
+            'resultados': [{'codigo': codigo, 'nome': nome} for codigo, nome in itens],
+            'parcial': parcial
+        }
+    
+    @classmethod
+    def _buscar_funcionarios(cls, empresa_id: int, termo: str, limite: int) -> Tuple[List[Tuple[Any, str]], bool]:
+        queryset = Funcionario.objects.da_empresa(empresa_id)
+        
+        if connection.vendor == 'postgresql':
+            # `busca` começa pelo nome normalizado. Filtro e ordem usam a collation C do
+            # índice (empresa, busca COLLATE "C", codigo): com a collation do banco
+            # (pt_BR, en_US) o ORDER BY não seguiria o índice e ordenaria cada prefixo
+            queryset = queryset.alias(busca_c=Collate('busca', 'C')).filter(
+                busca_c__startswith=normalizar_busca(termo)
+            ).order_by('busca_c', 'codigo')
+        else:
+            queryset = queryset.filter(nome__istartswith=termo).order_by('nome', 'codigo')
+        
+        queryset = queryset.values_list('codigo', 'nome')[:limite]
+        
+        # Dentro da transação da requisição o atomic() é só um savepoint, e o
+        # SET LOCAL valeria até o fim dela: o limite anterior é restaurado
+        # (num cancelamento, o rollback do savepoint já o desfaz)
+        aninhado = connection.in_atomic_block or not connection.get_autocommit()
+        
+        try:
+            with transaction.atomic():
+                if connection.vendor != 'postgresql':
+                    return list(queryset), False
+                
+                with connection.cursor() as cursor:
+                    anterior = None
+                    if aninhado:
+                        cursor.execute('SHOW statement_timeout')
+                        anterior = cursor.fetchone()[0]
+                    cursor.execute('SET LOCAL statement_timeout = %s', [cls.ORCAMENTO_MS])
+                    itens = list(queryset)
+                    if anterior is not None:
+                        cursor.execute('SET LOCAL statement_timeout = %s', [anterior])
+                return itens, False
+        except OperationalError as exc:
+            # Só o cancelamento por tempo limite vira resposta parcial; queda de conexão
+            # ou de réplica e erros de lock seguem como erro, visíveis no monitoramento
+            if not consulta_cancelada(exc):
+                raise
+            # Estourou o orçamento: melhor uma resposta vazia que um seletor travado
+            registrar_cancelamento('autocompletar.funcionario')
+            return [], True
+    
+    @classmethod
+    def _obter_indice(cls, empresa_id: int, tipo: str) -> IndicePrefixos:
+        chave = (empresa_id, tipo)
+        
+        encontrado, indice = cls._indices.obter(chave)
+        if encontrado:
+            return indice
+        
+        with cls._lock:
+            encontrado, indice = cls._indices.obter(chave, registrar=False)
+            if encontrado:
+                return indice
+            
+            coluna_codigo, coluna_nome = cls.DIMENSOES[tipo]
+            itens = list(
+                Funcionario.objects.filter(
+                    empresa__codigo=empresa_id,
+                    **{f'{coluna_nome}__isnull': False}
+                ).exclude(
+                    **{coluna_nome: ''}
+                ).order_by().values_list(coluna_codigo, coluna_nome).distinct()
+            )
+            
+            return cls._indices.guardar(chave, IndicePrefixos(itens))
@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .instrumentacao import COMANDOS_DE_CONTROLE
+
+
+@contextmanager
+def max_queries(limite: int, using: str = DEFAULT_DB_ALIAS) -> Iterator[CaptureQueriesContext]:
+    """Falha se o bloco executar mais do que `limite` consultas no banco.
+
+    Como no orçamento por rota, comandos de controle (SET, SAVEPOINT...) não
+    contam, então os limites de ORCAMENTO_CONSULTAS valem aqui também.
+    """
+    with CaptureQueriesContext(connections[using]) as contexto:
+        yield contexto
+
+    capturadas = [
+        query for query in contexto.captured_queries
+        if not query['sql'].lstrip()[:20].upper().startswith(COMANDOS_DE_CONTROLE)
+    ]
+    executadas = len(capturadas)
+    if executadas > limite:
+        consultas = '\n'.join(
+            f"{indice}. {query['sql']}"
+            for indice, query in enumerate(capturadas, start=1)
+        )
+        raise AssertionError(
+            f"{executadas} consultas executadas, o limite é {limite}:\n{consultas}"
+        )
+
+
+class MaxQueriesMixin:
+    """Mixin de TestCase para limitar o número de consultas por endpoint."""
+
+    def assertMaxQueries(self, limite: int, using: str = DEFAULT_DB_ALIAS) -> Any:
+        return max_queries(limite, using=using)
+
+    def assertListQueries(self, url: str, limite: int, **extra: Any) -> Any:
+        """Requisita a listagem e garante que ela respeita o limite de consultas."""
+        with max_queries(limite):
+            response = self.client.get(url, **extra)
+
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Orçamento de consultas por rota (manage.py orcamento_consultas)
+# ---------------------------------------------------------------------------
+
+# Consultas por requisição em cada rota da API, contando middlewares (usuário,
+# permissões, log de acesso) com os caches em memória vazios. O número deve
+# ser o mesmo nos dois volumes de dados; `None` marca rotas não exercitadas.
+# Os limites foram medidos no SQLite; confira-os no PostgreSQL antes de
+# apertá-los (a réplica e as consultas paralelas não mudam a contagem).
+#
+# Chaves de cada rota: `limite`, `metodo` (padrão 'get'), `params` (query
+# string), `dados` (corpo JSON, função do contexto), `kwargs` (argumentos da
+# URL; nas rotas `-detail`, o padrão é o objeto do contexto com o nome da
+# rota) e `autenticado` (padrão True).
+ORCAMENTO_CONSULTAS: Dict[str, Optional[Dict[str, Any]]] = {
+    # Autenticação
+    'token_obtain_pair': {
+        'limite': 3, 'metodo': 'post', 'autenticado': False,
+        'dados': lambda ctx: {'email': ctx['email'], 'password': ctx['senha']},
+    },
+    'token_refresh': {
+        'limite': 1, 'metodo': 'post', 'autenticado': False,
+        'dados': lambda ctx: {'refresh': ctx['refresh']},
+    },
+    'token_verify': {
+        'limite': 1, 'metodo': 'post', 'autenticado': False,
+        'dados': lambda ctx: {'token': ctx['access']},
+    },
+    'usuario-login': {
+        'limite': 5, 'metodo': 'post', 'autenticado': False,
+        'dados': lambda ctx: {'email': ctx['email'], 'password': ctx['senha']},
+    },
+    'usuario-list': {'limite': 5},
+    'usuario-detail': {'limite': 4},
+    'usuario-me': {'limite': 3},
+    'usuario-selecionar-empresa': {
+        'limite': 3, 'metodo': 'post', 'dados': lambda ctx: {'empresa_id': ctx['empresa']},
+    },
+    'usuario-alterar-senha': {
+        'limite': 4, 'metodo': 'post',
+        'dados': lambda ctx: {
+            'senha_atual': ctx['senha'], 'senha_nova': ctx['senha'], 'senha_nova_confirmacao': ctx['senha'],
+        },
+    },
+    # Raiz navegável dos routers (só usuário e log de acesso)
+    'api-root': {'limite': 3},
+
+    # Cadastros
+    'empresa-list': {'limite': 6},
+    'empresa-detail': {'limite': 5},
+    'tipoconvocacao-list': {'limite': 5},
+    'tipoconvocacao-detail': {'limite': 4},
+    'tipoabsenteismo-list': {'limite': 5},
+    'tipoabsenteismo-detail': {'limite': 4},
+
+    # Funcionários
+    'funcionario-list': {'limite': 6},
+    'funcionario-detail': {'limite': 5},
+    'funcionario-metricas': {'limite': 8},
+    'funcionario-metricas-async': {'limite': 7},
+    'funcionario-autocompletar': {'limite': 4, 'params': {'q': 'a'}},
+    'funcionario-exportar': {'limite': 4},
+
+    # Convocações
+    'convocacao-list': {'limite': 6},
+    'convocacao-detail': {'limite': 5},
+    'convocacao-metricas': {'limite': 8},
+    'convocacao-metricas-async': {'limite': 7},
+    'convocacao-exportar': {'limite': 4},
+    'convocacao-criar-em-lote': {
+        'limite': 6, 'metodo': 'post',
+        'dados': lambda ctx: {
+            'tipo': ctx['tipoconvocacao'], 'data_convocacao': '2024-01-01', 'data_limite_resposta': '2024-02-01',
+            'funcionarios': ctx['funcionarios'],
+        },
+    },
+    'convocacao-responder-em-lote': {
+        'limite': 5, 'metodo': 'post',
+        'dados': lambda ctx: {'respostas': [{'id': pk, 'resposta': 'ACEITO'} for pk in ctx['convocacoes']]},
+    },
+
+    # Absenteísmos
+    'absenteismo-list': {'limite': 6},
+    'absenteismo-detail': {'limite': 5},
+    'absenteismo-metricas': {'limite': 8},
+    'absenteismo-metricas-async': {'limite': 7},
+    'absenteismo-exportar': {'limite': 4},
+
+    # Painel
+    'painel': {'limite': 17},
+}
+
+
+def rotas_da_api(prefixo: str = 'api/') -> Dict[str, str]:
+    """Rotas nomeadas sob o prefixo, percorrendo os includes: {nome: padrão}.
+
+    As variantes com sufixo de formato (`.json`) dos routers ficam de fora.
+    """
+    rotas: Dict[str, str] = {}
+
+    def percorrer(padroes: List[Any], base: str) -> None:
+        for padrao in padroes:
+            caminho = base + str(padrao.pattern)
+            if isinstance(padrao, URLResolver):
+                percorrer(padrao.url_patterns, caminho)
+            elif padrao.name and caminho.startswith(prefixo) and 'format' not in padrao.pattern.regex.groupindex:
+                rotas.setdefault(padrao.name, caminho)
+
+    percorrer(get_resolver().url_patterns, '')
+    return rotas
+
+
+def limpar_caches_em_memoria() -> None:
+    """Esvazia os caches do processo, para que cada requisição pague o caminho completo."""
+    from django.core.cache import cache
+    from app.apps.autenticacao import identificacao
+    from . import middleware
+    from .services import AutocompletarService
+
+    identificacao._usuarios.clear()
+    middleware._permissoes.clear()
+    AutocompletarService._indices.clear()
+    cache.clear()
+
+
+def consultas_da_requisicao(cliente: Client, nome: str, orcamento: Dict[str, Any], contexto: Dict[str, Any],
+                            cabecalhos: Dict[str, str]) -> Tuple[int, int]:
+    """Faz a requisição da rota e retorna (consultas, status)."""
+    kwargs = orcamento.get('kwargs')
+    if kwargs is None and nome.endswith('-detail'):
+        kwargs = lambda ctx: {'pk': ctx[nome[:-len('-detail')]]}
+    url = reverse(nome, kwargs=kwargs(contexto) if kwargs else None)
+
+    extra = cabecalhos if orcamento.get('autenticado', True) else {}
+    if orcamento.get('metodo', 'get') == 'post':
+        dados: Callable[[Dict[str, Any]], Any] = orcamento.get('dados', lambda ctx: {})
+        response = cliente.post(url, dados(contexto), content_type='application/json', **extra)
+    else:
+        response = cliente.get(url, orcamento.get('params', {}), **extra)
+
+    # Medição do InstrumentacaoMiddleware: todas as conexões, inclusive as do pool de consultas
+    medicao = getattr(response.wsgi_request, 'medicao', None)
+    return (medicao.consultas if medicao else 0), response.status_code
+
+
+def verificar_orcamento(nome: str, limite: int, medidas: List[Tuple[int, int]]) -> List[str]:
+    """Problemas da rota a partir de (consultas, status) medidos em volumes crescentes."""
+    problemas = []
+    contagens = [consultas for consultas, _ in medidas]
+    status_invalidos = sorted({status for _, status in medidas if status >= 400})
+    if status_invalidos:
+        problemas.append(f'{nome}: status {", ".join(map(str, status_invalidos))}')
+    if any(depois > antes for antes, depois in zip(contagens, contagens[1:])):
+        problemas.append(f'{nome}: consultas crescem com o volume ({" -> ".join(map(str, contagens))})')
+    if max(contagens) > limite:
+        problemas.append(f'{nome}: {max(contagens)} consultas, o orçamento é {limite}')
+    return problemas
@@ -0,0 +1,56 @@
+import random
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from typing import Any
+
+from app.apps.autenticacao.models import Empresa as EmpresaAcesso
+from ..management.commands._sinteticos import criar_empresa, estrutura_empresa, gerar_funcionario
+from ..models import Empresa, Funcionario, TipoConvocacao
+from ..testing import limpar_caches_em_memoria
+
+
+class ApiTestMixin:
+    """Base dos testes da API: um administrador autenticado no contexto de uma empresa."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.rng = random.Random(0)
+        cls.usuario = get_user_model().objects.create_user(
+            'admin@teste.invalid', 'senha-de-teste', nome='Administrador', tipo_usuario='admin'
+        )
+        cls.empresa = cls.criar_empresa(1)
+        cls.tipo_convocacao = TipoConvocacao.objects.create(nome='Periódico')
+
+    def setUp(self) -> None:
+        limpar_caches_em_memoria()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.usuario)}',
+            HTTP_X_EMPRESA=str(self.empresa.codigo),
+        )
+
+    @classmethod
+    def criar_empresa(cls, codigo: int) -> Empresa:
+        empresa = criar_empresa(codigo, cls.rng)
+        empresa.save()
+        EmpresaAcesso.objects.create(id=empresa.codigo, nome=empresa.nome_abreviado, cnpj=empresa.cnpj)
+        return empresa
+
+    @classmethod
+    def criar_funcionarios(cls, empresa: Empresa, quantidade: int, inicio: int = 1) -> Any:
+        estrutura = estrutura_empresa(quantidade, cls.rng)
+        return Funcionario.objects.bulk_create([
+            gerar_funcionario(codigo, empresa, estrutura, cls.rng, date.today())
+            for codigo in range(inicio, inicio + quantidade)
+        ])
+
+    @staticmethod
+    def hoje_menos(dias: int) -> date:
+        return date.today() - timedelta(days=dias)
+
+
+class ApiTestCase(ApiTestMixin, TestCase):
+    pass
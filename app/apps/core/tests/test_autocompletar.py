@@ -0,0 +1,43 @@
+from django.db import OperationalError
+from unittest import mock
+
+from ..models import Funcionario
+from ..services import AutocompletarService
+from .base import ApiTestCase
+
+
+class AutocompletarTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        funcionarios = cls.criar_funcionarios(cls.empresa, 6)
+        # Homônimos: o desempate é pelo código
+        for funcionario in funcionarios:
+            funcionario.nome = 'Ana Souza' if funcionario.codigo % 2 else 'Bruno Lima'
+        Funcionario.objects.bulk_update(funcionarios, ['nome'])
+
+    def test_homonimos_em_ordem_de_codigo(self) -> None:
+        response = self.client.get('/api/funcionarios/autocompletar/', {'q': 'ana', 'limite': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['codigo'] for item in response.json()['data']['resultados']], [1, 3])
+
+    def test_indices_em_memoria_limitados(self) -> None:
+        indices = AutocompletarService._indices
+        with mock.patch.object(indices, 'maximo', 2):
+            for tipo in ('unidade', 'setor', 'cargo'):
+                response = self.client.get('/api/funcionarios/autocompletar/', {'tipo': tipo, 'q': 'a'})
+                self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(indices), 2)
+
+    def test_so_o_tempo_limite_vira_resposta_parcial(self) -> None:
+        cancelada = OperationalError('canceling statement due to statement timeout')
+        cancelada.pgcode = '57014'
+        with mock.patch('django.db.backends.utils.CursorWrapper.execute', side_effect=cancelada):
+            resultado = AutocompletarService.buscar(self.empresa.codigo, 'funcionario', 'ana', 5)
+        self.assertEqual(resultado, {'resultados': [], 'parcial': True})
+
+        with mock.patch('django.db.backends.utils.CursorWrapper.execute',
+                        side_effect=OperationalError('server closed the connection unexpectedly')), \
+                self.assertRaises(OperationalError):
+            AutocompletarService.buscar(self.empresa.codigo, 'funcionario', 'ana', 5)
@@ -0,0 +1,41 @@
+from ..models import Convocacao
+from .base import ApiTestCase
+
+
+class ConditionalGetTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.funcionario = cls.criar_funcionarios(cls.empresa, 1)[0]
+        cls.convocacao = Convocacao.objects.create(
+            empresa=cls.empresa, funcionario=cls.funcionario, tipo=cls.tipo_convocacao,
+            data_convocacao=cls.hoje_menos(0), data_limite_resposta=cls.hoje_menos(-30)
+        )
+
+    def assertInvalidaEtag(self, url: str, alterar: callable) -> None:
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        alterar()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_renomear_relacionados_invalida_etag(self) -> None:
+        def renomear(instancia: object) -> callable:
+            def alterar() -> None:
+                campo = 'nome_abreviado' if instancia is self.empresa else 'nome'
+                setattr(instancia, campo, getattr(instancia, campo) + ' (novo)')
+                instancia.save()
+            return alterar
+
+        for url in ('/api/convocacoes/', f'/api/convocacoes/{self.convocacao.pk}/'):
+            for instancia in (self.funcionario, self.tipo_convocacao, self.empresa):
+                with self.subTest(url=url, modelo=type(instancia).__name__):
+                    self.assertInvalidaEtag(url, renomear(instancia))
+
+    def test_modo_cursor_nao_calcula_etag(self) -> None:
+        response = self.client.get('/api/convocacoes/?cursor=')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
@@ -0,0 +1,43 @@
+from django.urls import reverse
+
+from ..models import Absenteismo, Convocacao, TipoAbsenteismo
+from ..testing import ORCAMENTO_CONSULTAS, MaxQueriesMixin, limpar_caches_em_memoria
+from .base import ApiTestCase
+
+LISTAGENS = ['empresa-list', 'funcionario-list', 'convocacao-list', 'absenteismo-list']
+
+
+class ConsultasPorListagemTests(MaxQueriesMixin, ApiTestCase):
+    """As listagens respeitam o orçamento de consultas com uma e com várias páginas de dados."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.tipo_absenteismo = TipoAbsenteismo.objects.create(nome='Atestado médico')
+
+    def popular(self, inicio: int, quantidade: int) -> None:
+        funcionarios = self.criar_funcionarios(self.empresa, quantidade, inicio=inicio)
+        for indice in range(inicio, inicio + quantidade):
+            self.criar_empresa(1000 + indice)
+        Convocacao.objects.bulk_create([
+            Convocacao(
+                empresa=self.empresa, funcionario=funcionario, tipo=self.tipo_convocacao,
+                data_convocacao=self.hoje_menos(10), data_limite_resposta=self.hoje_menos(-20)
+            )
+            for funcionario in funcionarios
+        ])
+        Absenteismo.objects.bulk_create([
+            Absenteismo(
+                empresa=self.empresa, funcionario=funcionario, tipo=self.tipo_absenteismo,
+                data_inicio=self.hoje_menos(5), data_fim=self.hoje_menos(4)
+            )
+            for funcionario in funcionarios
+        ])
+
+    def test_listagens_dentro_do_orcamento(self) -> None:
+        for inicio, quantidade in ((1, 2), (3, 25)):
+            self.popular(inicio, quantidade)
+            for nome in LISTAGENS:
+                with self.subTest(rota=nome, funcionarios=inicio + quantidade - 1):
+                    limpar_caches_em_memoria()
+                    self.assertListQueries(reverse(nome), ORCAMENTO_CONSULTAS[nome]['limite'])
@@ -0,0 +1,51 @@
+from ..models import Convocacao
+from .base import ApiTestCase
+
+
+class EmpresaContextTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.outra_empresa = cls.criar_empresa(2)
+        cls.funcionario = cls.criar_funcionarios(cls.empresa, 1)[0]
+        cls.funcionario_de_outra = cls.criar_funcionarios(cls.outra_empresa, 1, inicio=100)[0]
+
+    def dados(self, **extra: object) -> dict:
+        dados = {
+            'empresa': self.empresa.codigo, 'funcionario': self.funcionario.codigo, 'tipo': self.tipo_convocacao.pk,
+            'data_convocacao': self.hoje_menos(0).isoformat(), 'data_limite_resposta': self.hoje_menos(-30).isoformat(),
+        }
+        dados.update(extra)
+        return dados
+
+    def test_criacao_grava_a_empresa_do_contexto(self) -> None:
+        response = self.client.post('/api/convocacoes/', self.dados(empresa=self.outra_empresa.codigo), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Convocacao.objects.get(pk=response.json()['id']).empresa_id, self.empresa.codigo)
+
+    def test_funcionario_de_outra_empresa_e_recusado(self) -> None:
+        response = self.client.post(
+            '/api/convocacoes/', self.dados(funcionario=self.funcionario_de_outra.codigo), format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('funcionario', response.json())
+        self.assertFalse(Convocacao.objects.exists())
+
+    def test_alteracao_mantem_a_empresa_do_contexto(self) -> None:
+        convocacao = Convocacao.objects.create(
+            empresa=self.empresa, funcionario=self.funcionario, tipo=self.tipo_convocacao,
+            data_convocacao=self.hoje_menos(0), data_limite_resposta=self.hoje_menos(-30)
+        )
+        response = self.client.patch(
+            f'/api/convocacoes/{convocacao.pk}/',
+            {'empresa': self.outra_empresa.codigo, 'funcionario': self.funcionario_de_outra.codigo}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch(
+            f'/api/convocacoes/{convocacao.pk}/', {'empresa': self.outra_empresa.codigo}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        convocacao.refresh_from_db()
+        self.assertEqual(convocacao.empresa_id, self.empresa.codigo)
@@ -0,0 +1,86 @@
+from django.db.models import BooleanField, Value
+from unittest import mock
+
+from ..models import Convocacao
+from .base import ApiTestCase
+
+
+class ConvocacaoLoteTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.funcionarios = cls.criar_funcionarios(cls.empresa, 3)
+
+    def lote(self) -> dict:
+        return {
+            'tipo': self.tipo_convocacao.pk,
+            'data_convocacao': self.hoje_menos(0).isoformat(),
+            'data_limite_resposta': self.hoje_menos(-30).isoformat(),
+            'funcionarios': [funcionario.codigo for funcionario in self.funcionarios],
+        }
+
+    def test_reenvio_do_lote_nao_duplica(self) -> None:
+        Convocacao.objects.create(
+            empresa=self.empresa, funcionario=self.funcionarios[0], tipo=self.tipo_convocacao,
+            data_convocacao=self.hoje_menos(0), data_limite_resposta=self.hoje_menos(-30)
+        )
+
+        response = self.client.post('/api/convocacoes/criar_em_lote/', self.lote(), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            response.json()['data'], {'total_selecionados': 3, 'total_criados': 2, 'total_ignorados': 1}
+        )
+
+        response = self.client.post('/api/convocacoes/criar_em_lote/', self.lote(), format='json')
+        self.assertEqual(
+            response.json()['data'], {'total_selecionados': 3, 'total_criados': 0, 'total_ignorados': 3}
+        )
+        self.assertEqual(Convocacao.objects.count(), 3)
+
+    def test_convocacao_de_lote_concorrente_nao_conta_como_criada(self) -> None:
+        Convocacao.objects.create(
+            empresa=self.empresa, funcionario=self.funcionarios[0], tipo=self.tipo_convocacao,
+            data_convocacao=self.hoje_menos(0), data_limite_resposta=self.hoje_menos(-30)
+        )
+        # Como se a convocação existente tivesse sido gravada depois da verificação
+        with mock.patch('app.apps.core.services.Exists', return_value=Value(False, output_field=BooleanField())):
+            response = self.client.post('/api/convocacoes/criar_em_lote/', self.lote(), format='json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            response.json()['data'], {'total_selecionados': 3, 'total_criados': 2, 'total_ignorados': 1}
+        )
+        self.assertEqual(Convocacao.objects.count(), 3)
+
+    def test_convocacao_repetida_e_recusada(self) -> None:
+        dados = {
+            'funcionario': self.funcionarios[0].codigo, 'tipo': self.tipo_convocacao.pk,
+            'data_convocacao': self.hoje_menos(0).isoformat(), 'data_limite_resposta': self.hoje_menos(-30).isoformat(),
+        }
+        self.assertEqual(self.client.post('/api/convocacoes/', dados, format='json').status_code, 201)
+
+        response = self.client.post('/api/convocacoes/', dados, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Convocacao.objects.count(), 1)
+
+    def test_respostas_em_lote_na_ordem_da_entrada(self) -> None:
+        convocacao = Convocacao.objects.create(
+            empresa=self.empresa, funcionario=self.funcionarios[0], tipo=self.tipo_convocacao,
+            data_convocacao=self.hoje_menos(0), data_limite_resposta=self.hoje_menos(-30)
+        )
+        respostas = [
+            {'id': convocacao.pk, 'resposta': 'INVALIDA'},
+            {'id': convocacao.pk, 'resposta': 'PENDENTE'},
+            {'id': convocacao.pk, 'resposta': 'PENDENTE'},
+            {'id': convocacao.pk + 1, 'resposta': 'PENDENTE'},
+        ]
+
+        response = self.client.post(
+            '/api/convocacoes/responder_em_lote/', {'respostas': respostas}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [resultado['status'] for resultado in response.json()['data']['resultados']],
+            ['invalido', 'atualizado', 'invalido', 'nao_encontrado']
+        )
@@ -0,0 +1,24 @@
+from unittest import mock
+
+from .. import mixins
+from .base import ApiTestCase
+
+
+class CachePlanosTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.criar_funcionarios(cls.empresa, 3)
+
+    def test_cache_cheio_nao_e_esvaziado(self) -> None:
+        mixins._planos.clear()
+        mixins._compilados.clear()
+        with mock.patch.object(mixins, 'MAX_PLANOS', 1):
+            for campos in ('codigo,nome', 'codigo,cpf', 'nome', 'codigo,nome'):
+                response = self.client.get('/api/funcionarios/', {'fields': campos})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(set(response.json()['results'][0]), set(campos.split(',')))
+
+        self.assertEqual(len(mixins._planos), 1)
+        self.assertEqual(len(mixins._compilados), 1)
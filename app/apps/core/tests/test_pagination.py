@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from urllib.parse import parse_qs, urlparse
+
+from ..models import Convocacao, Funcionario
+from ..pagination import KeysetPagination
+from .base import ApiTestCase
+
+
+class KeysetPaginationTests(ApiTestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        funcionarios = cls.criar_funcionarios(cls.empresa, 25)
+        # Respostas no mesmo milissegundo, diferentes só nos microssegundos
+        base = datetime(2024, 1, 1, 12, 0, 0, 123000, tzinfo=dt_timezone.utc)
+        Convocacao.objects.bulk_create([
+            Convocacao(
+                empresa=cls.empresa, funcionario=funcionario, tipo=cls.tipo_convocacao,
+                data_convocacao=cls.hoje_menos(10), data_limite_resposta=cls.hoje_menos(-20),
+                respondido=True, resposta='ACEITO',
+                data_resposta=base + timedelta(microseconds=indice % 7)
+            )
+            for indice, funcionario in enumerate(funcionarios)
+        ])
+
+    def percorrer(self, url: str) -> list:
+        ids, paginas = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            ids += [item['id'] for item in response.json()['results']]
+            url = response.json()['next']
+            paginas += 1
+            self.assertLess(paginas, 10, 'o cursor não avança')
+        return ids
+
+    def test_cursor_avanca_com_empates_em_microssegundos(self) -> None:
+        for ordenacao in ('data_resposta', '-data_resposta'):
+            with self.subTest(ordenacao=ordenacao):
+                ids = self.percorrer(f'/api/convocacoes/?ordering={ordenacao}&cursor=')
+                esperado = list(
+                    Convocacao.objects.order_by(ordenacao, ('-' if ordenacao.startswith('-') else '') + 'pk')
+                    .values_list('pk', flat=True)
+                )
+                self.assertEqual(ids, esperado)
+
+    def test_pagina_anterior_volta_ao_inicio(self) -> None:
+        primeira = self.client.get('/api/convocacoes/?ordering=data_resposta&cursor=').json()
+        segunda = self.client.get(primeira['next']).json()
+        anterior = self.client.get(segunda['previous']).json()
+        self.assertEqual([item['id'] for item in anterior['results']],
+                         [item['id'] for item in primeira['results']])
+
+    def test_cursor_invalido(self) -> None:
+        response = self.client.get('/api/convocacoes/?ordering=data_resposta&cursor=invalido')
+        self.assertEqual(response.status_code, 404)
+
+        primeira = self.client.get('/api/convocacoes/?ordering=data_resposta&cursor=').json()
+        cursor = parse_qs(urlparse(primeira['next']).query)['cursor'][0]
+        # Cursor de outra ordenação
+        response = self.client.get(f'/api/convocacoes/?ordering=-data_resposta&cursor={cursor}')
+        self.assertEqual(response.status_code, 404)
+
+
+class KeysetAnotacaoTests(ApiTestCase):
+    """Ordenação por anotação (como a relevância da busca) no modo cursor."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.criar_funcionarios(cls.empresa, 23)
+
+    def test_cursor_percorre_ordenacao_anotada(self) -> None:
+        queryset = Funcionario.objects.annotate(
+            relevancia=Cast(F('codigo') % 4, FloatField()) / 3
+        ).order_by('-relevancia', 'pk')
+        esperado = list(queryset.values_list('pk', flat=True))
+
+        paginacao = KeysetPagination()
+        paginacao.page_size = 5
+        url, ids = '/?cursor=', []
+        while url:
+            request = Request(APIRequestFactory().get(url))
+            ids += [funcionario.pk for funcionario in paginacao.paginate_queryset(queryset, request)]
+            url = paginacao.get_next_link()
+
+        self.assertEqual(ids, esperado)
@@ -0,0 +1,46 @@
+import asyncio
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.throttling import AnonRateThrottle
+from unittest import mock
+
+from .. import assincrono, prontidao
+
+
+class ProntidaoTests(TestCase):
+
+    def setUp(self) -> None:
+        prontidao._ultimo = None
+
+    def test_falha_do_banco_nao_expoe_o_erro(self) -> None:
+        erro = OperationalError('could not connect to server: host "db.interno" user "portal"')
+        with mock.patch('django.db.backends.utils.CursorWrapper.execute', side_effect=erro), \
+                self.assertLogs(prontidao.logger, 'WARNING') as logs:
+            response = self.client.get('/health/pronto/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['verificacoes']['banco.default']['erro'], 'OperationalError')
+        self.assertNotIn('db.interno', response.content.decode())
+        self.assertIn('db.interno', logs.output[0])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_sondas_anonimas_nao_sao_limitadas(self) -> None:
+        with mock.patch.dict(AnonRateThrottle.THROTTLE_RATES, {'anon': '2/day'}):
+            for _ in range(5):
+                for caminho in ('/health/', '/health/pronto/'):
+                    self.assertNotEqual(self.client.get(caminho).status_code, 429, caminho)
+
+
+class PoolConsultasTests(SimpleTestCase):
+
+    def test_fila_e_execucao_voltam_a_zero(self) -> None:
+        def consulta() -> dict:
+            return assincrono.situacao_pool()
+
+        with mock.patch.object(assincrono.router, 'db_for_read', return_value='default'), \
+                mock.patch.object(assincrono, 'close_old_connections'):
+            resultados = asyncio.run(assincrono.executar_em_paralelo({'a': consulta, 'b': consulta}))
+
+        self.assertTrue(all(situacao['em_execucao'] >= 1 for situacao in resultados.values()))
+        situacao = assincrono.situacao_pool()
+        self.assertEqual((situacao['na_fila'], situacao['em_execucao']), (0, 0))
@@ -0,0 +1,88 @@
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+
+from .. import routers
+from ..models import Convocacao
+from .base import ApiTestMixin
+
+
+@override_settings(REPLICA_VERIFICACAO_SEGUNDOS=0)
+class ReplicaRouterTests(ApiTestMixin, TransactionTestCase):
+    """Leituras na réplica com dois aliases: `replica` é uma segunda conexão ao banco de testes."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # O alias só existe durante a classe; registrado antes do super(), que valida `databases`
+        connections.settings[routers.REPLICA] = {
+            **connections[routers.PRIMARIO].settings_dict, 'TEST': {'MIRROR': routers.PRIMARIO},
+        }
+        cls.databases = {routers.PRIMARIO, routers.REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        connections[routers.REPLICA].close()
+        del connections[routers.REPLICA]
+        del connections.settings[routers.REPLICA]
+
+    def setUp(self) -> None:
+        # TransactionTestCase não chama setUpTestData
+        self.setUpTestData()
+        self.funcionario = self.criar_funcionarios(self.empresa, 1)[0]
+        super().setUp()
+        routers._fixados.clear()
+        routers._estado_replica = (0.0, False)
+
+    def listar(self) -> tuple:
+        """Lista as convocações e retorna as consultas de (primário, réplica)."""
+        with CaptureQueriesContext(connections[routers.PRIMARIO]) as primario, \
+                CaptureQueriesContext(connections[routers.REPLICA]) as replica:
+            response = self.client.get('/api/convocacoes/')
+        self.assertEqual(response.status_code, 200, response.content)
+        return primario, replica
+
+    def consultas_de(self, capturadas: CaptureQueriesContext, tabela: str) -> list:
+        return [query['sql'] for query in capturadas.captured_queries if tabela in query['sql']]
+
+    def criar_convocacao(self) -> None:
+        response = self.client.post('/api/convocacoes/', {
+            'funcionario': self.funcionario.codigo, 'tipo': self.tipo_convocacao.pk,
+            'data_convocacao': self.hoje_menos(0).isoformat(), 'data_limite_resposta': self.hoje_menos(-30).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_leituras_vao_para_a_replica(self) -> None:
+        tabela = Convocacao._meta.db_table
+        primario, replica = self.listar()
+        self.assertTrue(self.consultas_de(replica, tabela))
+        self.assertFalse(self.consultas_de(primario, tabela))
+
+    def test_escrita_fixa_o_usuario_no_primario(self) -> None:
+        tabela = Convocacao._meta.db_table
+        self.criar_convocacao()
+        primario, replica = self.listar()
+        self.assertTrue(self.consultas_de(primario, tabela))
+        self.assertFalse(self.consultas_de(replica, tabela))
+
+        # Passada a janela, as leituras voltam à réplica e a fixação vencida sai do processo
+        with override_settings(REPLICA_FIXACAO_SEGUNDOS=0):
+            routers._fixados[self.usuario.pk] = 0.0
+            primario, replica = self.listar()
+            self.assertTrue(self.consultas_de(replica, tabela))
+            routers.fixar_no_primario('outro')
+        self.assertNotIn(self.usuario.pk, routers._fixados)
+
+    def test_replica_atrasada_cede_ao_primario(self) -> None:
+        tabela = Convocacao._meta.db_table
+        with mock.patch.object(routers, 'atraso_replica', return_value=60.0), \
+                self.assertLogs(routers.logger, 'WARNING'):
+            primario, replica = self.listar()
+        self.assertTrue(self.consultas_de(primario, tabela))
+        self.assertFalse(self.consultas_de(replica, tabela))
+
+        with mock.patch.object(routers, 'atraso_replica', return_value=None):
+            primario, replica = self.listar()
+        self.assertFalse(self.consultas_de(replica, tabela))
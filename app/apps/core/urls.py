@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import views, views_async
 
 router = DefaultRouter()
 router.register('empresas', views.EmpresaViewSet)
@@ -12,5 +12,11 @@ router.register('absenteismos', views.AbsenteismoViewSet)
 
 
 urlpatterns = [
+    # Métricas com as consultas em paralelo (views assíncronas, para o deploy em ASGI)
+    path('funcionarios/metricas/async/', views_async.metricas_funcionarios, name='funcionario-metricas-async'),
+    path('convocacoes/metricas/async/', views_async.metricas_convocacoes, name='convocacao-metricas-async'),
+    path('absenteismos/metricas/async/', views_async.metricas_absenteismos, name='absenteismo-metricas-async'),
+    # Painel: as três métricas em uma requisição, com permissão por seção
+    path('painel/', views_async.painel, name='painel'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,10 +1,19 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, filters, status, serializers
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
+from django.db import IntegrityError, transaction
 from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from .services import FuncionarioService, AbsenteismoService, ConvocacaoService
+from .services import (
+    FuncionarioService, AbsenteismoService, ConvocacaoService,
+    AutocompletarService
+)
+from .filters import EmpresaFilter, FuncionarioFilter, TrigramSearchFilter
+from .mixins import (
+    CompiledReadMixin, ConditionalGetMixin, EmpresaContextMixin,
+    ReplicaReadMixin, SparseFieldsetMixin, StatementTimeoutMixin
+)
 import csv
 
 from .models import (
@@ -15,24 +24,27 @@ from .models import (
 from .serializers import (
     EmpresaSerializer, FuncionarioSerializer,
     TipoConvocacaoSerializer, ConvocacaoSerializer,
+    ConvocacaoLoteSerializer, ConvocacaoRespostaLoteSerializer,
     TipoAbsenteismoSerializer, AbsenteismoSerializer
 )
 
 
-class EmpresaViewSet(viewsets.ModelViewSet):
+class EmpresaViewSet(StatementTimeoutMixin, ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin,
+                     viewsets.ModelViewSet):
     queryset = Empresa.objects.all()
     serializer_class = EmpresaSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['codigo', 'cnpj', 'ativo']
+    filterset_class = EmpresaFilter
     search_fields = ['nome_abreviado', 'razao_social', 'cnpj']
     ordering_fields = ['nome_abreviado', 'razao_social', 'criado_em']
 
 
-class FuncionarioViewSet(viewsets.ModelViewSet):
+class FuncionarioViewSet(StatementTimeoutMixin, ReplicaReadMixin, EmpresaContextMixin, ConditionalGetMixin,
+                         CompiledReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Funcionario.objects.all()
     serializer_class = FuncionarioSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['empresa', 'situacao', 'codigo_unidade', 'codigo_setor']
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
+    filterset_class = FuncionarioFilter
     search_fields = ['nome', 'cpf', 'matricula_funcionario', 'email']
     ordering_fields = ['nome', 'data_admissao', 'empresa']
 
@@ -53,6 +65,43 @@ class FuncionarioViewSet(viewsets.ModelViewSet):
             'data': metricas
         })
         
+    @action(detail=False, methods=['get'])
+    def autocompletar(self, request: Request) -> Response:
+        """Sugestões por prefixo de funcionários, unidades, setores ou cargos."""
+        empresa_id = getattr(request, 'empresa_context', None)
+        if not empresa_id:
+            return Response({
+                'status': 'error',
+                'message': 'Contexto de empresa não definido'
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        tipo = request.query_params.get('tipo', 'funcionario')
+        if tipo != 'funcionario' and tipo not in AutocompletarService.DIMENSOES:
+            return Response({
+                'status': 'error',
+                'message': 'Tipo de autocompletar inválido'
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        termo = request.query_params.get('q', '').strip()
+        
+        try:
+            limite = min(max(int(request.query_params.get('limite', 10)), 1), 50)
+        except ValueError:
+            limite = 10
+            
+        if not termo:
+            return Response({
+                'status': 'success',
+                'data': {'resultados': [], 'parcial': False}
+            })
+            
+        resultado = AutocompletarService.buscar(empresa_id, tipo, termo, limite)
+        
+        return Response({
+            'status': 'success',
+            'data': resultado
+        })
+        
     @action(detail=False, methods=['get'])
     def exportar(self, request: Request) -> HttpResponse:
         """Exporta dados de funcionários para CSV."""
@@ -64,7 +113,7 @@ class FuncionarioViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
         # Filtrar funcionários da empresa
-        queryset = self.get_queryset().filter(empresa__codigo=empresa_id)
+        queryset = self.get_queryset()
         
         # Aplicar filtros adicionais
         for param, value in request.query_params.items():
@@ -92,7 +141,7 @@ class FuncionarioViewSet(viewsets.ModelViewSet):
         return response
 
 
-class TipoConvocacaoViewSet(viewsets.ModelViewSet):
+class TipoConvocacaoViewSet(StatementTimeoutMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = TipoConvocacao.objects.all()
     serializer_class = TipoConvocacaoSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -100,13 +149,25 @@ class TipoConvocacaoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['nome']
 
 
-class ConvocacaoViewSet(viewsets.ModelViewSet):
+class ConvocacaoViewSet(StatementTimeoutMixin, ReplicaReadMixin, EmpresaContextMixin, ConditionalGetMixin,
+                        CompiledReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Convocacao.objects.all()
     serializer_class = ConvocacaoSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['empresa', 'funcionario', 'tipo', 'respondido', 'resposta']
     search_fields = ['funcionario__nome', 'observacoes']
     ordering_fields = ['data_convocacao', 'data_limite_resposta', 'data_resposta']
+    tempo_limite_acoes = {'criar_em_lote': 60000, 'responder_em_lote': 60000}
+
+    def _salvar_na_empresa(self, serializer: serializers.BaseSerializer) -> None:
+        # A constraint única impede duas convocações do mesmo tipo e data para o funcionário
+        try:
+            with transaction.atomic():
+                super()._salvar_na_empresa(serializer)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                'Funcionário já possui convocação deste tipo nesta data.'
+            )
 
     @action(detail=False, methods=['get'])
     def metricas(self, request: Request) -> Response:
@@ -125,6 +186,70 @@ class ConvocacaoViewSet(viewsets.ModelViewSet):
             'data': metricas
         })
         
+    @action(detail=False, methods=['post'])
+    def criar_em_lote(self, request: Request) -> Response:
+        """Cria convocações para todos os funcionários selecionados da empresa em contexto."""
+        empresa_id = getattr(request, 'empresa_context', None)
+        if not empresa_id:
+            return Response({
+                'status': 'error',
+                'message': 'Contexto de empresa não definido'
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        serializer = ConvocacaoLoteSerializer(data=request.data)
+        
+        try:
+            serializer.is_valid(raise_exception=True)
+        except serializers.ValidationError as e:
+            return Response({
+                'status': 'error',
+                'message': 'Dados inválidos para criação em lote',
+                'errors': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        usuario = request.user if request.user.is_authenticated else None
+        resultado = ConvocacaoService.criar_em_lote(
+            empresa_id,
+            serializer.validated_data,
+            usuario
+        )
+        
+        return Response({
+            'status': 'success',
+            'data': resultado
+        }, status=status.HTTP_201_CREATED)
+        
+    @action(detail=False, methods=['post'])
+    def responder_em_lote(self, request: Request) -> Response:
+        """Registra respostas de várias convocações da empresa em contexto."""
+        empresa_id = getattr(request, 'empresa_context', None)
+        if not empresa_id:
+            return Response({
+                'status': 'error',
+                'message': 'Contexto de empresa não definido'
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        serializer = ConvocacaoRespostaLoteSerializer(data=request.data)
+        
+        try:
+            serializer.is_valid(raise_exception=True)
+        except serializers.ValidationError as e:
+            return Response({
+                'status': 'error',
+                'message': 'Dados inválidos para resposta em lote',
+                'errors': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        resultado = ConvocacaoService.registrar_respostas_em_lote(
+            empresa_id,
+            serializer.validated_data['respostas']
+        )
+        
+        return Response({
+            'status': 'success',
+            'data': resultado
+        })
+        
     @action(detail=False, methods=['get'])
     def exportar(self, request: Request) -> HttpResponse:
         """Exporta dados de convocações para CSV."""
@@ -136,7 +261,7 @@ class ConvocacaoViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
         # Filtrar convocações da empresa
-        queryset = self.get_queryset().filter(empresa__codigo=empresa_id)
+        queryset = self.get_queryset()
         
         # Aplicar filtros adicionais
         for param, value in request.query_params.items():
@@ -163,7 +288,7 @@ class ConvocacaoViewSet(viewsets.ModelViewSet):
         return response
 
 
-class TipoAbsenteismoViewSet(viewsets.ModelViewSet):
+class TipoAbsenteismoViewSet(StatementTimeoutMixin, ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = TipoAbsenteismo.objects.all()
     serializer_class = TipoAbsenteismoSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -171,7 +296,8 @@ class TipoAbsenteismoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['nome']
 
 
-class AbsenteismoViewSet(viewsets.ModelViewSet):
+class AbsenteismoViewSet(StatementTimeoutMixin, ReplicaReadMixin, EmpresaContextMixin, ConditionalGetMixin,
+                         CompiledReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Absenteismo.objects.all()
     serializer_class = AbsenteismoSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -215,7 +341,7 @@ class AbsenteismoViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
         # Filtrar absenteísmos da empresa
-        queryset = self.get_queryset().filter(empresa__codigo=empresa_id)
+        queryset = self.get_queryset()
         
         # Aplicar filtros adicionais
         for param, value in request.query_params.items():
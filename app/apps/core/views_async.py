@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from django.conf import settings
+from django.db import OperationalError
+from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from app.apps.autenticacao.identificacao import ausuario_da_requisicao
+from .conexoes import consulta_cancelada, registrar_cancelamento
+from .middleware import atem_acesso_tela
+from .routers import ativar_replica, desativar_replica, fixado_no_primario
+from .services import FuncionarioService, ConvocacaoService, AbsenteismoService
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Serviço assíncrono de cada rota: (request, empresa_id, tempo_limite_ms) -> métricas
+ObterMetricas = Callable[[HttpRequest, int, int], Awaitable[Dict[str, Any]]]
+
+TEMPO_LIMITE_EXCEDIDO = 'A consulta excedeu o tempo limite. Refine os filtros e tente novamente.'
+
+
+def _tempo_limite(chave: str) -> int:
+    limites = settings.TEMPO_LIMITE_CONSULTAS
+    return limites.get(chave, limites['padrao'])
+
+
+async def _contexto(request: HttpRequest) -> Union[Tuple[Any, int], JsonResponse]:
+    """Usuário e empresa em contexto da requisição, ou a resposta de erro."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    usuario = await ausuario_da_requisicao(request)
+    if usuario is None:
+        return JsonResponse({'detail': 'As credenciais de autenticação não foram fornecidas.'}, status=401)
+
+    empresa_id = getattr(request, 'empresa_context', None)
+    if not empresa_id:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Contexto de empresa não definido'
+        }, status=400)
+
+    return usuario, empresa_id
+
+
+def view_metricas(nome: str, obter: ObterMetricas) -> Callable[[HttpRequest], Awaitable[JsonResponse]]:
+    """Cria a view assíncrona equivalente à action `metricas` de um ViewSet.
+
+    Autenticação, contexto de empresa e permissão de tela vêm dos
+    middlewares (sem consultas quando em cache); as consultas das métricas
+    rodam em paralelo, na réplica quando possível e com o tempo limite de
+    `metricas` em TEMPO_LIMITE_CONSULTAS.
+    """
+
+    async def view(request: HttpRequest) -> JsonResponse:
+        contexto = await _contexto(request)
+        if not isinstance(contexto, tuple):
+            return contexto
+        usuario, empresa_id = contexto
+
+        tempo_limite = _tempo_limite('metricas')
+
+        token = None if fixado_no_primario(usuario.pk) else ativar_replica()
+        try:
+            metricas = await obter(request, empresa_id, tempo_limite)
+        except OperationalError as exc:
+            if not consulta_cancelada(exc):
+                raise
+            registrar_cancelamento(nome)
+            logger.warning('Consulta cancelada por tempo limite em %s (%d ms)', nome, tempo_limite)
+
+            resposta = JsonResponse({
+                'status': 'error',
+                'message': TEMPO_LIMITE_EXCEDIDO,
+                'codigo': 'tempo_limite_excedido'
+            }, status=503)
+            resposta['Retry-After'] = '30'
+            return resposta
+        finally:
+            if token is not None:
+                desativar_replica(token)
+
+        return JsonResponse({
+            'status': 'success',
+            'data': metricas
+        })
+
+    view.__name__ = nome
+    view.__doc__ = f'Versão assíncrona de {nome}.'
+    return view
+
+
+def _metricas_funcionarios(request: HttpRequest, empresa_id: int, tempo_limite: int) -> Awaitable[Dict[str, Any]]:
+    return FuncionarioService.aobter_metricas(empresa_id, tempo_limite)
+
+
+def _metricas_convocacoes(request: HttpRequest, empresa_id: int, tempo_limite: int) -> Awaitable[Dict[str, Any]]:
+    return ConvocacaoService.aobter_metricas(empresa_id, tempo_limite)
+
+
+def _metricas_absenteismos(request: HttpRequest, empresa_id: int, tempo_limite: int) -> Awaitable[Dict[str, Any]]:
+    return AbsenteismoService.aobter_metricas(
+        empresa_id,
+        request.GET.get('periodo_inicio'),
+        request.GET.get('periodo_fim'),
+        tempo_limite
+    )
+
+
+metricas_funcionarios = view_metricas('FuncionarioViewSet.metricas', _metricas_funcionarios)
+metricas_convocacoes = view_metricas('ConvocacaoViewSet.metricas', _metricas_convocacoes)
+metricas_absenteismos = view_metricas('AbsenteismoViewSet.metricas', _metricas_absenteismos)
+
+
+# Seções do painel: cada uma exige o acesso à tela de mesmo código
+SECOES_PAINEL: Dict[str, ObterMetricas] = {
+    'funcionarios': _metricas_funcionarios,
+    'convocacoes': _metricas_convocacoes,
+    'absenteismos': _metricas_absenteismos,
+}
+
+
+async def _secao_painel(nome: str, obter: Callable[[], Awaitable[Dict[str, Any]]], tempo_limite: int) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Executa uma seção do painel e retorna (métricas, situação) sem propagar erros."""
+    inicio = time.perf_counter()
+    dados = None
+    try:
+        # O statement_timeout encerra as consultas; a espera cobre também a fila do pool
+        dados = await asyncio.wait_for(obter(), tempo_limite / 1000)
+        situacao = {'status': 'success'}
+    except (asyncio.TimeoutError, OperationalError) as exc:
+        if isinstance(exc, OperationalError) and not consulta_cancelada(exc):
+            logger.exception('Falha na seção %s do painel', nome)
+            situacao = {'status': 'error', 'message': 'Não foi possível calcular esta seção.'}
+        else:
+            registrar_cancelamento(f'painel.{nome}')
+            logger.warning('Seção %s do painel excedeu o tempo limite (%d ms)', nome, tempo_limite)
+            situacao = {'status': 'error', 'message': TEMPO_LIMITE_EXCEDIDO, 'codigo': 'tempo_limite_excedido'}
+    except Exception:
+        logger.exception('Falha na seção %s do painel', nome)
+        situacao = {'status': 'error', 'message': 'Não foi possível calcular esta seção.'}
+
+    situacao['tempo_ms'] = round((time.perf_counter() - inicio) * 1e3, 1)
+    return dados, situacao
+
+
+async def painel(request: HttpRequest) -> JsonResponse:
+    """Métricas de funcionários, convocações e absenteísmos em uma só requisição.
+
+    As seções rodam ao mesmo tempo no pool de consultas (uma conexão por
+    thread), cada uma limitada por TEMPO_LIMITE_CONSULTAS['painel']. Seções
+    de telas sem acesso ou que falharem voltam com `data` nulo e o motivo
+    em `secoes`, junto com o tempo de cada uma; as demais seguem normalmente.
+    `?secoes=` restringe as seções e os parâmetros de período valem para
+    absenteísmos.
+    """
+    contexto = await _contexto(request)
+    if not isinstance(contexto, tuple):
+        return contexto
+    usuario, empresa_id = contexto
+
+    pedidas = [nome.strip() for nome in request.GET.get('secoes', '').split(',') if nome.strip()]
+    invalidas = [nome for nome in pedidas if nome not in SECOES_PAINEL]
+    if invalidas:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Seções inválidas: {", ".join(invalidas)}'
+        }, status=400)
+    secoes = pedidas or list(SECOES_PAINEL)
+
+    dados: Dict[str, Optional[Dict[str, Any]]] = {}
+    situacoes: Dict[str, Dict[str, Any]] = {}
+    permitidas = []
+    for nome in secoes:
+        if await atem_acesso_tela(usuario, nome):
+            permitidas.append(nome)
+        else:
+            dados[nome] = None
+            situacoes[nome] = {'status': 'error', 'message': 'Acesso negado a esta funcionalidade.',
+                               'codigo': 'sem_permissao', 'tempo_ms': 0.0}
+
+    if not permitidas:
+        return JsonResponse({'detail': 'Acesso negado a esta funcionalidade.'}, status=403)
+
+    tempo_limite = _tempo_limite('painel')
+    token = None if fixado_no_primario(usuario.pk) else ativar_replica()
+    try:
+        resultados = await asyncio.gather(*(
+            _secao_painel(nome, partial(SECOES_PAINEL[nome], request, empresa_id, tempo_limite), tempo_limite)
+            for nome in permitidas
+        ))
+    finally:
+        if token is not None:
+            desativar_replica(token)
+
+    for nome, (metricas, situacao) in zip(permitidas, resultados):
+        dados[nome] = metricas
+        situacoes[nome] = situacao
+
+    resposta = {
+        'status': 'success',
+        'data': {nome: dados[nome] for nome in secoes},
+        'secoes': {nome: situacoes[nome] for nome in secoes}
+    }
+    if all(situacoes[nome]['status'] == 'error' for nome in permitidas):
+        resposta['status'] = 'error'
+        resposta['message'] = 'Nenhuma seção do painel pôde ser calculada.'
+        return JsonResponse(resposta, status=503)
+
+    return JsonResponse(resposta)
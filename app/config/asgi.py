@@ -0,0 +1,8 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.config.settings.production')
+# Desliga as conexões persistentes nas settings (ver SERVIDOR_ASGI)
+os.environ['DJANGO_SERVIDOR_ASGI'] = '1'
+
+application = get_asgi_application()
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Bibliotecas de terceiros
     'rest_framework',
@@ -35,19 +36,40 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.apps.core.middleware.InstrumentacaoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app.apps.core.middleware.PerfilMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'app.apps.autenticacao.middleware.AcessoLogMiddleware',
     'app.apps.core.middleware.EmpresaContextMiddleware',
     'app.apps.core.middleware.TelaPermissaoMiddleware',
+    'app.apps.core.middleware.InstrumentacaoViewMiddleware',
 ]
 
+# Instrumentação por requisição (Server-Timing): requisições acima do limite
+# são logadas com as consultas mais lentas; com INSTRUMENTACAO_PERSISTIR os
+# tempos também são gravados no LogAcesso
+INSTRUMENTACAO_LIMITE_LENTO_MS = int(os.environ.get('INSTRUMENTACAO_LIMITE_LENTO_MS', '1000'))
+INSTRUMENTACAO_PERSISTIR = os.environ.get('INSTRUMENTACAO_PERSISTIR', '').lower() in ('1', 'true')
+
+# Perfil sob demanda para staff (?perfilar=1 ou X-Perfilar: 1): intervalo de
+# amostragem, fração máxima do tempo gasta amostrando, duração máxima
+# amostrada e perfis simultâneos por worker
+PERFIL_HABILITADO = os.environ.get('PERFIL_HABILITADO', 'true').lower() in ('1', 'true')
+PERFIL_INTERVALO_MS = float(os.environ.get('PERFIL_INTERVALO_MS', '5'))
+PERFIL_SOBRECARGA_MAXIMA = 0.05
+PERFIL_DURACAO_MAXIMA_S = 30
+PERFIL_CONCORRENTES = int(os.environ.get('PERFIL_CONCORRENTES', '1'))
+
+# Token exigido pela coleta do Prometheus em /metrics/ (vazio: sem exigência)
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+
 ROOT_URLCONF = 'app.config.urls'
 
 TEMPLATES = [
@@ -69,6 +91,23 @@ TEMPLATES = [
 WSGI_APPLICATION = 'app.config.wsgi.application'
 
 # Database
+# Conexões persistentes: cada thread do worker reaproveita sua conexão por até
+# DB_CONN_MAX_AGE segundos, validada antes do uso após cada requisição.
+# Com PgBouncer (modo transaction) não há cursores nem prepared statements no servidor.
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', '').lower() in ('1', 'true')
+
+# Conexões por worker e alias; o gunicorn.conf.py limita as threads a esse valor
+DB_MAX_CONEXOES_POR_WORKER = int(os.environ.get('DB_MAX_CONEXOES_POR_WORKER', '2'))
+
+# Threads (e conexões) extras por worker para as consultas paralelas das views assíncronas
+DB_CONSULTAS_PARALELAS = int(os.environ.get('DB_CONSULTAS_PARALELAS', '4'))
+
+# Sob ASGI (app/config/asgi.py) o código síncrono de cada requisição roda numa
+# thread própria e a conexão aberta nela não é reaproveitada: persistente, ficaria
+# aberta até expirar e DB_MAX_CONEXOES_POR_WORKER deixaria de limitar algo. Nesse
+# modo não há conexões persistentes; o reaproveitamento fica com o PgBouncer.
+SERVIDOR_ASGI = os.environ.get('DJANGO_SERVIDOR_ASGI', '').lower() in ('1', 'true')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -77,9 +116,67 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'cnyUojVJ7VMJR7DUsehHHYrXCfCtJl4H'),
         'HOST': os.environ.get('DB_HOST', 'dpg-cvakmnnnoe9s73faum7g-a.oregon-postgres.render.com'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if SERVIDOR_ASGI else int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {
+            'connect_timeout': 5,
+            # Detecta conexões ociosas derrubadas no caminho até o banco remoto
+            'keepalives': 1,
+            'keepalives_idle': 60,
+            'keepalives_interval': 10,
+            'keepalives_count': 3,
+        },
+    }
+}
+
+if DB_PGBOUNCER:
+    from importlib.util import find_spec
+    if find_spec('psycopg'):
+        # psycopg 3 prepara consultas repetidas automaticamente; o PgBouncer não as suporta
+        DATABASES['default']['OPTIONS']['prepare_threshold'] = None
+
+# Réplica de leitura (opcional): listagens, detalhes, métricas e exportações
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['app.apps.core.routers.ReplicaRouter']
+
+# Atraso máximo aceito na réplica, intervalo entre verificações e janela em que
+# o usuário lê do primário após escrever (segundos)
+REPLICA_ATRASO_MAXIMO = float(os.environ.get('REPLICA_ATRASO_MAXIMO', '5'))
+REPLICA_VERIFICACAO_SEGUNDOS = 5
+REPLICA_FIXACAO_SEGUNDOS = 10
+
+# Tempo máximo (ms) de cada consulta SQL por action das viewsets do core;
+# as viewsets podem ajustar com `tempo_limite_acoes`
+TEMPO_LIMITE_CONSULTAS = {
+    'padrao': 5000,
+    'metricas': 30000,
+    'exportar': 120000,
+    # Cada seção do painel; a que passar disso volta como erro e as demais seguem
+    'painel': 10000,
 }
 
+# Prontidão (/health/pronto/): cada worker refaz as verificações no máximo a
+# cada PRONTIDAO_INTERVALO_SEGUNDOS. Limites: (degradado a partir de, falha a partir de)
+PRONTIDAO_INTERVALO_SEGUNDOS = float(os.environ.get('PRONTIDAO_INTERVALO_SEGUNDOS', '5'))
+PRONTIDAO_LIMITES = {
+    'banco_ms': (100, 1000),
+    'cache_ms': (50, 500),
+    'fila_consultas': (20, 200),
+    'fila_logs': (500, 5000),
+}
+
+# Particionamento de convocações e absenteísmos por empresa (PostgreSQL).
+# 0 mantém as tabelas comuns; N > 0 converte na migração, com N partições hash.
+CORE_PARTICOES_HASH = int(os.environ.get('CORE_PARTICOES_HASH', '0'))
+
 # Cache com Redis
 CACHES = {
     'default': {
@@ -143,7 +240,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'app.apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'app.apps.core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'app.apps.core.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -185,6 +291,14 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
+# Os middlewares guardam em memória, em cada worker, os usuários identificados
+# pelo token JWT e as decisões de acesso a empresas e telas, por até
+# CACHE_ACESSO_SEGUNDOS. Desativar um usuário ou revogar um acesso só passa a
+# valer nesse prazo (o token em si continua válido até expirar). O número de
+# itens de cada cache é limitado a CACHE_ACESSO_MAXIMO.
+CACHE_ACESSO_SEGUNDOS = float(os.environ.get('CACHE_ACESSO_SEGUNDOS', '60'))
+CACHE_ACESSO_MAXIMO = int(os.environ.get('CACHE_ACESSO_MAXIMO', '10000'))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = [
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from ..apps.core.health import health_check
+from ..apps.core.health import health_check, readiness, conexoes, metricas
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -17,6 +17,10 @@ urlpatterns = [
     path('api/auth/', include('app.apps.autenticacao.urls')),
     path('api/', include('app.apps.core.urls')),
     path('health/', health_check, name='health_check'),
+    path('health/vivo/', health_check, name='health_liveness'),
+    path('health/pronto/', readiness, name='health_readiness'),
+    path('health/conexoes/', conexoes, name='health_conexoes'),
+    path('metrics/', metricas, name='metricas_prometheus'),
 ]
 
 # Adiciona as URLs para servir arquivos estáticos em desenvolvimento
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+
+# Aplicação servida: WSGI por padrão; com GUNICORN_ASGI=1, workers uvicorn
+# servindo o asgi.py (as views assíncronas deixam de passar por async_to_sync),
+# sem conexões persistentes ao banco (SERVIDOR_ASGI nas settings)
+if os.environ.get('GUNICORN_ASGI', '').lower() in ('1', 'true'):
+    wsgi_app = 'app.config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'app.config.wsgi:application'
+
+# Workers e threads; cada thread mantém uma conexão persistente por banco, então
+# as threads são limitadas a DB_MAX_CONEXOES_POR_WORKER
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+threads = min(
+    int(os.environ.get('GUNICORN_THREADS', '2')),
+    int(os.environ.get('DB_MAX_CONEXOES_POR_WORKER', '2'))
+)
+
+# Métricas do Prometheus compartilhadas entre os workers (ver core/monitoramento.py);
+# definido antes do fork para que todos gravem no mesmo diretório
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'portal-prometheus')
+)
+
+
+def on_starting(server):
+    # Arquivos de uma execução anterior somariam contadores de processos que já não existem
+    diretorio = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(diretorio, ignore_errors=True)
+    os.makedirs(diretorio, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # Conexões herdadas do master (preload) não podem ser compartilhadas entre processos
+    try:
+        from django.db import connections
+        connections.close_all()
+    except Exception:
+        pass
+
+
+def worker_exit(server, worker):
+    # Encerra as conexões persistentes de forma limpa ao reciclar o worker
+    try:
+        from django.db import connections
+        connections.close_all()
+    except Exception:
+        pass
+
+
+def child_exit(server, worker):
+    # Gauges do worker encerrado deixam de entrar na soma
+    try:
+        from app.apps.core.monitoramento import encerrar_processo
+        encerrar_processo(worker.pid)
+    except Exception:
+        pass